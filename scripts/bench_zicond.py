@@ -0,0 +1,128 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn import utils
+
+from src.main import build_cpu, build_dir
+from tests.common import r_type, i_type, b_type, j_type
+
+
+# ==============================================================================
+# Zicond 基准：同一个内核的分支版本与无分支版本在整条流水线上的周期数对比
+#
+# 内核：xorshift32 生成伪随机数，最低位为 1 时累加到 a3。
+#   *   branchy：beq 跳过累加，方向随数据变化，预测器学不到，频繁冲刷
+#   *   branchless：czero.eqz 把不需要的加数清零，循环内只剩循环回边一个分支
+# 两个版本结束时都执行 addi x31, x0, 1 作为结束标记，统计其写回所在周期。
+# 用法：python scripts/bench_zicond.py [迭代次数]
+# ==============================================================================
+
+DEPTH_LOG = 10
+# 内核镜像写入构建目录 (已在 .gitignore 中)，不覆盖 .workspace 中用户自己的负载
+WORKLOAD_DIR = os.path.join(build_dir, "bench_zicond")
+SEED = 0x2545F491
+
+# 寄存器编号
+ZERO, T0, T1, T2, A0, A1, A3, DONE = 0, 5, 6, 7, 10, 11, 13, 31
+
+
+def kernel(iterations, branchless):
+    """返回内核的指令字列表 (从地址 0 开始)。"""
+    assert 0 < iterations < 2048, "iterations must fit in an addi immediate"
+    prologue = [
+        (SEED >> 12) << 12 | (A1 << 7) | 0b0110111,  # lui a1, %hi(SEED)
+        i_type(SEED & 0xFFF, A1, 0x0, A1),  # addi a1, a1, %lo(SEED)
+        i_type(iterations, ZERO, 0x0, A0),  # addi a0, x0, N
+        i_type(0, ZERO, 0x0, A3),  # addi a3, x0, 0
+    ]
+    body = [
+        i_type(13, A1, 0x1, T0),  # slli t0, a1, 13
+        r_type(0x00, T0, A1, 0x4, A1),  # xor a1, a1, t0
+        i_type(17, A1, 0x5, T0),  # srli t0, a1, 17
+        r_type(0x00, T0, A1, 0x4, A1),  # xor a1, a1, t0
+        i_type(5, A1, 0x1, T0),  # slli t0, a1, 5
+        r_type(0x00, T0, A1, 0x4, A1),  # xor a1, a1, t0
+        i_type(1, A1, 0x7, T1),  # andi t1, a1, 1
+    ]
+    if branchless:
+        body += [
+            r_type(0x07, T1, A1, 0x5, T2),  # czero.eqz t2, a1, t1
+            r_type(0x00, T2, A3, 0x0, A3),  # add a3, a3, t2
+        ]
+    else:
+        body += [
+            b_type(8, ZERO, T1, 0x0),  # beq t1, x0, +8
+            r_type(0x00, A1, A3, 0x0, A3),  # add a3, a3, a1
+        ]
+    body.append(i_type(-1, A0, 0x0, A0))  # addi a0, a0, -1
+    body.append(b_type(-4 * len(body), ZERO, A0, 0x1))  # bne a0, x0, loop
+    epilogue = [
+        i_type(1, ZERO, 0x0, DONE),  # addi x31, x0, 1
+        j_type(0, ZERO),  # jal x0, 0 (原地等待)
+    ]
+    return prologue + body + epilogue
+
+
+def reference(iterations):
+    x, total = SEED, 0
+    for _ in range(iterations):
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        if x & 1:
+            total = (total + x) & 0xFFFFFFFF
+    return total
+
+
+def write_workload(words):
+    """把内核写成 build_cpu 的负载镜像，返回镜像所在目录 (作为 build_cpu 的 workload 参数)。"""
+    os.makedirs(WORKLOAD_DIR, exist_ok=True)
+    depth = 1 << DEPTH_LOG
+    with open(f"{WORKLOAD_DIR}/workload_ins.exe", "w") as f:
+        for w in words + [0] * (depth - len(words)):
+            f.write(f"{w:08x}\n")
+    with open(f"{WORKLOAD_DIR}/workload_mem.exe", "w") as f:
+        f.write("00000000\n" * depth)
+    with open(f"{WORKLOAD_DIR}/workload.init", "w") as f:
+        f.write("00000000\n" * 32)
+    return WORKLOAD_DIR
+
+
+def run(iterations, branchless):
+    workload = write_workload(kernel(iterations, branchless))
+    _, binary_path = build_cpu(
+        depth_log=DEPTH_LOG, sim_threshold=iterations * 40 + 200, workload=workload
+    )
+    raw = utils.run_simulator(binary_path=binary_path)
+
+    done_cycle, total = None, None
+    for line in raw.split("\n"):
+        m = re.search(r"Cycle @(\d+).*WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if not m:
+            continue
+        rd = int(m.group(2))
+        if rd == A3:
+            total = int(m.group(3), 16)
+        elif rd == DONE and done_cycle is None:
+            done_cycle = int(m.group(1))
+    assert done_cycle is not None, "Kernel did not reach the end marker"
+    return done_cycle, total or 0
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    expected = reference(iterations)
+
+    results = []
+    for branchless in (False, True):
+        cycles, total = run(iterations, branchless)
+        assert total == expected, f"a3 = 0x{total:08x}, expected 0x{expected:08x}"
+        results.append(("branchless" if branchless else "branchy", cycles))
+
+    print(f"{'kernel':<11} {'cycles':>8} {'cycles/iter':>12}")
+    for name, cycles in results:
+        print(f"{name:<11} {cycles:>8} {cycles / iterations:>12.2f}")
+    print(f"speedup: {results[0][1] / results[1][1]:.2f}x")
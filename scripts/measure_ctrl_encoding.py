@@ -0,0 +1,161 @@
+import sys
+import os
+import re
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+from assassyn.backend import elaborate, config
+from assassyn import utils
+
+from src.main import build_cpu
+from src.decoder import Decoder, DecoderImpl
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import program_words, Driver, Feeder
+from tests.test_encoded_ctrl import PROGRAM, DRAIN
+from tests.test_mock import MockSRAM
+from scripts.bench_zicond import DEPTH_LOG, A3, kernel, reference, write_workload
+
+
+# ==============================================================================
+# 控制字段编码对比：独热码 (encoded_ctrl=False) vs 二进制下标 (encoded_ctrl=True)
+#
+# 对每种编码分别统计：
+#   *   Verilog 寄存器：以 test_encoded_ctrl 的 ID-EX-MEM-WB 系统生成 Verilog，
+#       统计 reg 声明的个数与总位数 (含级间 FIFO 的存储)
+#   *   仿真速度：整条流水线运行 bench_zicond 的分支版本内核，
+#       以仿真周期数 / 仿真器运行时间得到 cycles/s (含日志输出的开销)
+# 用法：python scripts/measure_ctrl_encoding.py [迭代次数]
+# ==============================================================================
+
+REG_DECL = re.compile(
+    r"^\s*reg\s+(?:signed\s+)?(?:\[(\d+):(\d+)\]\s*)?\w+\s*(?:\[(\d+):(\d+)\])?\s*[;=]"
+)
+
+
+def verilog_regs(path):
+    """返回 (reg 声明个数, 总位数)。"""
+    count, bits = 0, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            if not name.endswith((".sv", ".v")):
+                continue
+            with open(os.path.join(root, name)) as f:
+                for line in f:
+                    m = REG_DECL.match(line)
+                    if not m:
+                        continue
+                    width = abs(int(m.group(1)) - int(m.group(2))) + 1 if m.group(1) else 1
+                    depth = abs(int(m.group(3)) - int(m.group(4))) + 1 if m.group(3) else 1
+                    count += 1
+                    bits += width * depth
+    return count, bits
+
+
+def measure_verilog(encoded):
+    style = "encoded" if encoded else "onehot"
+    sys_builder = SysBuilder(f"measure_ctrl_{style}")
+
+    with sys_builder:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution(encoded=encoded)
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+
+        cnt = driver.build(len(PROGRAM) * 4)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg)
+        executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if)
+
+    cfg = config(verilog=True, sim_threshold=100, idle_threshold=100)
+    _, verilog_path = elaborate(sys_builder, **cfg)
+    return verilog_regs(verilog_path)
+
+
+def measure_speed(encoded, iterations):
+    workload = write_workload(kernel(iterations, branchless=False))
+    _, binary_path = build_cpu(
+        depth_log=DEPTH_LOG,
+        sim_threshold=iterations * 40 + 200,
+        encoded_ctrl=encoded,
+        workload=workload,
+    )
+    t0 = time.perf_counter()
+    raw = utils.run_simulator(binary_path=binary_path)
+    elapsed = time.perf_counter() - t0
+
+    cycles, total = 0, 0
+    for line in raw.split("\n"):
+        m = re.search(r"Cycle @(\d+)", line)
+        if m:
+            cycles = max(cycles, int(m.group(1)))
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m and int(m.group(1)) == A3:
+            total = int(m.group(2), 16)
+    assert total == reference(iterations), f"a3 = 0x{total:08x}, wrong result"
+    return cycles, elapsed
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    results = []
+    for encoded in (False, True):
+        regs, reg_bits = measure_verilog(encoded)
+        cycles, elapsed = measure_speed(encoded, iterations)
+        results.append(("encoded" if encoded else "onehot", regs, reg_bits, cycles, elapsed))
+
+    print(f"{'ctrl':<8} {'regs':>6} {'reg bits':>9} {'cycles':>8} {'sim(s)':>8} {'cycles/s':>10}")
+    for name, regs, reg_bits, cycles, elapsed in results:
+        print(
+            f"{name:<8} {regs:>6} {reg_bits:>9} {cycles:>8} "
+            f"{elapsed:>8.3f} {cycles / elapsed:>10.0f}"
+        )
@@ -0,0 +1,187 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+from assassyn.backend import elaborate, config
+from assassyn import utils
+
+import src.decoder
+from src.decoder import Decoder
+from src.control_signals import *
+from src.instruction_table import rv32i_table
+from tests.test_decoder import Driver
+from tests.test_mock import MockDecoderShell
+
+
+# ==============================================================================
+# 译码器开销对比：逐条匹配真值表 (decode_table) vs 控制字 ROM (decode_rom)
+#
+# 对每种译码方式构建与 test_decoder 相同的系统，分别统计：
+#   *   trace：执行 build (Python 侧生成 IR) 的时间
+#   *   elaborate：生成仿真器源码的时间
+#   *   生成的仿真器源码大小 (字节 / 行数)
+#   *   (可选，--compile) 编译仿真器的时间
+# 逐条匹配只在本脚本中保留：测量时临时替换 src.decoder 中的 decode_rom。
+# 用法：python scripts/measure_decoder.py [--compile]
+# ==============================================================================
+
+
+def decode_table(opcode, funct3, funct7, rs2, imms):
+    """
+    逐条匹配译码 (改用控制字 ROM 之前的译码方式)：对 rv32i_table 的每一项生成比较器，
+    并用 select 把控制信号 OR 到累加器上 (每一项各生成一个立即数选择器)。
+    返回值与 decode_rom 的每个端口相同。
+    """
+    # 初始化累加器
+    acc_alu_func = Bits(ALU_WIDTH)(0)
+    acc_op1_sel = Bits(3)(0)
+    acc_op2_sel = Bits(3)(0)
+    acc_imm = Bits(32)(0)
+    acc_br_type = Bits(16)(0)
+
+    acc_mem_op = Bits(3)(0)
+    acc_mem_wid = Bits(3)(0)
+    acc_mem_uns = Bits(1)(0)
+    acc_wb_en = Bits(1)(0)
+
+    acc_rs1_used = Bits(1)(0)
+    acc_rs2_used = Bits(1)(0)
+
+    match_if = Bits(1)(0)
+
+    for entry in rv32i_table:
+        (
+            _,
+            t_op,
+            t_f3,
+            t_f7,
+            t_rs2,
+            t_imm_type,
+            t_alu,
+            t_rs1_use,
+            t_rs2_use,
+            t_op1,
+            t_op2,
+            t_mem_op,
+            t_mem_wid,
+            t_mem_sgn,
+            t_wb,
+            t_br,
+        ) = entry
+
+        # --- A. 匹配逻辑 ---
+        match_if = opcode == t_op
+
+        if t_f3 is not None:
+            match_if &= funct3 == Bits(3)(t_f3)
+
+        if t_f7 is not None:
+            match_if &= funct7 == Bits(7)(t_f7)
+
+        if t_rs2 is not None:
+            match_if &= rs2 == Bits(5)(t_rs2)
+
+        # --- B. 信号累加 (Mux Logic) ---
+        # 使用 select 实现 OR 逻辑
+        acc_alu_func |= match_if.select(t_alu, Bits(ALU_WIDTH)(0))
+        acc_rs1_used |= match_if.select(Bits(1)(t_rs1_use), Bits(1)(0))
+        acc_rs2_used |= match_if.select(Bits(1)(t_rs2_use), Bits(1)(0))
+        acc_op1_sel |= match_if.select(t_op1, Bits(3)(0))
+        acc_op2_sel |= match_if.select(t_op2, Bits(3)(0))
+        acc_mem_op |= match_if.select(t_mem_op, Bits(3)(0))
+        acc_mem_wid |= match_if.select(t_mem_wid, Bits(3)(0))
+        acc_mem_uns |= match_if.select(t_mem_sgn, Bits(1)(0))
+        acc_wb_en |= match_if.select(Bits(1)(t_wb), Bits(1)(0))
+        acc_br_type |= match_if.select(t_br, Bits(16)(0))
+        imm = t_imm_type.select1hot(Bits(32)(0), *imms)
+        acc_imm |= match_if.select(imm, Bits(32)(0))
+
+    return (
+        acc_alu_func,
+        acc_op1_sel,
+        acc_op2_sel,
+        acc_imm,
+        acc_br_type,
+        acc_mem_op,
+        acc_mem_wid,
+        acc_mem_uns,
+        acc_wb_en,
+        acc_rs1_used,
+        acc_rs2_used,
+    )
+
+
+def decode_by_table(*slots):
+    return [decode_table(*slot) for slot in slots]
+
+
+def source_size(path):
+    total_bytes, total_lines = 0, 0
+    for root, _, files in os.walk(path):
+        if "target" in root.split(os.sep):
+            continue
+        for name in files:
+            if not name.endswith(".rs"):
+                continue
+            with open(os.path.join(root, name), "rb") as f:
+                data = f.read()
+            total_bytes += len(data)
+            total_lines += data.count(b"\n")
+    return total_bytes, total_lines
+
+
+def measure(rom, compile_sim):
+    style = "rom" if rom else "table"
+    sys_builder = SysBuilder(f"measure_decoder_{style}")
+
+    decode_rom = src.decoder.decode_rom
+    if not rom:
+        src.decoder.decode_rom = decode_by_table
+    t0 = time.perf_counter()
+    try:
+        with sys_builder:
+            dut = Decoder()
+            driver = Driver()
+            output = MockDecoderShell()
+
+            icache_dout = RegArray(Bits(32), 1)
+            reg_file = RegArray(Bits(32), 32)
+
+            driver.build(dut, icache_dout, reg_file)
+            pre_pkt, rs1, rs2, rs1_used, rs2_used = dut.build(icache_dout, reg_file)
+            output.build(pre_pkt, rs1, rs2, rs1_used, rs2_used)
+    finally:
+        src.decoder.decode_rom = decode_rom
+    t1 = time.perf_counter()
+
+    cfg = config(verilog=False, sim_threshold=100, idle_threshold=100)
+    simulator_path, _ = elaborate(sys_builder, **cfg)
+    t2 = time.perf_counter()
+
+    result = {
+        "style": style,
+        "trace": t1 - t0,
+        "elaborate": t2 - t1,
+        "size": source_size(simulator_path),
+        "compile": None,
+    }
+    if compile_sim:
+        utils.build_simulator(simulator_path)
+        result["compile"] = time.perf_counter() - t2
+    return result
+
+
+if __name__ == "__main__":
+    compile_sim = "--compile" in sys.argv[1:]
+    results = [measure(False, compile_sim), measure(True, compile_sim)]
+
+    print(f"{'decoder':<8} {'trace(s)':>9} {'elab(s)':>9} {'src bytes':>10} {'src lines':>10} {'compile(s)':>11}")
+    for r in results:
+        compile_time = "-" if r["compile"] is None else f"{r['compile']:.2f}"
+        print(
+            f"{r['style']:<8} {r['trace']:>9.3f} {r['elaborate']:>9.3f} "
+            f"{r['size'][0]:>10} {r['size'][1]:>10} {compile_time:>11}"
+        )
@@ -0,0 +1,189 @@
+import sys
+import os
+import re
+from math import ceil, log2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+# ==============================================================================
+# EX 级拆分的逻辑深度估计：5 级流水 (split_ex=False) vs EX1 / EX2 (split_ex=True)
+#
+# 以单位门模型 (两输入门记 1 级) 估计 EX 及相邻各级的寄存器到寄存器路径：
+#   *   mux1h(k)：独热选择，与门 + k 输入或树
+#   *   add(n)：并行前缀加法器 (生成/传播 1 级，前缀树 log2 n 级，求和异或 1 级)
+#   *   eq(n)：逐位异或 + n 输入或树
+#   *   MUX2：二选一
+# ALU 取各运算中最深者再加 ALU_WIDTH (41) 路结果选择；_clz / _cpop 等按综合后的平衡结构估计，
+# 而不是源码中的串行写法。SRAM 的地址/写数据路径只算到端口，存储器本身的时间不计。
+# 周期时间按最深一级加寄存器开销 (REG_OVERHEAD) 估计。
+#
+# 用法：python scripts/measure_logic_depth.py [--cpi [迭代次数]]
+#   --cpi：另外在整条流水线上运行 bench_zicond 的两个内核，
+#          以 周期数 × 周期时间 比较两种流水线的执行时间 (需要 Assassyn)
+# ==============================================================================
+
+MUX2 = 2
+REG_OVERHEAD = 3  # 寄存器 clk-to-q 与建立时间，折合门级数
+
+
+def clog2(n):
+    return ceil(log2(n))
+
+
+def mux1h(k):
+    return 1 + clog2(k)
+
+
+def add(n):
+    return 2 + clog2(n)
+
+
+def eq(n):
+    return 1 + clog2(n)
+
+
+# ALU 各运算的深度 (不含结果选择)
+ALU_OPS = {
+    "add/sub": 1 + add(32),  # 减法先取反操作数 2
+    "slt/sltu": 1 + add(32),  # 比较取减法的进位
+    "shift": 5 * MUX2,  # 5 级桶形移位器
+    "shNadd": add(32),
+    "logic": 2,  # andn / orn / xnor
+    "clz/ctz": 2 * clog2(32),  # 优先编码树
+    "cpop": 2 * clog2(32) + add(6),  # 压缩树 + 最后的加法
+    "min/max": 1 + add(32) + MUX2,
+    "rol/ror": add(5) + 5 * MUX2 + 1,  # 反向移位量取负，两个移位器相或
+    "orc.b": eq(8) + MUX2,
+    "czero": eq(32) + MUX2,
+}
+ALU = max(ALU_OPS.values()) + mux1h(41)
+
+# Load 数据对齐：半字 / 字节选择，符号位选择，按位宽选出结果
+ALIGN_LOAD = MUX2 + MUX2 + MUX2 + mux1h(3)
+
+# 分支解析的尾部：从 ALU 结果 (比较结果) 到 branch_target_reg
+BRANCH_TAIL = [
+    ("BEQ/BNE: alu_result == 0", eq(32)),
+    ("taken: 与分支类型相与，8 路相或", 1 + clog2(8)),
+    ("next pc: taken / is_branch / flush 选择", 3 * MUX2),
+    ("mispredict: != next_pc_addr", eq(32)),
+    ("branch_target_reg 写入选择", MUX2),
+]
+
+# 乘法器第 2 级：64 位累加，高 32 位减修正项，取高 / 低半，与其他结果选择
+MUL_STAGE2 = [
+    ("64 位累加", add(64)),
+    ("高 32 位减修正项", 1 + add(32)),
+    ("高 / 低 32 位选择", MUX2),
+    ("与其他结果选择", MUX2),
+]
+
+
+def operand(rs_arms):
+    return [
+        (f"旁路选择 ({rs_arms} 路)", mux1h(rs_arms)),
+        ("操作数选择 (3 路)", mux1h(3)),
+    ]
+
+
+def pipeline_paths(split):
+    """返回 [(流水级, 路径名, [(步骤, 深度)])]。"""
+    if not split:
+        alu_path = operand(4) + [("ALU", ALU)]
+        return [
+            ("EX", "ALU -> 分支重定向", alu_path + BRANCH_TAIL),
+            ("EX", "ALU -> EX 旁路", alu_path + [("除法结果选择", MUX2)]),
+            ("EX", "ALU -> SRAM 地址", alu_path),
+            (
+                "EX",
+                "Load 数据 -> SRAM 写数据",
+                [("Load 数据对齐", ALIGN_LOAD), ("rs2 旁路选择 (4 路)", mux1h(4))],
+            ),
+            ("MEM", "乘法器第 2 级 -> MEM 旁路", MUL_STAGE2),
+            (
+                "MEM",
+                "Load 数据 -> MEM 旁路",
+                [("Load 数据对齐", ALIGN_LOAD), ("Load / ALU 选择", MUX2), ("乘法结果选择", MUX2)],
+            ),
+        ]
+    alu_path = operand(5) + [("ALU", ALU)]
+    return [
+        ("EX1", "ALU -> EX1 旁路 / EX2", alu_path + [("除法结果选择", MUX2)]),
+        ("EX2", "比较结果 -> 分支重定向", BRANCH_TAIL),
+        ("EX2", "乘法器第 2 级 -> EX2 旁路", MUL_STAGE2),
+        (
+            "EX2",
+            "Load 数据 -> SRAM 写数据",
+            [("Load 数据对齐", ALIGN_LOAD), ("写数据选择", MUX2)],
+        ),
+        (
+            "MEM",
+            "Load 数据 -> MEM 旁路",
+            [("Load 数据对齐", ALIGN_LOAD), ("Load / ALU 选择", MUX2)],
+        ),
+    ]
+
+
+def report(split):
+    name = "split_ex=True (EX1 / EX2)" if split else "split_ex=False (5 级)"
+    print(f"=== {name} ===")
+    worst = 0
+    for stage, path, steps in pipeline_paths(split):
+        depth = sum(d for _, d in steps)
+        worst = max(worst, depth)
+        chain = " + ".join(f"{step} {d}" for step, d in steps)
+        print(f"  [{stage:<3}] {path:<28} {depth:>3}  ({chain})")
+    print(f"  最深一级: {worst} 级，周期时间: {worst + REG_OVERHEAD}")
+    return worst + REG_OVERHEAD
+
+
+def run_kernel(split, iterations, branchless):
+    from assassyn import utils
+    from src.main import build_cpu
+    from scripts.bench_zicond import DEPTH_LOG, A3, DONE, kernel, reference, write_workload
+
+    workload = write_workload(kernel(iterations, branchless))
+    _, binary_path = build_cpu(
+        depth_log=DEPTH_LOG,
+        sim_threshold=iterations * 40 + 200,
+        split_ex=split,
+        workload=workload,
+    )
+    raw = utils.run_simulator(binary_path=binary_path)
+
+    done_cycle, total = None, 0
+    for line in raw.split("\n"):
+        m = re.search(r"Cycle @(\d+).*WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if not m:
+            continue
+        rd = int(m.group(2))
+        if rd == A3:
+            total = int(m.group(3), 16)
+        elif rd == DONE and done_cycle is None:
+            done_cycle = int(m.group(1))
+    assert done_cycle is not None, "Kernel did not reach the end marker"
+    assert total == reference(iterations), f"a3 = 0x{total:08x}, wrong result"
+    return done_cycle
+
+
+if __name__ == "__main__":
+    period = {split: report(split) for split in (False, True)}
+    print(f"周期时间之比 (拆分 / 不拆分): {period[True] / period[False]:.2f}")
+
+    if "--cpi" in sys.argv:
+        pos = sys.argv.index("--cpi")
+        iterations = int(sys.argv[pos + 1]) if len(sys.argv) > pos + 1 else 200
+
+        print(f"{'kernel':<11} {'split':<6} {'cycles':>8} {'period':>7} {'time':>9}")
+        for branchless in (False, True):
+            kernel_name = "branchless" if branchless else "branchy"
+            times = {}
+            for split in (False, True):
+                cycles = run_kernel(split, iterations, branchless)
+                times[split] = cycles * period[split]
+                print(
+                    f"{kernel_name:<11} {str(split):<6} {cycles:>8} "
+                    f"{period[split]:>7} {times[split]:>9}"
+                )
+            print(f"{kernel_name}: speedup {times[False] / times[True]:.2f}x")
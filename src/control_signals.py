@@ -25,21 +25,63 @@ class ImmType:
 
 
 # 2. 执行阶段控制信号 (EX Control)
-# ALU 功能码 (One-hot 映射, 假设 Bits(16))
-# 顺序对应 alu_func[i]
+# ALU 功能码 (One-hot 映射, Bits(ALU_WIDTH))
+# 顺序对应 alu_func[i]，位宽等于实际存在的运算个数，不留占位
+ALU_WIDTH = 41
+
+
 class ALUOp:
-    ADD = Bits(16)(0b0000000000000001)
-    SUB = Bits(16)(0b0000000000000010)
-    SLL = Bits(16)(0b0000000000000100)
-    SLT = Bits(16)(0b0000000000001000)
-    SLTU = Bits(16)(0b0000000000010000)
-    XOR = Bits(16)(0b0000000000100000)
-    SRL = Bits(16)(0b0000000001000000)
-    SRA = Bits(16)(0b0000000010000000)
-    OR = Bits(16)(0b0000000100000000)
-    AND = Bits(16)(0b0000001000000000)
-    # 占位/直通/特殊用途
-    NOP = Bits(16)(0b1000000000000000)
+    ADD = Bits(ALU_WIDTH)(1 << 0)
+    SUB = Bits(ALU_WIDTH)(1 << 1)
+    SLL = Bits(ALU_WIDTH)(1 << 2)
+    SLT = Bits(ALU_WIDTH)(1 << 3)
+    SLTU = Bits(ALU_WIDTH)(1 << 4)
+    XOR = Bits(ALU_WIDTH)(1 << 5)
+    SRL = Bits(ALU_WIDTH)(1 << 6)
+    SRA = Bits(ALU_WIDTH)(1 << 7)
+    OR = Bits(ALU_WIDTH)(1 << 8)
+    AND = Bits(ALU_WIDTH)(1 << 9)
+    # M 扩展：乘积由 EX/MEM 两级流水乘法器给出 (见 execution.py)，ALU 不产生结果
+    MUL = Bits(ALU_WIDTH)(1 << 10)
+    MULH = Bits(ALU_WIDTH)(1 << 11)
+    MULHSU = Bits(ALU_WIDTH)(1 << 12)
+    MULHU = Bits(ALU_WIDTH)(1 << 13)
+    # 直通/特殊用途
+    NOP = Bits(ALU_WIDTH)(1 << 14)
+    # M 扩展：商 / 余数由 EX 级的多周期除法器给出 (见 execution.py)，ALU 不产生结果
+    DIV = Bits(ALU_WIDTH)(1 << 15)
+    DIVU = Bits(ALU_WIDTH)(1 << 16)
+    REM = Bits(ALU_WIDTH)(1 << 17)
+    REMU = Bits(ALU_WIDTH)(1 << 18)
+    # Zba：地址计算 (rs1 << n) + rs2
+    SH1ADD = Bits(ALU_WIDTH)(1 << 19)
+    SH2ADD = Bits(ALU_WIDTH)(1 << 20)
+    SH3ADD = Bits(ALU_WIDTH)(1 << 21)
+    # Zbb：取反逻辑运算
+    ANDN = Bits(ALU_WIDTH)(1 << 22)
+    ORN = Bits(ALU_WIDTH)(1 << 23)
+    XNOR = Bits(ALU_WIDTH)(1 << 24)
+    # Zbb：位计数 (只用操作数 1)
+    CLZ = Bits(ALU_WIDTH)(1 << 25)
+    CTZ = Bits(ALU_WIDTH)(1 << 26)
+    CPOP = Bits(ALU_WIDTH)(1 << 27)
+    # Zbb：最值
+    MIN = Bits(ALU_WIDTH)(1 << 28)
+    MINU = Bits(ALU_WIDTH)(1 << 29)
+    MAX = Bits(ALU_WIDTH)(1 << 30)
+    MAXU = Bits(ALU_WIDTH)(1 << 31)
+    # Zbb：符号 / 零扩展 (只用操作数 1)
+    SEXTB = Bits(ALU_WIDTH)(1 << 32)
+    SEXTH = Bits(ALU_WIDTH)(1 << 33)
+    ZEXTH = Bits(ALU_WIDTH)(1 << 34)
+    # Zbb：循环移位 (使用低 5 位作为移位位数) 与字节操作
+    ROL = Bits(ALU_WIDTH)(1 << 35)
+    ROR = Bits(ALU_WIDTH)(1 << 36)
+    ORCB = Bits(ALU_WIDTH)(1 << 37)
+    REV8 = Bits(ALU_WIDTH)(1 << 38)
+    # Zicond：条件清零 (rs2 为 0 / 非 0 时结果为 0，否则为 rs1)
+    CZEROEQZ = Bits(ALU_WIDTH)(1 << 39)
+    CZERONEZ = Bits(ALU_WIDTH)(1 << 40)
 
 
 class BranchType:
@@ -54,18 +96,33 @@ class BranchType:
     JALR = Bits(16)(0b0000000100000000)
 
 
+# 返回地址栈操作 (One-hot, Bits(3))
+# PUSH: jal/jalr 且 rd 为 x1/x5 (函数调用)
+# POP:  jalr 且 rd=x0, rs1 为 x1/x5 (函数返回)
+class RasOp:
+    NONE = Bits(3)(0b001)
+    PUSH = Bits(3)(0b010)
+    POP = Bits(3)(0b100)
+
+
+# 寄存器堆写穿透：WB 级本周期写回的值在 ID 级读寄存器时已可见，不需要 WB 旁路
+# EX2_BYPASS：拆分 EX (build_cpu(split_ex=True)) 时 EX2 级末的结果 (ex2_bypass_reg)，
+# 此时 EX_MEM_BYPASS 为 EX1 级末的结果
 class Rs1Sel:
     RS1 = Bits(4)(0b0001)
     EX_MEM_BYPASS = Bits(4)(0b0010)
     MEM_WB_BYPASS = Bits(4)(0b0100)
-    WB_BYPASS = Bits(4)(0b1000)
+    EX2_BYPASS = Bits(4)(0b1000)
 
 
+# rs2 多一路 LOAD_DATA：Store 的写数据依赖紧邻的 Load 时，在 Load 处于 MEM 级的周期
+# 直接取其对齐后的读出数据 (地址仍在 EX 级计算)，不必停顿
 class Rs2Sel:
-    RS2 = Bits(4)(0b0001)
-    EX_MEM_BYPASS = Bits(4)(0b0010)
-    MEM_WB_BYPASS = Bits(4)(0b0100)
-    WB_BYPASS = Bits(4)(0b1000)
+    RS2 = Bits(5)(0b00001)
+    EX_MEM_BYPASS = Bits(5)(0b00010)
+    MEM_WB_BYPASS = Bits(5)(0b00100)
+    LOAD_DATA = Bits(5)(0b01000)
+    EX2_BYPASS = Bits(5)(0b10000)
 
 
 # 操作数 1 选择 (One-hot, Bits(3))
@@ -135,14 +192,14 @@ mem_ctrl_signals = Record(
 
 # 执行域 (ExCtrl)
 ex_ctrl_signals = Record(
-    # ALU 功能码，使用 Bits(16) 静态定义 (ADD:Bits(16)(0b0000000000000001), SUB:Bits(16)(0b0000000000000010), ...)
-    alu_func=Bits(16),
+    # ALU 功能码，使用 Bits(ALU_WIDTH) 静态定义 (ADD:1 << 0, SUB:1 << 1, ...)
+    alu_func=Bits(ALU_WIDTH),
     rs1_sel=Bits(
         4
-    ),  # rs1结果来源，使用 Bits(4) 静态定义 (RS1:Bits(4)(0b0001), EX_BYPASS:Bits(4)(0b0010), MEM_BYPASS:Bits(4)(0b0100), WB_BYPASS: Bits(4)(0b1000))
+    ),  # rs1结果来源，使用 Bits(4) 静态定义 (RS1:Bits(4)(0b0001), EX_BYPASS:Bits(4)(0b0010), MEM_BYPASS:Bits(4)(0b0100), EX2_BYPASS:Bits(4)(0b1000))
     rs2_sel=Bits(
-        4
-    ),  # rs2结果来源，使用 Bits(4) 静态定义 (RS2:Bits(4)(0b0001), EX_BYPASS:Bits(4)(0b0010), MEM_BYPASS:Bits(4)(0b0100), WB_BYPASS:Bits(4)(0b1000))
+        5
+    ),  # rs2结果来源，使用 Bits(5) 静态定义 (RS2, EX_BYPASS, MEM_BYPASS, LOAD_DATA, EX2_BYPASS 依次为 0b00001 .. 0b10000)
     op1_sel=Bits(
         3
     ),  # 操作数1来源，使用 Bits(3) 静态定义 (RS1:Bits(3)(0b001), PC:Bits(3)(0b010), ZERO:Bits(3)(0b100))
@@ -151,16 +208,54 @@ ex_ctrl_signals = Record(
     ),  # 操作数2来源，使用 Bits(3) 静态定义 (RS2:Bits(3)(0b001), IMM:Bits(3)(0b010), CONST_4:Bits(3)(0b100))
     branch_type=Bits(16),  # Branch 指令功能码，使用 Bits(16) 静态定义
     next_pc_addr=Bits(32),  # 预测结果：下一条指令的地址
+    ras_op=Bits(3),  # 返回地址栈操作 (RasOp)，随分支结果回传 IF
+    is_rvc=Bits(1),  # 压缩指令 (2 字节)：链接地址与顺序地址为 pc + 2
     mem_ctrl=mem_ctrl_signals,  # 【嵌套】携带 MEM 级信号
 )
 
+# 编码的执行域 (ExCtrlEnc)
+# build_cpu(encoded_ctrl=True) 时 ID->EX 的 FIFO 使用此格式：独热字段改为置位下标的二进制编码，
+# 由 DecoderImpl 压缩 (encode_ex_ctrl)，EX 入口译回独热码 (decode_ex_ctrl)
+mem_ctrl_enc_signals = Record(
+    mem_opcode=Bits(2),  # MemOp 的位下标
+    mem_width=Bits(2),  # MemWidth 的位下标
+    mem_unsigned=Bits(1),
+    rd_addr=Bits(5),
+)
+
+ex_ctrl_enc_signals = Record(
+    alu_func=Bits(6),  # ALUOp 的位下标 (41 -> 6 位)
+    rs1_sel=Bits(2),
+    rs2_sel=Bits(3),
+    op1_sel=Bits(2),
+    op2_sel=Bits(2),
+    branch_type=Bits(4),  # BranchType 的位下标 (16 -> 4 位)
+    next_pc_addr=Bits(32),
+    ras_op=Bits(2),
+    is_rvc=Bits(1),
+    mem_ctrl=mem_ctrl_enc_signals,
+)
+
+# EX1 -> EX2 控制域 (Ex2Ctrl)
+# 拆分 EX 时 EX1 (旁路 + ALU) 送往 EX2 (分支解析 + 访存发出) 的控制信号
+ex2_ctrl_signals = Record(
+    branch_type=Bits(16),  # EX1 被冲刷时为 NO_BRANCH
+    next_pc_addr=Bits(32),  # IF 预测结果
+    ras_op=Bits(3),
+    is_rvc=Bits(1),
+    store_late=Bits(1),  # Store 的写数据取自紧邻 Load 的读出数据 (Rs2Sel.LOAD_DATA)
+    mem_ctrl=mem_ctrl_signals,
+)
+
 pre_decode_t = Record(
     # 原始控制信号
-    alu_func=Bits(16),
+    alu_func=Bits(ALU_WIDTH),
     op1_sel=Bits(3),
     op2_sel=Bits(3),
     branch_type=Bits(16),  # Branch 指令功能码
     next_pc_addr=Bits(32),  # IF 预测结果
+    ras_op=Bits(3),  # 返回地址栈操作
+    is_rvc=Bits(1),  # 压缩指令 (2 字节)
     # 嵌套的后续阶段控制
     mem_ctrl=mem_ctrl_signals,
     # 原始数据需求
@@ -169,3 +264,101 @@ pre_decode_t = Record(
     rs2_data=Bits(32),
     imm=Bits(32),
 )
+
+# 循环缓冲表项 (LoopPacket)
+# Decoder 捕获的译码结果 (不含寄存器值，回放时按 rs1/rs2 重新读取寄存器堆)
+loop_packet_t = Record(
+    alu_func=Bits(ALU_WIDTH),
+    op1_sel=Bits(3),
+    op2_sel=Bits(3),
+    branch_type=Bits(16),
+    ras_op=Bits(3),
+    mem_opcode=Bits(3),
+    mem_width=Bits(3),
+    mem_unsigned=Bits(1),
+    rd_addr=Bits(5),
+    imm=Bits(32),
+    rs1=Bits(5),
+    rs2=Bits(5),
+    rs1_used=Bits(1),
+    rs2_used=Bits(1),
+)
+
+# Load 对齐信息 (LoadAlign)
+# EX 级每周期记下送往 MEM 的访存格式，下一周期 Store 取紧邻 Load 的数据时用于对齐 SRAM 读出的字
+load_align_signals = Record(
+    mem_width=Bits(3),  # 访存位宽 (独热码，见 MemWidth)
+    mem_unsigned=Bits(1),  # 是否无符号扩展
+    offset=Bits(2),  # 地址低 2 位
+)
+
+# 乘法流水段 (MulStage)
+# EX 级算出部分积后写入，下一周期由 MEM 级读取并完成累加 (见 execution.py 的 PipelinedMultiplier)
+mul_stage_signals = Record(
+    valid=Bits(1),  # 本段是否为有效的乘法指令
+    high=Bits(1),  # 取积的高 32 位 (MULH/MULHSU/MULHU)，否则取低 32 位 (MUL)
+    pp_lo=Bits(32),  # a[15:0] * b[15:0]
+    pp_hi=Bits(32),  # a[31:16] * b[31:16]
+    pp_mid=Bits(33),  # a[15:0] * b[31:16] + a[31:16] * b[15:0]
+    corr=Bits(32),  # 有符号修正项：从无符号积的高 32 位中减去
+)
+
+# 除法器状态 (DivState)
+# EX 级收到除法指令时写入初值，此后每周期迭代一步，直到给出结果 (见 execution.py 的 IterativeDivider)
+div_state_signals = Record(
+    busy=Bits(1),  # 正在迭代 (ID/IF 停顿)
+    count=Bits(6),  # 剩余迭代次数 (0 表示结果已在 rem/quo 中)
+    rem=Bits(32),  # 部分余数 (|被除数| 起算)
+    divisor=Bits(32),  # 已左移对齐的 |除数|，每次迭代右移一位
+    quo=Bits(32),  # 已产生的商位
+    neg_q=Bits(1),  # 商取负 (有符号且被除数、除数异号)
+    neg_r=Bits(1),  # 余数取负 (有符号且被除数为负)
+    want_rem=Bits(1),  # 结果取余数 (REM/REMU)，否则取商
+    rd=Bits(5),  # 目标寄存器，结果给出时随包送往 MEM
+)
+
+# 分支预测训练通道 (BpUpdate)
+# EX 解析分支后写入全局寄存器，下一周期由 FetcherImpl 读取并更新预测表
+bp_update_signals = Record(
+    valid=Bits(1),  # 本周期 EX 是否解析了一条有效的分支/跳转指令
+    is_cond=Bits(1),  # 是否为条件分支 (只有条件分支训练方向预测表)
+    taken=Bits(1),  # 实际跳转方向
+    pc=Bits(32),  # 分支指令地址 (预测表索引)
+    target=Bits(32),  # 跳转目标 (calc_target，用于填充 BTB)
+    ras_op=Bits(3),  # 返回地址栈操作 (RasOp)，用于提交侧栈指针与 BTB 表项类型
+    is_rvc=Bits(1),  # 是否为压缩指令 (BTB 表项记录，推测压栈时链接地址为 pc + 2)
+)
+
+# ID 级重定向通道 (IdRedirect)
+# DecoderImpl 提前解析跳转/分支后写入，下一周期由 FetcherImpl 读取；优先级低于 EX 级冲刷
+id_redirect_signals = Record(
+    valid=Bits(1),  # 本周期 ID 级是否需要重定向取指
+    target=Bits(32),  # 正确的下一条地址
+    is_cond=Bits(1),  # 是否为条件分支 (重定向时补移入全局历史)
+    taken=Bits(1),  # 条件分支的实际方向
+    link=Bits(32),  # 链接地址 (跳转指令地址 + 指令长度)，重定向时补做压栈用
+    ras_op=Bits(3),  # 该跳转的返回地址栈操作，重定向时补做到推测侧
+)
+
+# 第二执行通道 ID/EX 级间寄存器 (LaneEx)
+# 双发射时 DecoderImpl 写入配对的第二条指令 (只含 ALU 操作)，下一周期由 AluLane 读取
+lane_ex_signals = Record(
+    alu_func=Bits(ALU_WIDTH),
+    op1_sel=Bits(3),
+    op2_sel=Bits(3),
+    rs1_sel=Bits(4),  # 同 Rs1Sel (不会出现 EX2_BYPASS)
+    rs2_sel=Bits(5),  # 同 Rs2Sel (不会出现 LOAD_DATA、EX2_BYPASS)
+    fwd_lane=Bits(2),  # rs1/rs2 (低位/高位) 的旁路值取自第二通道
+    rd_addr=Bits(5),  # 为 0 表示气泡
+    pc=Bits(32),
+    rs1_data=Bits(32),
+    rs2_data=Bits(32),
+    imm=Bits(32),
+)
+
+# 第二执行通道的结果 (LaneResult)
+# EX->MEM、MEM->WB 两级级间寄存器，同时作为该通道的 EX / MEM 旁路
+lane_result_signals = Record(
+    rd_addr=Bits(5),
+    data=Bits(32),
+)
@@ -2,6 +2,108 @@ from assassyn.frontend import *
 from .control_signals import *
 
 
+class Scoreboard:
+    """
+    记分牌：按寄存器记录在途的最新一条写入者，DataHazardUnit 据此检测依赖、选择旁路。
+
+    与 PipelinedMultiplier 一样只持有状态，逻辑由调用方生成：
+    *   stage[r]：写入者所在的流水级 (独热码，0b01 为 EX，0b10 为 MEM)。为 0 表示不在途：
+        已到 WB (由寄存器堆写穿透提供) 或早已写回。决定旁路选择码。
+    *   wait[r]：结果还要几个周期才出现在旁路上，非 0 时相关指令停顿。
+    *   DecoderImpl 发出指令时按其功能部件登记的延迟写入表项 (update)，此后每周期
+        表项前移一级、倒计时减一；DataHazardUnit 只按 rs1/rs2 读两项 (lookup)。
+        增加功能部件只多一条登记，不增加比较器。
+    *   load_data[r]：写入者是 Load。紧随其后的 Store 只把它当写数据时不必停顿，
+        在 Load 到达 MEM 级的周期直接取其读出数据 (Rs2Sel.LOAD_DATA)。
+    *   late[r]：写入者的结果要到 MEM 级才给出 (Load、乘法器)。写入者在 MEM 级时，
+        其余写入者的结果已在上一级的旁路寄存器中，ID 级的分支比较器可以直接使用。
+    *   变长部件 (除法器) 按延迟 1 登记，忙时 EX 级的表项保持不动。
+    *   lane[r]：写入者所在的执行通道 (双发射时第 1 路为 AluLane，延迟恒为 1)，
+        决定旁路值取自哪个通道的 EX / MEM 旁路。
+    *   分支冲刷时清除 EX 级的表项：被它覆盖的更早写入者此时已到 WB，由写穿透提供。
+    *   split_ex：EX 拆为 EX1 / EX2 两级 (见 Execution2)，stage 多一位
+        (0b001 为 EX1，0b010 为 EX2，0b100 为 MEM)，最长延迟随之加一。
+        分支在 EX2 解析，冲刷时 EX1 与 EX2 的表项一并清除。
+    """
+
+    # 结果最晚在 WB 级给出 (由写穿透读出)
+    MAX_LATENCY = 3
+
+    def __init__(self, split_ex=False):
+        self.split_ex = split_ex
+        self.levels = 3 if split_ex else 2
+        self.max_latency = self.MAX_LATENCY + (1 if split_ex else 0)
+        self.stage = RegArray(Bits(self.levels), 32)
+        self.wait = RegArray(UInt(2), 32)
+        self.load_data = RegArray(Bits(1), 32)
+        self.late = RegArray(Bits(1), 32)
+        self.lane = RegArray(Bits(1), 32)
+        self.units = []
+
+    def register(self, latency, alu_ops=None, mem_op=None):
+        """登记功能部件：alu_func 命中 alu_ops 或 mem_opcode 为 mem_op 的指令，
+        结果在进入 EX 后第 latency 个周期末给出。未登记的指令延迟为 1 (ALU)。"""
+        if not 1 <= latency <= self.max_latency:
+            raise ValueError(f"Scoreboard latency must be in 1..{self.max_latency}")
+        if alu_ops is None and mem_op is None:
+            raise ValueError("A functional unit needs alu_ops or mem_op")
+        self.units.append((latency, alu_ops, mem_op))
+
+    def lookup(self, rs_idx):
+        """返回 (最新写入者所在流水级, 结果是否尚未就绪, 写入者是否为 Load)。"""
+        stage = self.stage[rs_idx]
+        pending = (stage != Bits(self.levels)(0)) & (self.wait[rs_idx] != UInt(2)(0))
+        return stage, pending, self.load_data[rs_idx]
+
+    def update(self, rd, alu_func, mem_opcode, flush, hold=None, rd2=None):
+        """每周期调用：登记本周期 ID 发出的指令 (rd 为 0 表示气泡)，其余表项前移一级。
+
+        rd2 为同周期发往第 1 路的第二条 (只有 ALU，与 rd 不同)。"""
+        wait_init = UInt(2)(0)
+        is_late = Bits(1)(0)
+        for latency, alu_ops, mem_op in self.units:
+            hit = Bits(1)(0)
+            if alu_ops is not None:
+                hit = hit | ((alu_func & alu_ops) != Bits(ALU_WIDTH)(0))
+            if mem_op is not None:
+                hit = hit | (mem_opcode == mem_op)
+            wait_init = hit.select(UInt(2)(latency - 1), wait_init)
+            # 结果在 MEM 级 (或更晚) 给出
+            if latency >= self.levels:
+                is_late = is_late | hit
+        is_load = mem_opcode == MemOp.LOAD
+
+        if hold is None:
+            hold = Bits(1)(0)
+        if rd2 is None:
+            rd2 = Bits(5)(0)
+
+        for r in range(1, 32):
+            stage = self.stage[r]
+            wait = self.wait[r]
+            in_ex = stage[0:0]
+            # EX 级的写入者：冲刷则作废，除法器忙则原地保持，否则进入 MEM；MEM 级的进入 WB 后出表
+            ex_next = in_ex & hold & ~flush
+            if self.split_ex:
+                # EX1 -> EX2 -> MEM，EX2 中的写入者同样在错误路径上
+                next_stage = concat(stage[1:1] & ~flush, in_ex & ~hold & ~flush, ex_next)
+            else:
+                next_stage = concat(in_ex & ~hold & ~flush, ex_next)
+            frozen = in_ex & hold
+            wait_next = (frozen | (wait == UInt(2)(0))).select(wait, wait - UInt(2)(1))
+
+            issue = rd == Bits(5)(r)
+            issue2 = rd2 == Bits(5)(r)
+            self.stage[r] = (issue | issue2).select(Bits(self.levels)(1), next_stage)
+            self.wait[r] = issue.select(
+                wait_init, issue2.select(UInt(2)(0), wait_next)
+            )
+            with Condition(issue | issue2):
+                self.load_data[r] = issue & is_load
+                self.late[r] = issue & is_late
+                self.lane[r] = issue2
+
+
 class DataHazardUnit(Downstream):
     """
     DataHazardUnit 是一个纯组合逻辑 (Downstream) 模块。
@@ -9,8 +111,19 @@ class DataHazardUnit(Downstream):
     职责：
     1. 前瞻控制 (Forwarding Logic)：检测 RAW 冒险，生成多路选择信号，控制 EX 阶段 ALU 的操作数来源。
     2. 阻塞控制 (Stall Logic)：检测 Load-Use 冒险，生成流水线停顿（Stall）和气泡（Flush）信号。
+       按结果延迟区分：ALU 结果在 EX 末可用 (不停顿)；Load 与乘法的结果在 MEM 末才可用，
+       只有紧随其后的相关指令停顿一拍，间隔一条的经 MEM 旁路取得结果。
+       WB 级正在写回的寄存器由寄存器堆写穿透提供 (见 DecoderImpl)，不需要旁路。
+       除法器迭代期间 (ex_div_busy) 无条件停顿，与依赖无关。
+       Store 的写数据 (rs2) 依赖紧邻的 Load 时不停顿，只有地址操作数 (rs1) 的依赖才停顿。
+    3. 依赖检测：按记分牌查 rs1/rs2 的最新写入者 (延迟由各功能部件登记)，
+       不与各级回传的目标寄存器逐级比较。
+    4. 双发射 (给出 dual 时)：两条指令的旁路值各自取自最新写入者所在的通道，
+       并为窗口中的第二条生成旁路选择码与冒险信号 (见 DualIssue)。
+    5. 拆分 EX (记分牌的 split_ex)：多一级旁路，写入者在 EX2 时取 EX2 末的结果
+       (Rs1Sel/Rs2Sel.EX2_BYPASS)，在 MEM 时取 MEM 旁路。
 
-    特性：无内部状态（Stateless）。它依赖流水线各级"回传"的实时控制信号包作为真值来源。
+    特性：本身无内部状态（Stateless），依赖 Scoreboard 中的表项 (由 DecoderImpl 维护)。
     """
 
     def __init__(self):
@@ -25,23 +138,20 @@ class DataHazardUnit(Downstream):
         rs2_idx: Bits(5),  # 源寄存器 2 索引 (Bits 5)
         rs1_used: Bits(1),  # 是否需要读取 rs1 (Bits 1) - 避免 LUI 等指令的虚假冒险
         rs2_used: Bits(1),  # 是否需要读取 rs2 (Bits 1)
-        # --- 2. 来自流水线各级 (实时状态回传) ---
-        # 各级 Module build() 的返回值
-        ex_rd: Bits(5),  # EX 级目标寄存器索引
-        ex_is_load: Bits(1),  # EX 级是否为 Load 指令
-        mem_rd: Bits(5),  # MEM 级目标寄存器索引
-        wb_rd: Bits(5),  # WB 级目标寄存器索引
+        # --- 2. 记分牌：在途写入者所在的流水级与剩余延迟 (由 DecoderImpl 维护) ---
+        scoreboard: Scoreboard,
+        pre: Record = None,  # 预解码包 (可选)：识别 Store，其 rs2 只作写数据，可晚取
+        # --- 3. 来自 EX 级 (实时状态回传) ---
+        ex_div_busy: Bits(1) = None,  # EX 级除法器忙 (可选，结果给出前 ID/IF 保持)
+        # --- 4. 双发射 (可选)：第二条的冒险检测与跨通道旁路 ---
+        dual=None,
     ):
         log(
-            "Input Signals: rs1_idx={} rs2_idx={} rs1_used={} rs2_used={} ex_rd={} ex_is_load={} mem_rd={} wb_rd={}",
+            "Input Signals: rs1_idx={} rs2_idx={} rs1_used={} rs2_used={}",
             rs1_idx,
             rs2_idx,
             rs1_used,
             rs2_used,
-            ex_rd,
-            ex_is_load,
-            mem_rd,
-            wb_rd,
         )
         # 默认值：不旁路，直接使用寄存器值
         rs1_sel = Rs1Sel.RS1
@@ -51,32 +161,67 @@ class DataHazardUnit(Downstream):
         rs1_is_zero = rs1_idx == Bits(5)(0)
         rs2_is_zero = rs2_idx == Bits(5)(0)
 
-        # 1. 检测 Load-Use 冒险 (必须 Stall)
-        # 条件：当前指令需要的源寄存器与 EX 级的 Load 指令的目标寄存器相同
-        # 这种情况下必须停顿，因为 Load 指令的数据在 MEM 阶段才能获取
-        load_use_hazard_rs1 = rs1_used & ~rs1_is_zero & ex_is_load & (rs1_idx == ex_rd)
-        load_use_hazard_rs2 = rs2_used & ~rs2_is_zero & ex_is_load & (rs2_idx == ex_rd)
+        # 记分牌：查 rs1/rs2 的最新写入者，结果未就绪则停顿，否则按其所在流水级旁路
+        rs1_stage, rs1_hazard, _ = scoreboard.lookup(rs1_idx)
+        rs2_stage, rs2_hazard, rs2_is_load = scoreboard.lookup(rs2_idx)
+        rs2_load_data = rs2_stage[0:0] & rs2_is_load
+        log("Input Signals: rs1_stage={} rs2_stage={}", rs1_stage, rs2_stage)
 
-        # 如果存在 Load-Use 冒险，需要停顿流水线
-        stall_if = load_use_hazard_rs1 | load_use_hazard_rs2
+        # 由远到近：MEM 级 -> (EX2 级) -> EX 级，越近的写入者越新
+        mem = scoreboard.levels - 1
+        rs1_fwd = rs1_stage[mem:mem].select(Rs1Sel.MEM_WB_BYPASS, Rs1Sel.RS1)
+        rs2_fwd = rs2_stage[mem:mem].select(Rs2Sel.MEM_WB_BYPASS, Rs2Sel.RS2)
+        if scoreboard.split_ex:
+            rs1_fwd = rs1_stage[1:1].select(Rs1Sel.EX2_BYPASS, rs1_fwd)
+            rs2_fwd = rs2_stage[1:1].select(Rs2Sel.EX2_BYPASS, rs2_fwd)
+        rs1_fwd = rs1_stage[0:0].select(Rs1Sel.EX_MEM_BYPASS, rs1_fwd)
+        rs2_fwd = rs2_stage[0:0].select(Rs2Sel.EX_MEM_BYPASS, rs2_fwd)
 
-        # 2. 检测 Forwarding (生成 Mux 选择码)
-        # 如果没有 Load-Use 冒险，我们生成选择码 rs1_sel 与 rs2_sel
+        # Store 的写数据依赖 EX 级的 Load：不停顿，Load 到达 MEM 级时 EX 直接取其读出数据
+        # (地址操作数 rs1 的依赖仍须停顿)
+        if pre is not None:
+            id_is_store = mem_ctrl_signals.view(pre.mem_ctrl).mem_opcode == MemOp.STORE
+            store_data_late = id_is_store & rs2_load_data
+            rs2_hazard = rs2_hazard & ~store_data_late
+            rs2_fwd = store_data_late.select(Rs2Sel.LOAD_DATA, rs2_fwd)
 
-        rs1_wb_pass = (rs1_idx == wb_rd).select(Rs1Sel.WB_BYPASS, Rs1Sel.RS1)
-        rs1_mem_bypass = (rs1_idx == mem_rd).select(Rs1Sel.MEM_WB_BYPASS, rs1_wb_pass)
-        rs1_ex_bypass = ((rs1_idx == ex_rd) & ~ex_is_load).select(
-            Rs1Sel.EX_MEM_BYPASS, rs1_mem_bypass
+        # 如果存在 Load-Use 冒险，需要停顿流水线
+        stall_if = (rs1_used & ~rs1_is_zero & rs1_hazard) | (
+            rs2_used & ~rs2_is_zero & rs2_hazard
         )
-        rs1_sel = (rs1_used & ~rs1_is_zero).select(rs1_ex_bypass, Rs1Sel.RS1)
 
-        # 对于 rs2 的旁路选择
-        rs2_wb_pass = (rs2_idx == wb_rd).select(Rs2Sel.WB_BYPASS, Rs2Sel.RS2)
-        rs2_mem_bypass = (rs2_idx == mem_rd).select(Rs2Sel.MEM_WB_BYPASS, rs2_wb_pass)
-        rs2_ex_bypass = ((rs2_idx == ex_rd) & ~ex_is_load).select(
-            Rs2Sel.EX_MEM_BYPASS, rs2_mem_bypass
-        )
-        rs2_sel = (rs2_used & ~rs2_is_zero).select(rs2_ex_bypass, Rs2Sel.RS2)
+        # 多周期除法：ID 保持当前指令、IF 保持 PC，直到除法器给出结果
+        if ex_div_busy is not None:
+            stall_if = stall_if | ex_div_busy
+
+        rs1_sel = (rs1_used & ~rs1_is_zero).select(rs1_fwd, Rs1Sel.RS1)
+        rs2_sel = (rs2_used & ~rs2_is_zero).select(rs2_fwd, Rs2Sel.RS2)
+
+        # 双发射：旁路值按记分牌记录的通道取自第 0 路或第 1 路 (选择码不变)；
+        # 窗口中的第二条同样查表，结果未就绪时不配对 (与队头的相关由 Decoder 排除)
+        if dual is not None:
+            lane = scoreboard.lane
+            rs1b, rs2b = dual.rs1, dual.rs2
+            rs1b_stage, rs1b_pending, _ = scoreboard.lookup(rs1b)
+            rs2b_stage, rs2b_pending, _ = scoreboard.lookup(rs2b)
+            rs1b_on = dual.rs1_used & (rs1b != Bits(5)(0))
+            rs2b_on = dual.rs2_used & (rs2b != Bits(5)(0))
+
+            rs1b_fwd = rs1b_stage[0:0].select(
+                Rs1Sel.EX_MEM_BYPASS,
+                rs1b_stage[1:1].select(Rs1Sel.MEM_WB_BYPASS, Rs1Sel.RS1),
+            )
+            rs2b_fwd = rs2b_stage[0:0].select(
+                Rs2Sel.EX_MEM_BYPASS,
+                rs2b_stage[1:1].select(Rs2Sel.MEM_WB_BYPASS, Rs2Sel.RS2),
+            )
+            dual.resolve(
+                fwd_lane=concat(lane[rs2_idx], lane[rs1_idx]),
+                fwd_lane2=concat(lane[rs2b], lane[rs1b]),
+                rs1_sel2=rs1b_on.select(rs1b_fwd, Rs1Sel.RS1),
+                rs2_sel2=rs2b_on.select(rs2b_fwd, Rs2Sel.RS2),
+                hazard2=(rs1b_on & rs1b_pending) | (rs2b_on & rs2b_pending),
+            )
 
         log(
             "DataHazardUnit: rs1_sel={} rs2_sel={} stall_if={}",
@@ -1,6 +1,9 @@
 from assassyn.frontend import *
 from .control_signals import *
+from .data_hazard import Scoreboard
+from .execution import PipelinedMultiplier, IterativeDivider
 from .instruction_table import rv32i_table
+from .rvc import align_parcel, is_compressed, expand_rvc
 
 
 # 辅助函数：生成填充位
@@ -8,18 +11,686 @@ def get_pad(width, hex_mask, sign):
     return sign.select(Bits(width)(hex_mask), Bits(width)(0))
 
 
+def gen_imms(inst):
+    """并行生成各格式的立即数，返回 (imm_i, imm_s, imm_b, imm_u, imm_j)。"""
+    sign = inst[31:31]
+
+    # I-Type: [31]*20 | [31:20]
+    pad_20 = get_pad(20, 0xFFFFF, sign)
+    imm_i = concat(pad_20, inst[20:31])
+
+    # S-Type: [31]*20 | [31:25] | [11:7]
+    imm_s = concat(pad_20, inst[25:31], inst[7:11])
+
+    # B-Type: [31]*19 | [31] | [7] | [30:25] | [11:8] | 0
+    pad_19 = get_pad(19, 0x7FFFF, sign)
+    imm_b = concat(
+        pad_19, inst[31:31], inst[7:7], inst[25:30], inst[8:11], Bits(1)(0)
+    )
+
+    # U-Type: [31:12] | 0*12
+    imm_u = concat(inst[12:31], Bits(12)(0))
+
+    # J-Type: [31]*11 | [31] | [19:12] | [20] | [30:21] | 0
+    pad_11 = get_pad(11, 0x7FF, sign)
+    imm_j = concat(
+        pad_11, inst[31:31], inst[12:19], inst[20:20], inst[21:30], Bits(1)(0)
+    )
+    return imm_i, imm_s, imm_b, imm_u, imm_j
+
+
+def _onehot_to_index(x, width, bits):
+    """独热码 -> 置位的下标 (二进制)。第 k 位是所有下标第 k 位为 1 的输入位之或；全 0 编码为 0。"""
+    code = []
+    for k in reversed(range(bits)):
+        mask = sum(1 << i for i in range(width) if (i >> k) & 1)
+        code.append((x & Bits(width)(mask)) != Bits(width)(0))
+    return concat(*code)
+
+
+def encode_ex_ctrl(ctrl):
+    """把 ex_ctrl_signals 压缩为 ex_ctrl_enc_signals (送往 encoded=True 的 Execution)。"""
+    mem_ctrl = mem_ctrl_signals.view(ctrl.mem_ctrl)
+    return ex_ctrl_enc_signals.bundle(
+        alu_func=_onehot_to_index(ctrl.alu_func, ALU_WIDTH, 6),
+        rs1_sel=_onehot_to_index(ctrl.rs1_sel, 4, 2),
+        rs2_sel=_onehot_to_index(ctrl.rs2_sel, 5, 3),
+        op1_sel=_onehot_to_index(ctrl.op1_sel, 3, 2),
+        op2_sel=_onehot_to_index(ctrl.op2_sel, 3, 2),
+        branch_type=_onehot_to_index(ctrl.branch_type, 16, 4),
+        next_pc_addr=ctrl.next_pc_addr,
+        ras_op=_onehot_to_index(ctrl.ras_op, 3, 2),
+        is_rvc=ctrl.is_rvc,
+        mem_ctrl=mem_ctrl_enc_signals.bundle(
+            mem_opcode=_onehot_to_index(mem_ctrl.mem_opcode, 3, 2),
+            mem_width=_onehot_to_index(mem_ctrl.mem_width, 3, 2),
+            mem_unsigned=mem_ctrl.mem_unsigned,
+            rd_addr=mem_ctrl.rd_addr,
+        ),
+    )
+
+
+# 控制字 ROM 的字段布局 (低位在前)，顺序与 rv32i_table 中 ImmType 之后的各列一致
+ROM_FIELDS = [
+    ("imm_type", 6),
+    ("alu_func", ALU_WIDTH),
+    ("rs1_used", 1),
+    ("rs2_used", 1),
+    ("op1_sel", 3),
+    ("op2_sel", 3),
+    ("mem_op", 3),
+    ("mem_wid", 3),
+    ("mem_uns", 1),
+    ("wb_en", 1),
+    ("br_type", 16),
+]
+ROM_WIDTH = sum(width for _, width in ROM_FIELDS)
+
+
+def _const_value(x):
+    return x if isinstance(x, int) else x.value
+
+
+def _is_base(entry):
+    """基本编码：不看 rs2，funct7 为 0x00 / 0x20 (只靠 bit30 区分) 或不看 funct7。"""
+    return entry[3] in (None, 0x00, 0x20) and entry[4] is None
+
+
+def _pack(entry):
+    """按 ROM_FIELDS 把表项 ImmType 之后的各列打包成控制字。"""
+    word = 0
+    offset = 0
+    for (_, width), value in zip(ROM_FIELDS, entry[5:]):
+        word |= _const_value(value) << offset
+        offset += width
+    return word
+
+
+# ROM 索引 {opcode[6:2], funct3, bit30}；RV32I 的 opcode[1:0] 恒为 0b11，不参与索引
+ROM_INDEX_BITS = 9
+# 控制字之上的附加位：该项要求 funct7 ∈ {0x00, 0x20}，其余 funct7 视为未匹配
+ROM_F7_CHECK = 1 << ROM_WIDTH
+# 需要完整 funct7 (与 rs2) 才能区分的扩展编码 (M、Zba、Zbb、Zicond)，查表之后再译码
+EXT_ENTRIES = [entry for entry in rv32i_table if not _is_base(entry)]
+
+
+def build_decode_rom():
+    """在 elaboration 时由 rv32i_table 的基本编码生成控制字 ROM 的内容 (Python 整数列表)。"""
+    rom = []
+    for index in range(1 << ROM_INDEX_BITS):
+        op5, f3, bit30 = index >> 4, (index >> 1) & 0x7, index & 0x1
+        word = 0
+        for entry in rv32i_table:
+            if not _is_base(entry):
+                continue
+            t_op, t_f3, t_f7 = _const_value(entry[1]), entry[2], entry[3]
+            if t_op & 0x3 != 0x3 or t_op >> 2 != op5:
+                continue
+            if t_f3 is not None and t_f3 != f3:
+                continue
+            if t_f7 is not None:
+                if t_f7 >> 5 != bit30:
+                    continue
+                word |= ROM_F7_CHECK
+            # 与逐条匹配相同：多项命中时控制信号按位 OR
+            word |= _pack(entry)
+        rom.append(word)
+    return rom
+
+
+def _rom_rows(rom):
+    """把 ROM 内容按 opcode 分组：{opcode[6:2]: {控制字: [子索引]}}，未匹配 (全 0) 的项不出现。"""
+    sub_bits = ROM_INDEX_BITS - 5
+    rows = {}
+    for index, word in enumerate(rom):
+        if word:
+            rows.setdefault(index >> sub_bits, {}).setdefault(word, []).append(
+                index & ((1 << sub_bits) - 1)
+            )
+    return rows
+
+
+def rom_lookup(ports):
+    """
+    以组合常量逻辑实现 ROM：先按 opcode 分派，再在该 opcode 用到的子索引中选出控制字。
+    只为 ROM 中出现的 (opcode, 子索引) 生成比较器，相同的控制字共用一个或门。
+
+    ports 为各读端口的 [(op5, sub)]：表内容只生成一次，各端口共用每一行的控制字常量，
+    只各自生成索引比较。返回每个端口的 (控制字 (含 ROM_F7_CHECK 位), 是否命中)。
+    """
+    sub_bits = ROM_INDEX_BITS - 5
+    width = ROM_WIDTH + 1
+    words = [Bits(width)(0) for _ in ports]
+    matched = [Bits(1)(0) for _ in ports]
+    for op, row in _rom_rows(build_decode_rom()).items():
+        for value, subs in row.items():
+            const = Bits(width)(value)
+            for i, (op5, sub) in enumerate(ports):
+                hit = op5 == Bits(5)(op)
+                if len(subs) < 1 << sub_bits:
+                    sub_hit = Bits(1)(0)
+                    for s in subs:
+                        sub_hit = sub_hit | (sub == Bits(sub_bits)(s))
+                    hit = hit & sub_hit
+                words[i] = words[i] | hit.select(const, Bits(width)(0))
+                matched[i] = matched[i] | hit
+    return list(zip(words, matched))
+
+
+def ext_lookup(ports):
+    """
+    扩展编码的二次译码：只在 EXT_ENTRIES 用到的 opcode 下比较完整的 funct7 (与 rs2)。
+    ports 为各读端口的 [(opcode, funct3, funct7, rs2)]，返回每个端口的 (控制字, 是否命中)；
+    扩展编码的 funct7 都不是 0x00 / 0x20，与 ROM 中的基本编码互斥。
+    """
+    words = [Bits(ROM_WIDTH)(0) for _ in ports]
+    matched = [Bits(1)(0) for _ in ports]
+    for entry in EXT_ENTRIES:
+        t_op, t_f3, t_f7, t_rs2 = _const_value(entry[1]), entry[2], entry[3], entry[4]
+        const = Bits(ROM_WIDTH)(_pack(entry))
+        for i, (opcode, funct3, funct7, rs2) in enumerate(ports):
+            hit = opcode == Bits(7)(t_op)
+            if t_f3 is not None:
+                hit = hit & (funct3 == Bits(3)(t_f3))
+            if t_f7 is not None:
+                hit = hit & (funct7 == Bits(7)(t_f7))
+            if t_rs2 is not None:
+                hit = hit & (rs2 == Bits(5)(t_rs2))
+            words[i] = words[i] | hit.select(const, Bits(ROM_WIDTH)(0))
+            matched[i] = matched[i] | hit
+    return list(zip(words, matched))
+
+
+def decode_rom(*slots):
+    """
+    控制字 ROM 译码：一次查表得到全部控制信号，立即数选择器只构建一次。
+    ROM 内容由 build_decode_rom 在 elaboration 时生成，硬件上是组合常量逻辑 (rom_lookup)；
+    需要完整 funct7 / rs2 的扩展编码由 ext_lookup 在查表之后译码。
+
+    每个 slot 为 (opcode, funct3, funct7, rs2, imms)，多个 slot 共用同一张表 (多读端口)，
+    按顺序返回各 slot 的译码结果。
+    """
+    rom_ports = rom_lookup(
+        [(opcode[2:6], concat(funct3, funct7[5:5])) for opcode, funct3, funct7, _, _ in slots]
+    )
+    ext_ports = ext_lookup([slot[:4] for slot in slots])
+
+    results = []
+    for (opcode, _, funct7, _, imms), (rom_word, rom_hit), (ext_word, ext_hit) in zip(
+        slots, rom_ports, ext_ports
+    ):
+        # 基本编码只接受 funct7 为 0x00 / 0x20
+        f7_base = concat(funct7[6:6], funct7[0:4]) == Bits(6)(0)
+        rom_hit = rom_hit & (~rom_word[ROM_WIDTH:ROM_WIDTH] | f7_base)
+
+        # 未匹配：立即数选 0，其余控制信号全 0
+        is_32bit = opcode[0:1] == Bits(2)(0b11)
+        word = ext_hit.select(ext_word, rom_word[0 : ROM_WIDTH - 1])
+        word = (is_32bit & (rom_hit | ext_hit)).select(
+            word, Bits(ROM_WIDTH)(_const_value(ImmType.R))
+        )
+
+        fields = {}
+        offset = 0
+        for name, width in ROM_FIELDS:
+            fields[name] = word[offset : offset + width - 1]
+            offset += width
+
+        imm = fields["imm_type"].select1hot(Bits(32)(0), *imms)
+        results.append(
+            (
+                fields["alu_func"],
+                fields["op1_sel"],
+                fields["op2_sel"],
+                imm,
+                fields["br_type"],
+                fields["mem_op"],
+                fields["mem_wid"],
+                fields["mem_uns"],
+                fields["wb_en"],
+                fields["rs1_used"],
+                fields["rs2_used"],
+            )
+        )
+    return results
+
+
+class LoopState:
+    IDLE = Bits(3)(0b001)  # 没有可用的循环
+    CAPTURE = Bits(3)(0b010)  # 正在按顺序捕获循环体
+    ACTIVE = Bits(3)(0b100)  # 循环体已完整捕获，可以回放
+
+
+class LoopBuffer:
+    """
+    循环缓冲 (Loop Buffer)：缓存短小内层循环的译码结果，回放时跳过取指与查表译码。
+
+    与 BranchTargetBuffer 一样只持有状态，读写逻辑由调用者生成：
+    *   FetcherImpl 调用 hit(pc)：取指地址落在已捕获的循环内时不读指令存储器，
+        并把 replay 写入寄存器，告诉下一周期的 Decoder 改用缓冲中的译码结果。
+    *   Decoder 调用 capture(...)：遇到向后跳转且预测跳转的条件分支 (循环体不超过
+        entries 条指令) 时开始捕获；此后按顺序到达的每条指令写入缓冲，循环分支再次
+        预测跳转回循环头时捕获完成 (ACTIVE)。中途出现非顺序的 PC (循环体内有跳转、
+        冲刷等) 则放弃。
+
+    缓冲只保存译码结果，不保存寄存器值，因此始终与静态代码一致；循环退出后缓冲
+    保持有效，直到捕获到新的循环。只用于刚性流水线 (不带取指队列)。
+    """
+
+    def __init__(self, entries=16):
+        assert entries >= 2 and entries & (entries - 1) == 0, (
+            "Loop buffer entries must be a power of two (at least 2)"
+        )
+        self.entries = entries
+        self.idx_bits = entries.bit_length() - 1
+
+        self.packets = RegArray(loop_packet_t, entries)
+        self.state = RegArray(Bits(3), 1, initializer=[0b001])
+        self.start = RegArray(Bits(32), 1, initializer=[0])  # 循环头 (分支目标)
+        self.end = RegArray(Bits(32), 1, initializer=[0])  # 循环分支地址
+        self.expect = RegArray(Bits(32), 1, initializer=[0])  # 下一条要捕获的 PC
+        self.prev = RegArray(Bits(32), 1, initializer=[0])  # 上一条捕获的 PC
+
+        # FetcherImpl 写入，下一周期 Decoder 读取
+        self.replay = RegArray(Bits(1), 1, initializer=[0])  # 本周期由缓冲提供译码结果
+        self.fetched = RegArray(Bits(1), 1, initializer=[0])  # 本周期的指令字有效
+
+        self.served_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.served_cnt]
+
+    def hit(self, pc):
+        active = self.state[0] == LoopState.ACTIVE
+        return active & ~(pc < self.start[0]) & ~(self.end[0] < pc)
+
+    def read(self, pc):
+        offset = pc - self.start[0]
+        return loop_packet_t.view(self.packets[offset[2 : 2 + self.idx_bits - 1]])
+
+    def capture(self, pc, next_pc, packet, branch_type, imm):
+        state = self.state[0]
+        capturing = state == LoopState.CAPTURE
+        replay = self.replay[0]
+        valid = self.fetched[0] & ~replay
+
+        with Condition(replay):
+            self.served_cnt[0] = self.served_cnt[0] + UInt(32)(1)
+
+        # 向后跳转且预测跳转的条件分支，循环体 (目标 .. 分支) 不超过 entries 条
+        is_cond = (
+            (branch_type != BranchType.NO_BRANCH)
+            & (branch_type != BranchType.JAL)
+            & (branch_type != BranchType.JALR)
+        )
+        target = pc + imm
+        span = Bits(32)(0) - imm
+        backward = (
+            valid
+            & is_cond
+            & imm[31:31]
+            & ~(Bits(32)((self.entries - 1) * 4) < span)
+            & (next_pc == target)
+        )
+
+        # 捕获：按顺序写入；Stall 重发的同一条指令忽略
+        repeat = pc == self.prev[0]
+        in_order = pc == self.expect[0]
+        write = capturing & valid & in_order
+        finish = write & (pc == self.end[0])
+        lock = finish & (next_pc == self.start[0])
+        abort = (capturing & valid & ~repeat & ~in_order) | (finish & ~lock)
+        start = backward & (~capturing | abort)
+
+        with Condition(write):
+            self.packets[(pc - self.start[0])[2 : 2 + self.idx_bits - 1]] = packet
+        with Condition(start):
+            self.start[0] = target
+            self.end[0] = pc
+            log("LoopBuffer: Capture Start=0x{:x} End=0x{:x}", target, pc)
+        with Condition(write | start):
+            self.expect[0] = start.select(target, pc + Bits(32)(4))
+            self.prev[0] = pc
+        with Condition(lock):
+            log("LoopBuffer: Lock Start=0x{:x} End=0x{:x}", self.start[0], pc)
+
+        next_state = abort.select(LoopState.IDLE, state)
+        next_state = lock.select(LoopState.ACTIVE, next_state)
+        next_state = start.select(LoopState.CAPTURE, next_state)
+        self.state[0] = next_state
+
+
+class FuseKind:
+    LUI_ADDI = Bits(4)(0b0001)  # lui rd, hi; addi rd, rd, lo -> 常数
+    AUIPC_ADDI = Bits(4)(0b0010)  # auipc rd, hi; addi rd, rd, lo -> PC 相对地址
+    AUIPC_JALR = Bits(4)(0b0100)  # auipc rd, hi; jalr rd, lo(rd) -> 远调用
+    SLLI_SRLI = Bits(4)(0b1000)  # slli rd, rs, n; srli rd, rd, n -> 零扩展
+
+
+class MacroFusion:
+    """
+    宏操作融合 (Macro-op Fusion)：译码窗口中相邻的两条指令合并为一个操作送往 EX。
+
+    窗口由带 lookahead 的取指队列提供：队头 (dout) 与其后一条 (dout2)。只融合第二条的
+    源寄存器与目标寄存器都等于第一条的目标寄存器 (rd != x0) 的组合，第一条的结果
+    被第二条完全覆盖，融合后只需写回一次：
+
+    | 组合 | 融合后的操作 |
+    | :--- | :--- |
+    | lui + addi | rd = 0 + (imm_u + imm_i) |
+    | auipc + addi | rd = pc + (imm_u + imm_i) |
+    | auipc + jalr | 以 jalr 的 pc 作为 JAL：目标 pc_jalr + ((imm_u + imm_i - 4) & ~1)，链接 pc_jalr + 4 |
+    | slli + srli (移位量相同) | rd = rs & (0xFFFFFFFF >> n) |
+
+    融合的操作沿用现有的 ALUOp / BranchType，不需要新的编码。Decoder 调用 apply 生成
+    融合后的控制信号并得到 fuse；FetcherImpl 把 fuse 交给取指队列一次出队两条，
+    并调用 count 按组合累计融合次数 (每次融合少占一个流水线槽位)。
+    """
+
+    def __init__(self, fetch_queue):
+        assert fetch_queue.lookahead, "Macro-op fusion requires a lookahead fetch queue"
+        self.queue = fetch_queue
+        self.fuse = Bits(1)(0)
+        self.kind = Bits(4)(0)
+
+        # 各组合的融合次数 (顺序同 FuseKind)
+        self.fused_cnt = [RegArray(UInt(32), 1, initializer=[0]) for _ in range(4)]
+
+    def stats(self):
+        return self.fused_cnt
+
+    def apply(self, inst, pc, next_pc, alu_func, op2_sel, branch_type, imm, ras_op):
+        """返回融合后的 (alu_func, op2_sel, branch_type, imm, ras_op, pc, next_pc)。"""
+        second = self.queue.dout2[0].bitcast(Bits(32))
+
+        op_a, rd_a, f3_a = inst[0:6], inst[7:11], inst[12:14]
+        shamt_a, f7_a = inst[20:24], inst[25:31]
+        op_b, rd_b, f3_b, rs1_b = second[0:6], second[7:11], second[12:14], second[15:19]
+        shamt_b, f7_b = second[20:24], second[25:31]
+
+        imm_u_a = concat(inst[12:31], Bits(12)(0))
+        sign_b = second[31:31]
+        imm_i_b = concat(get_pad(20, 0xFFFFF, sign_b), second[20:31])
+
+        is_addi_b = (op_b == OP_I_TYPE) & (f3_b == Bits(3)(0))
+        is_jalr_b = (op_b == OP_JALR) & (f3_b == Bits(3)(0))
+        is_slli_a = (op_a == OP_I_TYPE) & (f3_a == Bits(3)(1)) & (f7_a == Bits(7)(0))
+        is_srli_b = (op_b == OP_I_TYPE) & (f3_b == Bits(3)(5)) & (f7_b == Bits(7)(0))
+
+        # 第二条读写的都是第一条的 rd；队头不是跳转时，下一条一定是 pc + 4
+        chain = (rd_a != Bits(5)(0)) & (rs1_b == rd_a) & (rd_b == rd_a)
+        window = (
+            self.queue.issued[0]
+            & self.queue.issued2[0]
+            & (next_pc == pc + Bits(32)(4))
+        )
+
+        lui_addi = (op_a == OP_LUI) & is_addi_b
+        auipc_addi = (op_a == OP_AUIPC) & is_addi_b
+        auipc_jalr = (op_a == OP_AUIPC) & is_jalr_b
+        slli_srli = is_slli_a & is_srli_b & (shamt_a == shamt_b)
+        kind = concat(slli_srli, auipc_jalr, auipc_addi, lui_addi)
+        fuse = window & chain & (kind != Bits(4)(0))
+        self.fuse = fuse
+        self.kind = kind
+
+        imm_sum = imm_u_a + imm_i_b
+        zext_mask = Bits(32)(0xFFFFFFFF) >> shamt_a
+        fused_imm = slli_srli.select(
+            zext_mask,
+            # JALR 的目标最低位清零：pc 为偶数，只需清除立即数的最低位
+            auipc_jalr.select((imm_sum - Bits(32)(4)) & Bits(32)(0xFFFFFFFE), imm_sum),
+        )
+        call = fuse & auipc_jalr
+        rd_is_link = (rd_a == Bits(5)(1)) | (rd_a == Bits(5)(5))
+
+        alu_func = (fuse & slli_srli).select(ALUOp.AND, alu_func)
+        op2_sel = call.select(Op2Sel.CONST_4, op2_sel)
+        branch_type = call.select(BranchType.JAL, branch_type)
+        imm = fuse.select(fused_imm, imm)
+        ras_op = call.select(rd_is_link.select(RasOp.PUSH, RasOp.NONE), ras_op)
+        pc = call.select(pc + Bits(32)(4), pc)
+        next_pc = fuse.select(self.queue.next_pc2[0], next_pc)
+
+        with Condition(fuse):
+            log("ID: Fuse PC=0x{:x} Kind=0x{:x}", pc, kind)
+
+        return alu_func, op2_sel, branch_type, imm, ras_op, pc, next_pc
+
+    def count(self, en):
+        for i in range(4):
+            with Condition(en & self.fuse & self.kind[i : i]):
+                self.fused_cnt[i][0] = self.fused_cnt[i][0] + UInt(32)(1)
+
+
+class EarlyAGU:
+    """
+    译码级地址生成 (Early AGU)：基址寄存器在 ID 级已就绪 (没有在途的写入者，rs1 不需要旁路) 时，
+    ID 直接算出 rs1 + imm 并读数据 SRAM，比 EX 早一级。读出的字在 EX 级就能对齐得到 Load
+    结果，紧随其后的相关指令经 EX 旁路取得，没有 Load-Use 停顿。
+
+    数据 SRAM 只有一个端口，与 ICache 驱动后备存储器一样由本类统一调用 sram.build：
+    *   Execution 先调用 request 给出本周期 EX 的访存请求 (Store 与未提前的 Load)，优先占用端口。
+    *   DecoderImpl 随后调用 issue：端口空闲、本周期发出的是 Load 且基址就绪时提前读取，
+        并写入 early，下一周期 EX 据此直接对齐 dout，不再读取，送往 MEM 时按普通结果处理。
+    条件不满足时 Load 照旧在 EX 级读取。
+
+    统计：early_cnt (提前读取的 Load 条数)。
+    """
+
+    def __init__(self, sram):
+        self.sram = sram
+        # ID 写入，下一周期 EX 读取：EX 中的 Load 已在 ID 级读过 SRAM
+        self.early = RegArray(Bits(1), 1, initializer=[0])
+        self.early_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.ex_request = None
+
+    def stats(self):
+        return [self.early_cnt]
+
+    def request(self, we, re, addr, wdata):
+        """EX 级的访存请求，在 issue 中与 ID 级的提前读取合并为一次 SRAM 访问。"""
+        self.ex_request = (we, re, addr, wdata)
+
+    def issue(self, is_load, base_ready, base, imm):
+        """返回本周期是否在 ID 级提前读取。"""
+        assert self.ex_request is not None, "Execution must be built before DecoderImpl"
+        we, re, addr, wdata = self.ex_request
+        early = is_load & base_ready & ~we & ~re
+
+        self.sram.build(
+            we=we,
+            re=re | early,
+            addr=early.select(base + imm, addr),
+            wdata=wdata,
+        )
+        self.early[0] = early
+        with Condition(early):
+            self.early_cnt[0] = self.early_cnt[0] + UInt(32)(1)
+            log("AGU: Early load addr=0x{:x}", base + imm)
+        return early
+
+
+class DualIssue:
+    """
+    双发射 (Dual Issue)：按序超标量后端，每周期至多发出两条指令。
+
+    译码窗口由带 lookahead 的取指队列提供 (与宏操作融合相同)。队头走第 0 路
+    (原有的 EX/MEM/WB，含乘除法器与访存)；其后一条满足以下条件时同周期发往第 1 路
+    (AluLane，只有 ALU)，否则留到下一周期作为队头：
+    *   窗口完整，队头不是跳转/分支 (第二条一定在 pc + 4，且不会被队头冲刷)，
+        也不是除法 (除法器忙时 EX 级表项保持，第 1 路不保持)。
+    *   第二条只用 ALU：不访存、不跳转、不是乘除法。
+    *   两条之间无相关：第二条既不读也不写队头的 rd。
+    *   第二条的源操作数都已就绪 (记分牌中没有未给出的结果)。
+
+    寄存器堆有 4 个读口 (Decoder 为两条各读两个) 与 2 个写口 (WB 与 AluLane)，
+    两个写口都做写穿透。记分牌额外记录最新写入者所在的通道，旁路选择码不变，
+    另用 fwd_lane 在两个通道的 EX/MEM 旁路之间选择。
+
+    与 MacroFusion 一样只持有状态，逻辑由各级调用时生成：
+    *   Decoder 调用 slot 取出第二条，与队头一起查同一张译码表 (两个读端口)，
+        再调用 decode 读其源寄存器，给出静态的配对条件；
+    *   DataHazardUnit 调用 resolve：给出两条的旁路通道与第二条的旁路选择码 / 冒险；
+    *   DecoderImpl 调用 issue：决定是否配对，写入第 1 路的级间寄存器与第 0 路的 fwd_lane；
+    *   FetcherImpl 在配对 (pair) 时让取指队列一次出队两条。
+
+    统计：dual_cnt (双发射的周期数) 与 cycle_cnt (总周期数)，两者之比即双发射周期占比。
+    """
+
+    # 第 1 路不能执行的操作 (需要乘法器 / 除法器)
+    UNIT_OPS = Bits(ALU_WIDTH)(PipelinedMultiplier.OPS.value | IterativeDivider.OPS.value)
+
+    def __init__(self, fetch_queue, scoreboard):
+        assert fetch_queue.lookahead, "Dual issue requires a lookahead fetch queue"
+        self.queue = fetch_queue
+        self.scoreboard = scoreboard
+
+        # ID 写入，下一周期 EX 读取：第 0 路 rs1/rs2 (低位/高位) 的旁路值取自第 1 路
+        self.fwd_lane = RegArray(Bits(2), 1, initializer=[0])
+        # 第 1 路的级间寄存器：ID->EX、EX->MEM、MEM->WB (后两者兼作该通道的 EX / MEM 旁路)
+        self.lane_ex = RegArray(lane_ex_signals, 1)
+        self.lane_mem = RegArray(lane_result_signals, 1)
+        self.lane_wb = RegArray(lane_result_signals, 1)
+
+        self.pair = Bits(1)(0)
+        self.dual_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.cycle_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.dual_cnt, self.cycle_cnt]
+
+    def slot(self):
+        """窗口中的第二条 (地址 pc + 4) 的译码输入 (opcode, funct3, funct7, rs2, 立即数)。"""
+        inst = self.queue.dout2[0].bitcast(Bits(32))
+        self.inst = inst
+        return inst[0:6], inst[12:14], inst[25:31], inst[20:24], gen_imms(inst)
+
+    def decode(self, decoded, reg_file, pc, next_pc, head_rd, head_alu_func, head_br_type):
+        """
+        decoded 为 Decoder 与队头共用同一张译码表得到的第二条的译码结果 (见 slot)；
+        读寄存器堆的第 3、4 个读口。
+        """
+        inst = self.inst
+        rd, rs1, rs2 = inst[7:11], inst[15:19], inst[20:24]
+        (
+            alu_func,
+            op1_sel,
+            op2_sel,
+            imm,
+            br_type,
+            mem_op,
+            _,
+            _,
+            wb_en,
+            rs1_used,
+            rs2_used,
+        ) = decoded
+        rd = wb_en.select(rd, Bits(5)(0))
+
+        window = (
+            self.queue.issued[0]
+            & self.queue.issued2[0]
+            & (next_pc == pc + Bits(32)(4))
+        )
+        head_ok = (head_br_type == BranchType.NO_BRANCH) & (
+            (head_alu_func & IterativeDivider.OPS) == Bits(ALU_WIDTH)(0)
+        )
+        alu_only = (
+            (mem_op == MemOp.NONE)
+            & (br_type == BranchType.NO_BRANCH)
+            & ((alu_func & self.UNIT_OPS) == Bits(ALU_WIDTH)(0))
+        )
+        head_writes = head_rd != Bits(5)(0)
+        dep = head_writes & (
+            (rs1_used & (rs1 == head_rd)) | (rs2_used & (rs2 == head_rd)) | (rd == head_rd)
+        )
+        self.can_pair = window & head_ok & alu_only & ~dep
+
+        self.pc = pc + Bits(32)(4)
+        self.rs1, self.rs2 = rs1, rs2
+        self.rs1_used, self.rs2_used = rs1_used, rs2_used
+        self.rs1_data, self.rs2_data = reg_file[rs1], reg_file[rs2]
+        self.alu_func, self.op1_sel, self.op2_sel = alu_func, op1_sel, op2_sel
+        self.rd, self.imm = rd, imm
+
+    def resolve(self, fwd_lane, fwd_lane2, rs1_sel2, rs2_sel2, hazard2):
+        """DataHazardUnit 给出的旁路通道 (两条) 与第二条的旁路选择码、冒险。"""
+        self.fwd_lane0 = fwd_lane
+        self.fwd_lane2 = fwd_lane2
+        self.rs1_sel2, self.rs2_sel2 = rs1_sel2, rs2_sel2
+        self.hazard2 = hazard2
+
+    def issue(self, nop_if, rs1_data, rs2_data):
+        """决定本周期是否双发射，返回第二条登记到记分牌的 rd (不配对时为 0)。
+
+        rs1_data / rs2_data 为第二条经写穿透后的寄存器值。"""
+        pair = self.can_pair & ~nop_if & ~self.hazard2
+        self.pair = pair
+        rd = pair.select(self.rd, Bits(5)(0))
+
+        self.fwd_lane[0] = self.fwd_lane0
+        self.lane_ex[0] = lane_ex_signals.bundle(
+            alu_func=self.alu_func,
+            op1_sel=self.op1_sel,
+            op2_sel=self.op2_sel,
+            rs1_sel=self.rs1_sel2,
+            rs2_sel=self.rs2_sel2,
+            fwd_lane=self.fwd_lane2,
+            rd_addr=rd,
+            pc=self.pc,
+            rs1_data=rs1_data,
+            rs2_data=rs2_data,
+            imm=self.imm,
+        )
+
+        self.cycle_cnt[0] = self.cycle_cnt[0] + UInt(32)(1)
+        with Condition(pair):
+            self.dual_cnt[0] = self.dual_cnt[0] + UInt(32)(1)
+            log("ID: Dual issue PC=0x{:x} rd={}", self.pc, self.rd)
+        return rd
+
+
 class Decoder(Module):
-    def __init__(self):
-        super().__init__(ports={"pc": Port(Bits(32))})
+    def __init__(self, rvc=False):
+        super().__init__(
+            ports={
+                "pc": Port(Bits(32)),
+                # IF 级预测的下一条指令地址 (BTB 未命中时为 pc + 4)
+                "next_pc": Port(Bits(32)),
+            }
+        )
         self.name = "ID_Shell"
+        # True：支持 RV32C 压缩指令 (译码前展开为 32 位指令)
+        self.rvc = rvc
 
     @module.combinational
-    def build(self, icache_dout: Array, reg_file: Array):
+    def build(
+        self,
+        icache_dout: Array,
+        reg_file: Array,
+        loop_buffer: LoopBuffer = None,
+        fusion: MacroFusion = None,
+        dual: DualIssue = None,
+    ):
 
         # 1. 获取基础输入
-        pc_val = self.pop_all_ports(False)
+        pc_val, next_pc = self.pop_all_ports(False)
         # 从 SRAM 输出获取指令
-        inst = icache_dout[0].bitcast(Bits(32))
+        is_rvc = Bits(1)(0)
+        if not self.rvc:
+            inst = icache_dout[0].bitcast(Bits(32))
+        else:
+            # 刚性流水线直接读 64 位指令窗口，按 pc[1] 对齐；取指队列中已是对齐后的 32 位
+            if icache_dout.scalar_ty.bits == 64:
+                raw = align_parcel(icache_dout[0].bitcast(Bits(64)), pc_val)
+            else:
+                raw = icache_dout[0].bitcast(Bits(32))
+            is_rvc = is_compressed(raw)
+            inst = is_rvc.select(expand_rvc(raw), raw)
+            # IF 按 4 字节顺序预测，压缩指令的顺序下一条改为 pc + 2 (与 FetcherImpl 的修正一致)
+            seq_fix = is_rvc & (next_pc == pc_val + Bits(32)(4))
+            next_pc = seq_fix.select(pc_val + Bits(32)(2), next_pc)
 
         # 2. 物理切片
         opcode = inst[0:6]
@@ -27,108 +698,102 @@ class Decoder(Module):
         funct3 = inst[12:14]
         rs1 = inst[15:19]
         rs2 = inst[20:24]
-        bit30 = inst[30:30]
+        funct7 = inst[25:31]
 
         # 3. 立即数并行生成
-        sign = inst[31:31]
-
-        # I-Type: [31]*20 | [31:20]
-        pad_20 = get_pad(20, 0xFFFFF, sign)
-        imm_i = concat(pad_20, inst[20:31])
+        imms = gen_imms(inst)
 
-        # S-Type: [31]*20 | [31:25] | [11:7]
-        imm_s = concat(pad_20, inst[25:31], inst[7:11])
+        # 4. 译码：查控制字 ROM，双发射时窗口中的第二条与本条共用同一张表
+        slots = [(opcode, funct3, funct7, rs2, imms)]
+        if dual is not None:
+            slots.append(dual.slot())
+        decoded = decode_rom(*slots)
+        (
+            acc_alu_func,
+            acc_op1_sel,
+            acc_op2_sel,
+            acc_imm,
+            acc_br_type,
+            acc_mem_op,
+            acc_mem_wid,
+            acc_mem_uns,
+            acc_wb_en,
+            acc_rs1_used,
+            acc_rs2_used,
+        ) = decoded[0]
 
-        # B-Type: [31]*19 | [31] | [7] | [30:25] | [11:8] | 0
-        pad_19 = get_pad(19, 0x7FFFF, sign)
-        imm_b = concat(
-            pad_19, inst[31:31], inst[7:7], inst[25:30], inst[8:11], Bits(1)(0)
-        )
-
-        # U-Type: [31:12] | 0*12
-        imm_u = concat(inst[12:31], Bits(12)(0))
-
-        # J-Type: [31]*11 | [31] | [19:12] | [20] | [30:21] | 0
-        pad_11 = get_pad(11, 0x7FF, sign)
-        imm_j = concat(
-            pad_11, inst[31:31], inst[12:19], inst[20:20], inst[21:30], Bits(1)(0)
-        )
-
-        # 4. 查表译码 (Signal Accumulation Loop)
-
-        # 初始化累加器
-        acc_alu_func = Bits(16)(0)
-        acc_op1_sel = Bits(3)(0)
-        acc_op2_sel = Bits(3)(0)
-        acc_imm = Bits(32)(0)
-        acc_br_type = Bits(16)(0)
+        # 返回地址栈操作：x1/x5 作为链接寄存器
+        rd_is_link = (rd == Bits(5)(1)) | (rd == Bits(5)(5))
+        rs1_is_link = (rs1 == Bits(5)(1)) | (rs1 == Bits(5)(5))
+        is_jal = opcode == OP_JAL
+        is_jalr = opcode == OP_JALR
+        ras_push = (is_jal | is_jalr) & rd_is_link
+        ras_pop = is_jalr & (rd == Bits(5)(0)) & rs1_is_link
+        ras_op = ras_push.select(RasOp.PUSH, ras_pop.select(RasOp.POP, RasOp.NONE))
 
-        acc_mem_op = Bits(3)(0)
-        acc_mem_wid = Bits(3)(0)
-        acc_mem_uns = Bits(1)(0)
-        acc_wb_en = Bits(1)(0)
-
-        acc_rs1_used = Bits(1)(0)
-        acc_rs2_used = Bits(1)(0)
-
-        match_if = Bits(1)(0)
+        # 处理 rd: 如果不需要写回，强制为 0 (Implicit Write Enable)
+        final_rd = acc_wb_en.select(rd, Bits(5)(0))
 
-        for entry in rv32i_table:
+        # 5. 宏操作融合 (可选)：与窗口中的下一条指令合并为一个操作
+        if fusion is not None:
             (
-                _,
-                t_op,
-                t_f3,
-                t_b30,
-                t_imm_type,
-                t_alu,
-                t_rs1_use,
-                t_rs2_use,
-                t_op1,
-                t_op2,
-                t_mem_op,
-                t_mem_wid,
-                t_mem_sgn,
-                t_wb,
-                t_br,
-            ) = entry
-
-            # --- A. 匹配逻辑 ---
-            match_if = opcode == t_op
+                acc_alu_func,
+                acc_op2_sel,
+                acc_br_type,
+                acc_imm,
+                ras_op,
+                pc_val,
+                next_pc,
+            ) = fusion.apply(
+                inst, pc_val, next_pc, acc_alu_func, acc_op2_sel, acc_br_type, acc_imm, ras_op
+            )
 
-            if t_f3 is not None:
-                match_if &= funct3 == Bits(3)(t_f3)
-                
-            if t_b30 is not None:
-                match_if &= bit30 == Bits(1)(t_b30)
-
-            # --- B. 信号累加 (Mux Logic) ---
-            # 使用 select 实现 OR 逻辑
-            acc_alu_func |= match_if.select(t_alu, Bits(16)(0))
-            acc_rs1_used |= match_if.select(Bits(1)(t_rs1_use), Bits(1)(0))
-            acc_rs2_used |= match_if.select(Bits(1)(t_rs2_use), Bits(1)(0))
-            acc_op1_sel |= match_if.select(t_op1, Bits(3)(0))
-            acc_op2_sel |= match_if.select(t_op2, Bits(3)(0))
-            acc_mem_op |= match_if.select(t_mem_op, Bits(3)(0))
-            acc_mem_wid |= match_if.select(t_mem_wid, Bits(3)(0))
-            acc_mem_uns |= match_if.select(t_mem_sgn, Bits(1)(0))
-            acc_wb_en |= match_if.select(Bits(1)(t_wb), Bits(1)(0))
-            acc_br_type |= match_if.select(t_br, Bits(16)(0))
-            imm = t_imm_type.select1hot(
-                Bits(32)(0),
-                imm_i,
-                imm_s,
-                imm_b,
-                imm_u,
-                imm_j,
+        # 6. 循环缓冲 (可选)：捕获本条译码结果；回放时改用缓冲中的译码结果
+        if loop_buffer is not None:
+            packet = loop_packet_t.bundle(
+                alu_func=acc_alu_func,
+                op1_sel=acc_op1_sel,
+                op2_sel=acc_op2_sel,
+                branch_type=acc_br_type,
+                ras_op=ras_op,
+                mem_opcode=acc_mem_op,
+                mem_width=acc_mem_wid,
+                mem_unsigned=acc_mem_uns,
+                rd_addr=final_rd,
+                imm=acc_imm,
+                rs1=rs1,
+                rs2=rs2,
+                rs1_used=acc_rs1_used,
+                rs2_used=acc_rs2_used,
             )
-            acc_imm |= match_if.select(imm, Bits(32)(0))
+            loop_buffer.capture(pc_val, next_pc, packet, acc_br_type, acc_imm)
+
+            replay = loop_buffer.replay[0]
+            saved = loop_buffer.read(pc_val)
+            acc_alu_func = replay.select(saved.alu_func, acc_alu_func)
+            acc_op1_sel = replay.select(saved.op1_sel, acc_op1_sel)
+            acc_op2_sel = replay.select(saved.op2_sel, acc_op2_sel)
+            acc_br_type = replay.select(saved.branch_type, acc_br_type)
+            ras_op = replay.select(saved.ras_op, ras_op)
+            acc_mem_op = replay.select(saved.mem_opcode, acc_mem_op)
+            acc_mem_wid = replay.select(saved.mem_width, acc_mem_wid)
+            acc_mem_uns = replay.select(saved.mem_unsigned, acc_mem_uns)
+            final_rd = replay.select(saved.rd_addr, final_rd)
+            acc_imm = replay.select(saved.imm, acc_imm)
+            rs1 = replay.select(saved.rs1, rs1)
+            rs2 = replay.select(saved.rs2, rs2)
+            acc_rs1_used = replay.select(saved.rs1_used, acc_rs1_used)
+            acc_rs2_used = replay.select(saved.rs2_used, acc_rs2_used)
 
-        # 5. 读取寄存器堆 & 打包
+        # 7. 读取寄存器堆 & 打包
         raw_rs1_data = reg_file[rs1]
         raw_rs2_data = reg_file[rs2]
 
-        # 处理 rd: 如果不需要写回，强制为 0 (Implicit Write Enable)
-        final_rd = acc_wb_en.select(rd, Bits(5)(0))
+        # 8. 双发射 (可选)：同时译码窗口中的下一条，并读其两个源寄存器
+        if dual is not None:
+            dual.decode(
+                decoded[1], reg_file, pc_val, next_pc, final_rd, acc_alu_func, acc_br_type
+            )
 
         # 构造预解码包
         mem_ctrl_t = mem_ctrl_signals.bundle(
@@ -143,14 +808,16 @@ class Decoder(Module):
             op1_sel=acc_op1_sel,
             op2_sel=acc_op2_sel,
             branch_type=acc_br_type,
-            next_pc_addr=pc_val + Bits(32)(4),  # 默认下一条指令地址
+            next_pc_addr=next_pc,  # IF 预测的下一条指令地址
+            ras_op=ras_op,
+            is_rvc=is_rvc,
             mem_ctrl=mem_ctrl_t,
             imm=acc_imm,
             pc=pc_val,
             rs1_data=raw_rs1_data,
             rs2_data=raw_rs2_data,
         )
-        
+
         log("rs1_data:0x{:x} rs2_data:0x{:x}", raw_rs1_data, raw_rs2_data)
 
         # 返回: 预解码包, 冒险检测需要的原始信号
@@ -171,14 +838,131 @@ class DecoderImpl(Downstream):
         executor: Module,
         # --- 3. DataHazardUnit 反馈信号 ---
         rs1_sel: Bits(4),
-        rs2_sel: Bits(4),
+        rs2_sel: Bits(5),
         stall_if: Bits(1),
         branch_target_reg: Array,
+        # --- 4. ID 级重定向通道 (可选) ---
+        id_redirect_reg: Array = None,
+        # --- 5. 寄存器堆写穿透 (可选)：源寄存器索引与 WB 级本周期的写口 ---
+        rs1_idx: Bits(5) = None,
+        rs2_idx: Bits(5) = None,
+        wb_rd: Bits(5) = None,
+        wb_data: Bits(32) = None,
+        # --- 6. 记分牌 (可选)：登记本周期发出的指令；除法器忙时 EX 级表项保持 ---
+        scoreboard: Scoreboard = None,
+        ex_div_busy: Bits(1) = None,
+        # --- 7. 译码级地址生成 (可选)：基址就绪的 Load 在 ID 级提前读数据 SRAM ---
+        agu: EarlyAGU = None,
+        # --- 8. 双发射 (可选)：第二条发往 AluLane，其写口同样做写穿透 ---
+        dual: DualIssue = None,
+        wb_rd2: Bits(5) = None,
+        wb_data2: Bits(32) = None,
+        # --- 9. ID 级分支比较器的旁路 (可选，需要记分牌)：MEM 级写入者的结果所在的
+        #        旁路寄存器 (EX 旁路；拆分 EX 时为 EX2 旁路) ---
+        mem_stage_bypass: Array = None,
     ):
         mem_ctrl = mem_ctrl_signals.view(pre.mem_ctrl)
 
+        # 寄存器堆写穿透：WB 的写入下一周期才生效，读口在此与本周期的写口比较，
+        # 索引相同则直接取写回数据，因此不再需要 WB 旁路
+        wb_ports = [
+            (port_rd, port_data)
+            for port_rd, port_data in ((wb_rd, wb_data), (wb_rd2, wb_data2))
+            if port_rd is not None
+        ]
+
+        def write_through(idx, data):
+            for port_rd, port_data in wb_ports:
+                hit = (port_rd != Bits(5)(0)) & (idx == port_rd)
+                data = hit.select(port_data, data)
+            return data
+
+        rs1_data = write_through(rs1_idx, pre.rs1_data)
+        rs2_data = write_through(rs2_idx, pre.rs2_data)
+
         flush_if = branch_target_reg[0] != Bits(32)(0)
         nop_if = flush_if | stall_if
+        next_pc_addr = pre.next_pc_addr
+
+        if id_redirect_reg is not None:
+            # 上一周期 ID 级已重定向：本周期的指令是跳转后面那条错误路径指令
+            id_flush = id_redirect_signals.view(id_redirect_reg[0]).valid
+            nop_if = nop_if | id_flush
+
+            # ID 级可用的操作数：寄存器堆 (含写穿透) 的值；
+            # EX/MEM 级旁路的值要到 EX 才能得到，此时交给 EX 解析
+            rs1_val, rs2_val = rs1_data, rs2_data
+            rs1_ready = rs1_sel == Rs1Sel.RS1
+            rs2_ready = rs2_sel == Rs2Sel.RS2
+
+            # MEM/WB 旁路：写入者此刻在 MEM 级，它在上一级末给出的结果已在旁路寄存器中
+            # (Load 与乘法除外，记分牌的 late)；双发射时按写入者所在的通道取值
+            if mem_stage_bypass is not None:
+                assert scoreboard is not None, "ID-stage MEM/WB bypass requires the scoreboard"
+
+                def mem_stage_value(idx):
+                    value = mem_stage_bypass[0]
+                    if dual is not None:
+                        lane_value = lane_result_signals.view(dual.lane_mem[0]).data
+                        value = scoreboard.lane[idx].select(lane_value, value)
+                    return value, ~scoreboard.late[idx]
+
+                rs1_held, rs1_held_ok = mem_stage_value(rs1_idx)
+                rs2_held, rs2_held_ok = mem_stage_value(rs2_idx)
+                rs1_from_mem = (rs1_sel == Rs1Sel.MEM_WB_BYPASS) & rs1_held_ok
+                rs2_from_mem = (rs2_sel == Rs2Sel.MEM_WB_BYPASS) & rs2_held_ok
+                rs1_val = rs1_from_mem.select(rs1_held, rs1_val)
+                rs2_val = rs2_from_mem.select(rs2_held, rs2_val)
+                rs1_ready = rs1_ready | rs1_from_mem
+                rs2_ready = rs2_ready | rs2_from_mem
+
+            # 独立比较器 (不占用 ALU)
+            is_eq = rs1_val == rs2_val
+            is_lt = rs1_val.bitcast(Int(32)) < rs2_val.bitcast(Int(32))
+            is_ltu = rs1_val < rs2_val
+
+            br = pre.branch_type
+            is_jal = br == BranchType.JAL
+            is_jalr = br == BranchType.JALR
+            is_cond = (br != BranchType.NO_BRANCH) & ~is_jal & ~is_jalr
+            cond_taken = (
+                ((br == BranchType.BEQ) & is_eq)
+                | ((br == BranchType.BNE) & ~is_eq)
+                | ((br == BranchType.BLT) & is_lt)
+                | ((br == BranchType.BGE) & ~is_lt)
+                | ((br == BranchType.BLTU) & is_ltu)
+                | ((br == BranchType.BGEU) & ~is_ltu)
+            )
+
+            # JAL/分支目标只依赖 PC 与立即数；JALR 目标最低位清零
+            pc_target = pre.pc + pre.imm
+            jalr_target = (rs1_val + pre.imm) & Bits(32)(0xFFFFFFFE)
+            seq_pc = pre.pc + pre.is_rvc.select(Bits(32)(2), Bits(32)(4))
+            id_target = is_jalr.select(
+                jalr_target,
+                (is_jal | cond_taken).select(pc_target, seq_pc),
+            )
+
+            id_resolved = ~nop_if & (
+                is_jal
+                | (is_jalr & rs1_ready)
+                | (is_cond & rs1_ready & rs2_ready)
+            )
+            id_redirect = id_resolved & (id_target != pre.next_pc_addr)
+            # 已解析的跳转/分支把正确的下一条地址交给 EX 校验，EX 不会再次冲刷
+            next_pc_addr = id_resolved.select(id_target, pre.next_pc_addr)
+
+            id_redirect_reg[0] = id_redirect_signals.bundle(
+                valid=id_redirect,
+                target=id_target,
+                is_cond=is_cond,
+                taken=cond_taken,
+                link=seq_pc,
+                ras_op=pre.ras_op,
+            )
+
+            with Condition(id_redirect):
+                log("ID: Redirect PC=0x{:x} Target=0x{:x}", pre.pc, id_target)
 
         log(
             "Input of ID_Impl: alu_func=0x{:x} op1_sel=0x{:x} op2_sel=0x{:x} branch_type=0x{:x} next_pc_addr=0x{:x} rs1_data=0x{:x} rs2_data=0x{:x} stall_if=0x{:x} branch_target=0x{:x}",
@@ -187,12 +971,12 @@ class DecoderImpl(Downstream):
             pre.op2_sel,
             pre.branch_type,
             pre.next_pc_addr,
-            pre.rs1_data,
-            pre.rs2_data,
+            rs1_data,
+            rs2_data,
             stall_if,
             branch_target_reg[0],
         )
-        
+
         final_rd = nop_if.select(Bits(5)(0), mem_ctrl.rd_addr)
         final_mem_opcode = nop_if.select(MemOp.NONE, mem_ctrl.mem_opcode)
         final_branch_type = nop_if.select(BranchType.NO_BRANCH, pre.branch_type)
@@ -202,6 +986,33 @@ class DecoderImpl(Downstream):
             mem_unsigned=mem_ctrl.mem_unsigned,
             rd_addr=final_rd,
         )
+
+        # 提前读取的 Load 在 EX 末即给出结果，记分牌按 ALU (延迟 1) 登记
+        sb_mem_opcode = mem_ctrl.mem_opcode
+        if agu is not None:
+            early = agu.issue(
+                is_load=~nop_if & (mem_ctrl.mem_opcode == MemOp.LOAD),
+                base_ready=rs1_sel == Rs1Sel.RS1,
+                base=rs1_data,
+                imm=pre.imm,
+            )
+            sb_mem_opcode = early.select(MemOp.NONE, sb_mem_opcode)
+
+        # 双发射：配对的第二条写入第 1 路的级间寄存器
+        rd2 = None
+        if dual is not None:
+            rd2 = dual.issue(
+                nop_if,
+                write_through(dual.rs1, dual.rs1_data),
+                write_through(dual.rs2, dual.rs2_data),
+            )
+
+        if scoreboard is not None:
+            # 气泡的 rd 为 0，不登记；被冲刷的 EX 级指令作废
+            scoreboard.update(
+                final_rd, pre.alu_func, sb_mem_opcode, flush_if, ex_div_busy, rd2
+            )
+
         final_ex_ctrl = ex_ctrl_signals.bundle(
             alu_func=pre.alu_func,
             op1_sel=pre.op1_sel,
@@ -209,17 +1020,22 @@ class DecoderImpl(Downstream):
             rs1_sel=rs1_sel,
             rs2_sel=rs2_sel,
             branch_type=final_branch_type,
-            next_pc_addr=pre.next_pc_addr,
+            next_pc_addr=next_pc_addr,
+            ras_op=pre.ras_op,
+            is_rvc=pre.is_rvc,
             mem_ctrl=final_mem_ctrl,
         )
+        # 编码的控制字段 (可选)：EX 的 ctrl 端口为二进制格式时在此压缩，FIFO 只传下标
+        if getattr(executor, "encoded", False):
+            final_ex_ctrl = encode_ex_ctrl(final_ex_ctrl)
 
         # 无论是否 Stall，都向 EX 发送数据 (刚性流水线)
         # 如果是 NOP，数据线上的值(pc, imm等)是无意义的，EX 不会使用
         call = executor.async_called(
             ctrl=final_ex_ctrl,
             pc=pre.pc,
-            rs1_data=pre.rs1_data,  # 发送修补后的数据
-            rs2_data=pre.rs2_data,  # 发送修补后的数据
+            rs1_data=rs1_data,  # 发送修补后的数据
+            rs2_data=rs2_data,  # 发送修补后的数据
             imm=pre.imm,
         )
         call.bind.set_fifo_depth(ctrl=1, pc=1, rs1_data=1, rs2_data=1, imm=1)
@@ -1,15 +1,484 @@
 from assassyn.frontend import *
 from .control_signals import *
+from .memory import align_load
 
 
-class Execution(Module):
+def _mul16(x, y):
+    """16 x 16 位无符号乘法，返回 32 位积。"""
+    prod = concat(Bits(16)(0), x).bitcast(UInt(32)) * concat(Bits(16)(0), y).bitcast(
+        UInt(32)
+    )
+    return prod[0:31]
+
+
+class PipelinedMultiplier:
+    """
+    两级流水乘法器 (M 扩展)，与 ALU 并列挂在 EX 级。
+
+    与 SRAM 类似只持有状态 (级间寄存器 stage)，逻辑由 Execution / MemoryAccess 调用时生成：
+    *   第 1 级 (EX)：issue 把操作数拆成 16 位的两半，算出四个部分积 (中间两项先相加)
+        与有符号修正项，写入 stage。
+    *   第 2 级 (MEM)：result 读取 stage，完成 64 位累加并按指令取高 / 低 32 位。
+
+    有符号结果由无符号积的高 32 位减去修正项得到：
+        MULH  : hi(a * b) - (a < 0 ? b : 0) - (b < 0 ? a : 0)
+        MULHSU: hi(a * b) - (a < 0 ? b : 0)
+    低 32 位与符号无关。结果在 MEM 级才可用，DataHazardUnit 把乘法与 Load 同样处理。
+    """
+
+    OPS = Bits(ALU_WIDTH)(
+        ALUOp.MUL.value | ALUOp.MULH.value | ALUOp.MULHSU.value | ALUOp.MULHU.value
+    )
+
+    def __init__(self):
+        self.stage = RegArray(mul_stage_signals, 1)
+
+    def issue(self, alu_func, a, b, valid):
+        """第 1 级：返回本周期 EX 中是否为有效的乘法指令。"""
+        is_mul = valid & ((alu_func & self.OPS) != Bits(ALU_WIDTH)(0))
+        a_lo, a_hi = a[0:15], a[16:31]
+        b_lo, b_hi = b[0:15], b[16:31]
+
+        pp_mid = concat(Bits(1)(0), _mul16(a_lo, b_hi)) + concat(
+            Bits(1)(0), _mul16(a_hi, b_lo)
+        )
+
+        is_mulh = alu_func == ALUOp.MULH
+        a_signed = is_mulh | (alu_func == ALUOp.MULHSU)
+        corr = (a_signed & a[31:31]).select(b, Bits(32)(0)) + (
+            is_mulh & b[31:31]
+        ).select(a, Bits(32)(0))
+
+        self.stage[0] = mul_stage_signals.bundle(
+            valid=is_mul,
+            high=alu_func != ALUOp.MUL,
+            pp_lo=_mul16(a_lo, b_lo),
+            pp_hi=_mul16(a_hi, b_hi),
+            pp_mid=pp_mid,
+            corr=corr,
+        )
+        return is_mul
+
+    def result(self):
+        """第 2 级：返回 (valid, 结果)。"""
+        s = mul_stage_signals.view(self.stage[0])
+        prod = concat(s.pp_hi, s.pp_lo) + concat(Bits(15)(0), s.pp_mid, Bits(16)(0))
+        high = prod[32:63] - s.corr
+        return s.valid, s.high.select(high, prod[0:31])
+
+
+def _clz(x):
+    """32 位前导零个数 (x 为 0 时为 32)。"""
+    n = Bits(6)(32)
+    for i in range(32):
+        n = x[i:i].select(Bits(6)(31 - i), n)
+    return n
+
+
+def _ctz(x):
+    """32 位末尾零个数 (x 为 0 时为 32)。"""
+    n = Bits(6)(32)
+    for i in reversed(range(32)):
+        n = x[i:i].select(Bits(6)(i), n)
+    return n
+
+
+def _cpop(x):
+    """32 位中 1 的个数。"""
+    n = Bits(6)(0)
+    for i in range(32):
+        n = n + concat(Bits(5)(0), x[i:i])
+    return n
+
+
+def decode_ex_ctrl(enc):
+    """把 ex_ctrl_enc_signals 译回 ex_ctrl_signals：各下标字段经移位还原为独热码。"""
+
+    def onehot(code, width):
+        return Bits(width)(1) << code
+
+    mem_ctrl = mem_ctrl_enc_signals.view(enc.mem_ctrl)
+    return ex_ctrl_signals.bundle(
+        alu_func=onehot(enc.alu_func, ALU_WIDTH),
+        rs1_sel=onehot(enc.rs1_sel, 4),
+        rs2_sel=onehot(enc.rs2_sel, 5),
+        op1_sel=onehot(enc.op1_sel, 3),
+        op2_sel=onehot(enc.op2_sel, 3),
+        branch_type=onehot(enc.branch_type, 16),
+        next_pc_addr=enc.next_pc_addr,
+        ras_op=onehot(enc.ras_op, 3),
+        is_rvc=enc.is_rvc,
+        mem_ctrl=mem_ctrl_signals.bundle(
+            mem_opcode=onehot(mem_ctrl.mem_opcode, 3),
+            mem_width=onehot(mem_ctrl.mem_width, 3),
+            mem_unsigned=mem_ctrl.mem_unsigned,
+            rd_addr=mem_ctrl.rd_addr,
+        ),
+    )
+
+
+def alu(alu_func, alu_op1, alu_op2):
+    """ALU：按独热的 alu_func 从各运算结果中选出一个 (乘除法直通操作数 2)。"""
+    # 1. 基础运算
+    # 转换为有符号数进行加减法运算
+    op1_signed = alu_op1.bitcast(Int(32))
+    op2_signed = alu_op2.bitcast(Int(32))
+
+    # 加法
+    add_res = (op1_signed + op2_signed).bitcast(Bits(32))
+
+    # 减法
+    sub_res = (op1_signed - op2_signed).bitcast(Bits(32))
+
+    # 逻辑与
+    and_res = alu_op1 & alu_op2
+
+    # 逻辑或
+    or_res = alu_op1 | alu_op2
+
+    # 逻辑异或
+    xor_res = alu_op1 ^ alu_op2
+
+    # 逻辑左移 (使用低5位作为移位位数)
+    sll_res = alu_op1 << alu_op2[0:4]
+
+    # 逻辑右移 (使用低5位作为移位位数)
+    srl_res = alu_op1 >> alu_op2[0:4]
+
+    # 算术右移 (使用低5位作为移位位数)
+    sra_res = op1_signed >> alu_op2[0:4]
+    sra_res = sra_res.bitcast(Bits(32))
+
+    # 有符号比较小于
+    slt_res = (op1_signed < op2_signed).bitcast(Bits(32))
+
+    # 无符号比较小于
+    sltu_res = (alu_op1 < alu_op2).bitcast(Bits(32))
+
+    # --- Zba：地址计算 ---
+    sh1add_res = (alu_op1 << Bits(5)(1)) + alu_op2
+    sh2add_res = (alu_op1 << Bits(5)(2)) + alu_op2
+    sh3add_res = (alu_op1 << Bits(5)(3)) + alu_op2
+
+    # --- Zbb：取反逻辑运算 ---
+    andn_res = alu_op1 & ~alu_op2
+    orn_res = alu_op1 | ~alu_op2
+    xnor_res = ~(alu_op1 ^ alu_op2)
+
+    # --- Zbb：位计数 ---
+    clz_res = concat(Bits(26)(0), _clz(alu_op1))
+    ctz_res = concat(Bits(26)(0), _ctz(alu_op1))
+    cpop_res = concat(Bits(26)(0), _cpop(alu_op1))
+
+    # --- Zbb：最值 ---
+    is_lt = op1_signed < op2_signed
+    is_ltu = alu_op1 < alu_op2
+    min_res = is_lt.select(alu_op1, alu_op2)
+    max_res = is_lt.select(alu_op2, alu_op1)
+    minu_res = is_ltu.select(alu_op1, alu_op2)
+    maxu_res = is_ltu.select(alu_op2, alu_op1)
+
+    # --- Zbb：符号 / 零扩展 ---
+    sextb_res = concat(
+        alu_op1[7:7].select(Bits(24)(0xFFFFFF), Bits(24)(0)), alu_op1[0:7]
+    )
+    sexth_res = concat(
+        alu_op1[15:15].select(Bits(16)(0xFFFF), Bits(16)(0)), alu_op1[0:15]
+    )
+    zexth_res = concat(Bits(16)(0), alu_op1[0:15])
+
+    # --- Zbb：循环移位 (使用低5位作为移位位数；反向移位量为 -shamt mod 32) ---
+    rot_amt = alu_op2[0:4]
+    rot_inv = Bits(5)(0) - rot_amt
+    rol_res = (alu_op1 << rot_amt) | (alu_op1 >> rot_inv)
+    ror_res = (alu_op1 >> rot_amt) | (alu_op1 << rot_inv)
+
+    # --- Zbb：字节操作 ---
+    orcb_res = concat(
+        *[
+            (alu_op1[i * 8 : i * 8 + 7] != Bits(8)(0)).select(
+                Bits(8)(0xFF), Bits(8)(0)
+            )
+            for i in (3, 2, 1, 0)
+        ]
+    )
+    rev8_res = concat(alu_op1[0:7], alu_op1[8:15], alu_op1[16:23], alu_op1[24:31])
+
+    # --- Zicond：条件清零 ---
+    is_cond_zero = alu_op2 == Bits(32)(0)
+    czero_eqz_res = is_cond_zero.select(Bits(32)(0), alu_op1)
+    czero_nez_res = is_cond_zero.select(alu_op1, Bits(32)(0))
+
+    # 2. 结果选择
+    return alu_func.select1hot(
+        add_res,  # ADD
+        sub_res,  # SUB
+        sll_res,  # SLL
+        slt_res,  # SLT
+        sltu_res,  # SLTU
+        xor_res,  # XOR
+        srl_res,  # SRL
+        sra_res,  # SRA
+        or_res,  # OR
+        and_res,  # AND
+        alu_op2,  # MUL (乘积由乘法器在 MEM 级给出)
+        alu_op2,  # MULH
+        alu_op2,  # MULHSU
+        alu_op2,  # MULHU
+        alu_op2,  # NOP (直接输出操作数2)
+        alu_op2,  # DIV (商 / 余数由除法器给出)
+        alu_op2,  # DIVU
+        alu_op2,  # REM
+        alu_op2,  # REMU
+        sh1add_res,  # SH1ADD
+        sh2add_res,  # SH2ADD
+        sh3add_res,  # SH3ADD
+        andn_res,  # ANDN
+        orn_res,  # ORN
+        xnor_res,  # XNOR
+        clz_res,  # CLZ
+        ctz_res,  # CTZ
+        cpop_res,  # CPOP
+        min_res,  # MIN
+        minu_res,  # MINU
+        max_res,  # MAX
+        maxu_res,  # MAXU
+        sextb_res,  # SEXTB
+        sexth_res,  # SEXTH
+        zexth_res,  # ZEXTH
+        rol_res,  # ROL
+        ror_res,  # ROR
+        orcb_res,  # ORCB
+        rev8_res,  # REV8
+        czero_eqz_res,  # CZEROEQZ
+        czero_nez_res,  # CZERONEZ
+    )
+
+
+class IterativeDivider:
+    """
+    多周期除法器 (M 扩展 DIV/DIVU/REM/REMU)，基 2 恢复余数法，挂在 EX 级。
+
+    与 PipelinedMultiplier 一样只持有状态 (state)，逻辑由 Execution 每周期调用 step 生成：
+    *   发起：EX 收到除法指令时对操作数取绝对值，按前导零个数把除数左移到与被除数
+        最高位对齐，迭代次数即商的有效位数 clz(|b|) - clz(|a|) + 1 (提前结束：小商
+        只需几个周期；|a| < |b| 或除数为 0 时不迭代)。除法指令本身不送往 MEM。
+    *   迭代：之后每周期产生 1 位商，最后一次迭代的周期给出结果，EX 用它顶替本周期
+        (必为气泡) 的结果送往 MEM，并写入 EX 旁路寄存器。
+    *   握手：从发起到给出结果的前一周期，stall 为 1，经 DataHazardUnit 让 ID 保持
+        当前指令、IF 保持 PC。
+
+    除零：商为全 1，余数为被除数；溢出 (-2^31 / -1)：由无符号迭代自然得到
+    商 -2^31、余数 0，与 RISC-V 规定一致。
+    """
+
+    OPS = Bits(ALU_WIDTH)(
+        ALUOp.DIV.value | ALUOp.DIVU.value | ALUOp.REM.value | ALUOp.REMU.value
+    )
+
     def __init__(self):
+        self.state = RegArray(div_state_signals, 1)
+        # 因等待除法器而停顿的周期数
+        self.stall_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.stall_cnt]
+
+    def step(self, alu_func, a, b, rd, valid, kill=None):
+        """返回 (本周期发起, 本周期给出结果, 结果, 结果的目标寄存器, 停顿 ID/IF)。
+
+        kill 为 1 时放弃正在进行的除法：拆分 EX 时，除法在 EX1 发起的同一周期，
+        EX2 中更早的分支可能判定跳转，下一周期冲刷时除法器里的是错误路径上的指令。"""
+        s = div_state_signals.view(self.state[0])
+        busy = s.busy if kill is None else s.busy & ~kill
+
+        # --- 迭代：每周期产生 1 位商 ---
+        iterate = busy & (s.count != Bits(6)(0))
+        ge = ~(s.rem < s.divisor)
+        rem_n = iterate.select(ge.select(s.rem - s.divisor, s.rem), s.rem)
+        quo_n = iterate.select(concat(s.quo[0:30], ge), s.quo)
+        count_n = iterate.select(s.count - Bits(6)(1), s.count)
+        done = busy & (count_n == Bits(6)(0))
+
+        quo = s.neg_q.select(Bits(32)(0) - quo_n, quo_n)
+        rem = s.neg_r.select(Bits(32)(0) - rem_n, rem_n)
+        result = s.want_rem.select(rem, quo)
+
+        # --- 发起 ---
+        start = valid & ((alu_func & self.OPS) != Bits(ALU_WIDTH)(0))
+        is_signed = (alu_func == ALUOp.DIV) | (alu_func == ALUOp.REM)
+        want_rem = (alu_func == ALUOp.REM) | (alu_func == ALUOp.REMU)
+        a_neg = is_signed & a[31:31]
+        b_neg = is_signed & b[31:31]
+        a_abs = a_neg.select(Bits(32)(0) - a, a)
+        b_abs = b_neg.select(Bits(32)(0) - b, b)
+        b_zero = b == Bits(32)(0)
+
+        clz_a = _clz(a_abs)
+        clz_b = _clz(b_abs)
+        has_quo = ~b_zero & ~(clz_b < clz_a)
+        shift = clz_b - clz_a
+
+        start_state = div_state_signals.bundle(
+            busy=Bits(1)(1),
+            count=has_quo.select(shift + Bits(6)(1), Bits(6)(0)),
+            rem=a_abs,
+            divisor=b_abs << shift[0:4],
+            quo=b_zero.select(Bits(32)(0xFFFFFFFF), Bits(32)(0)),
+            neg_q=(a_neg ^ b_neg) & ~b_zero,
+            neg_r=a_neg,
+            want_rem=want_rem,
+            rd=rd,
+        )
+        step_state = div_state_signals.bundle(
+            busy=busy & ~done,
+            count=count_n,
+            rem=rem_n,
+            divisor=iterate.select(concat(Bits(1)(0), s.divisor[1:31]), s.divisor),
+            quo=quo_n,
+            neg_q=s.neg_q,
+            neg_r=s.neg_r,
+            want_rem=s.want_rem,
+            rd=s.rd,
+        )
+        self.state[0] = start.select(start_state, step_state)
+
+        stall = start | (busy & ~done)
+        with Condition(stall):
+            self.stall_cnt[0] = self.stall_cnt[0] + UInt(32)(1)
+        with Condition(done):
+            log("EX: Divider Result: 0x{:x} rd={}", result, s.rd)
+
+        return start, done, result, s.rd, stall
+
+
+def resolve_branch(
+    branch_type,
+    next_pc_addr,
+    ras_op,
+    inst_len,
+    pc,
+    imm,
+    rs1,
+    alu_result,
+    flush,
+    branch_target_reg,
+    bp_update_reg=None,
+):
+    """分支解析：按 ALU 的比较结果判断方向，专用加法器算出目标，与 IF 的预测 (next_pc_addr)
+    不符时写 branch_target_reg 冲刷流水线，并写分支预测训练通道。"""
+    # 1. 使用专用加法器计算跳转地址，对于 JALR，基址是 rs1；对于 JAL/Branch，基址是 PC
+    is_jal = branch_type == BranchType.JAL
+    is_jalr = branch_type == BranchType.JALR
+    target_base = is_jalr.select(rs1, pc)  # 1: JALR  # 0: Branch / JAL
+
+    # 专用加法器永远做 Base + Imm，JALR 目标最低位清零
+    calc_target = target_base + imm
+    calc_target = is_jalr.select(calc_target & Bits(32)(0xFFFFFFFE), calc_target)
+
+    # 2. 计算分支条件
+    # 对于 BEQ: alu_result == 0
+    # 对于 BNE: alu_result != 0
+    # 对于 BLT: alu_result[0] == 1
+    # 对于 BGE: alu_result[0] == 0
+    # 对于 BLTU: alu_result[0] == 1
+    # 对于 BGEU: alu_result[0] == 0
+    is_taken = Bits(1)(0)
+    is_branch = branch_type != BranchType.NO_BRANCH
+
+    # 输出分支类型日志
+    with Condition(branch_type == BranchType.BEQ):
+        log("EX: Branch Type: BEQ")
+    with Condition(branch_type == BranchType.BNE):
+        log("EX: Branch Type: BNE")
+    with Condition(branch_type == BranchType.BLT):
+        log("EX: Branch Type: BLT")
+    with Condition(branch_type == BranchType.BGE):
+        log("EX: Branch Type: BGE")
+    with Condition(branch_type == BranchType.BLTU):
+        log("EX: Branch Type: BLTU")
+    with Condition(branch_type == BranchType.BGEU):
+        log("EX: Branch Type: BGEU")
+    with Condition(branch_type == BranchType.JAL):
+        log("EX: Branch Type: JAL")
+    with Condition(branch_type == BranchType.JALR):
+        log("EX: Branch Type: JALR")
+    with Condition(branch_type == BranchType.NO_BRANCH):
+        log("EX: Branch Type: NO_BRANCH")
+
+    # 根据不同的分支类型判断分支条件
+    is_eq = alu_result == Bits(32)(0)
+    is_lt = alu_result[0:0] == Bits(1)(1)  # SLT/SLTU 结果为 1 表示小于
+
+    # BEQ, BNE 使用等于判断
+    is_taken_eq = (branch_type == BranchType.BEQ) & is_eq
+    is_taken_ne = (branch_type == BranchType.BNE) & ~is_eq
+
+    # BLT, BGE 使用小于判断
+    is_taken_lt = (branch_type == BranchType.BLT) & is_lt
+    is_taken_ge = (branch_type == BranchType.BGE) & ~is_lt
+
+    # BLTU, BGEU 使用无符号小于判断
+    is_taken_ltu = (branch_type == BranchType.BLTU) & is_lt
+    is_taken_geu = (branch_type == BranchType.BGEU) & ~is_lt
+
+    # JAL, JALR 无条件跳转
+    is_taken = (
+        is_taken_eq
+        | is_taken_ne
+        | is_taken_lt
+        | is_taken_ge
+        | is_taken_ltu
+        | is_taken_geu
+        | is_jal
+        | is_jalr
+    )
+
+    final_next_pc = flush.select(
+        Bits(32)(0),
+        is_branch.select(
+            is_taken.select(
+                calc_target,  # Taken
+                pc + inst_len,  # Not Taken
+            ),
+            next_pc_addr,
+        ),
+    )
+
+    # 4. 写入分支目标寄存器，供 IF 级使用
+    branch_miss = final_next_pc != next_pc_addr
+    branch_target_reg[0] = branch_miss.select(
+        final_next_pc,  # 跳转，写入目标地址
+        Bits(32)(0),  # 不跳转，写 0 表示顺序执行
+    )
+
+    # 5. 写入分支预测训练通道，供 IF 级更新方向预测表与 BTB
+    if bp_update_reg is not None:
+        bp_update_reg[0] = bp_update_signals.bundle(
+            valid=is_branch & ~flush,
+            is_cond=~is_jal & ~is_jalr,
+            taken=is_taken,
+            pc=pc,
+            target=calc_target,
+            ras_op=ras_op,
+            is_rvc=inst_len == Bits(32)(2),
+        )
+
+    # 输出分支目标和分支是否跳转的日志
+    with Condition(is_branch):
+        log("EX: Branch Target: 0x{:x}", calc_target)
+        log("EX: Branch Taken: {}", is_taken == Bits(1)(1))
+
+
+class Execution(Module):
+    def __init__(self, encoded=False):
         super().__init__(
             ports={
                 # --- [1] 控制通道 (Control Plane) ---
                 # 包含 alu_func, op1_sel, op2_sel, is_branch, is_write
                 # 以及嵌套的 mem_ctrl
-                "ctrl": Port(ex_ctrl_signals),
+                # encoded 为真时各独热字段以二进制下标传递 (ex_ctrl_enc_signals)，入口处译回
+                "ctrl": Port(ex_ctrl_enc_signals if encoded else ex_ctrl_signals),
                 # --- [2] 数据通道群 (Data Plane) ---
                 # 当前指令地址 (用于 Branch/AUIPC/JAL)
                 "pc": Port(Bits(32)),
@@ -22,22 +491,32 @@ class Execution(Module):
             }
         )
         self.name = "EX"
+        self.encoded = encoded
 
     @module.combinational
     def build(
         self,
-        mem_module: Module,  # 下一级流水线 (MEM)
+        mem_module: Module,  # 下一级流水线 (MEM；拆分 EX 时为 Execution2)
         # --- 旁路数据源 (Forwarding Sources) ---
         ex_mem_bypass: Array,  # 来自 EX-MEM 旁路寄存器的数据（上条指令结果）
         mem_wb_bypass: Array,  # 来自 MEM-WB 旁路寄存器的数据 (上上条指令结果)
-        wb_bypass: Array,  # 来自 WB 旁路寄存器的数据 (当前写回数据)
         # --- 分支反馈 ---
         branch_target_reg: Array,  # 用于通知 IF 跳转目标的全局寄存器
         dcache: SRAM,  # SRAM 模块引用 (用于Store操作)
+        bp_update_reg: Array = None,  # 分支预测训练通道 (可选)
+        multiplier: PipelinedMultiplier = None,  # M 扩展乘法器 (可选)
+        divider: IterativeDivider = None,  # M 扩展除法器 (可选)
+        agu=None,  # 译码级地址生成 (可选)：经它驱动 dcache，Load 可能已在 ID 级读取
+        dual=None,  # 双发射 (可选)：旁路值可能取自第 1 路 (AluLane)
+        ex2_bypass: Array = None,  # 拆分 EX (可选)：EX2 级末的旁路寄存器，本级只做旁路与 ALU
     ):
+        split = ex2_bypass is not None
+
         # 1. 弹出所有端口数据
         # 根据 __init__ 定义顺序解包
         ctrl = self.ctrl.pop()
+        if self.encoded:
+            ctrl = decode_ex_ctrl(ctrl)
         pc = self.pc.pop()
         rs1 = self.rs1_data.pop()
         rs2 = self.rs2_data.pop()
@@ -58,16 +537,45 @@ class Execution(Module):
         # 获取旁路数据
         fwd_from_mem = ex_mem_bypass[0]
         fwd_from_wb = mem_wb_bypass[0]
-        fwd_from_wb_stage = wb_bypass[0]
+        # 拆分 EX 时多一级：EX2 级末的结果 (不拆分时不会选中)
+        fwd_from_ex2 = ex2_bypass[0] if split else Bits(32)(0)
+        # 更早的指令已在 WB 级写回：寄存器堆写穿透，ID 级读出的 rs1/rs2 即为最新值
+
+        # 双发射：ID 级按记分牌记下的通道，rs1/rs2 各自在两个通道的旁路之间选择
+        rs1_fwd_mem, rs1_fwd_wb = fwd_from_mem, fwd_from_wb
+        rs2_fwd_mem, rs2_fwd_wb = fwd_from_mem, fwd_from_wb
+        if dual is not None:
+            fwd_lane = dual.fwd_lane[0]
+            lane_mem = lane_result_signals.view(dual.lane_mem[0]).data
+            lane_wb = lane_result_signals.view(dual.lane_wb[0]).data
+            rs1_fwd_mem = fwd_lane[0:0].select(lane_mem, fwd_from_mem)
+            rs1_fwd_wb = fwd_lane[0:0].select(lane_wb, fwd_from_wb)
+            rs2_fwd_mem = fwd_lane[1:1].select(lane_mem, fwd_from_mem)
+            rs2_fwd_wb = fwd_lane[1:1].select(lane_wb, fwd_from_wb)
 
         # --- rs1 旁路处理 ---
         real_rs1 = ctrl.rs1_sel.select1hot(
-            rs1, fwd_from_mem, fwd_from_wb, fwd_from_wb_stage
+            rs1, rs1_fwd_mem, rs1_fwd_wb, fwd_from_ex2
         )
 
+        # Store 写数据晚取：紧邻的 Load 此刻在 MEM 级，其读出的字已在 SRAM 输出端口，
+        # 按上一周期记下的格式对齐后即为 Load 的结果
+        # (拆分 EX 时 Store 在 EX2 才写 SRAM，由 EX2 取)
+        if split:
+            load_data = Bits(32)(0)
+        else:
+            load_align_reg = RegArray(load_align_signals, 1)
+            load_align = load_align_signals.view(load_align_reg[0])
+            load_data = align_load(
+                dcache.dout[0].bitcast(Bits(32)),
+                load_align.offset,
+                load_align.mem_width,
+                load_align.mem_unsigned,
+            )
+
         # --- rs2 旁路处理 ---
         real_rs2 = ctrl.rs2_sel.select1hot(
-            rs2, fwd_from_mem, fwd_from_wb, fwd_from_wb_stage
+            rs2, rs2_fwd_mem, rs2_fwd_wb, load_data, fwd_from_ex2
         )
 
         # --- 操作数 1 选择 ---
@@ -75,105 +583,136 @@ class Execution(Module):
             real_rs1, pc, Bits(32)(0)  # 0  # 1 (AUIPC/JAL/Branch)  # 2 (LUI Link)
         )
 
+        # 指令长度：压缩指令为 2 字节 (链接地址与不跳转时的下一条地址随之变化)
+        inst_len = ctrl.is_rvc.select(Bits(32)(2), Bits(32)(4))
+
         # --- 操作数 2 选择 ---
         alu_op2 = ctrl.op2_sel.select1hot(
-            real_rs2, imm, Bits(32)(4)  # 0  # 1  # 2 (JAL/JALR Link)
+            real_rs2, imm, inst_len  # 0  # 1  # 2 (JAL/JALR Link)
         )
 
         # --- ALU 计算 ---
-        # 1. 基础运算
-        # 转换为有符号数进行加减法运算
-        op1_signed = alu_op1.bitcast(Int(32))
-        op2_signed = alu_op2.bitcast(Int(32))
-
-        # 加法
-        add_res = (op1_signed + op2_signed).bitcast(Bits(32))
-
-        # 减法
-        sub_res = (op1_signed - op2_signed).bitcast(Bits(32))
-
-        # 逻辑与
-        and_res = alu_op1 & alu_op2
-
-        # 逻辑或
-        or_res = alu_op1 | alu_op2
-
-        # 逻辑异或
-        xor_res = alu_op1 ^ alu_op2
-
-        # 逻辑左移 (使用低5位作为移位位数)
-        sll_res = alu_op1 << alu_op2[0:4]
-
-        # 逻辑右移 (使用低5位作为移位位数)
-        srl_res = alu_op1 >> alu_op2[0:4]
-
-        # 算术右移 (使用低5位作为移位位数)
-        sra_res = op1_signed >> alu_op2[0:4]
-        sra_res = sra_res.bitcast(Bits(32))
-
-        # 有符号比较小于
-        slt_res = (op1_signed < op2_signed).bitcast(Bits(32))
-
-        # 无符号比较小于
-        sltu_res = (alu_op1 < alu_op2).bitcast(Bits(32))
-
-        # 2. 结果选择
-        alu_result = ctrl.alu_func.select1hot(
-            add_res,  # ADD
-            sub_res,  # SUB
-            sll_res,  # SLL
-            slt_res,  # SLT
-            sltu_res,  # SLTU
-            xor_res,  # XOR
-            srl_res,  # SRL
-            sra_res,  # SRA
-            or_res,  # OR
-            and_res,  # AND
-            alu_op2,  # NOP (直接输出操作数2)
-            alu_op2,  # 占位
-            alu_op2,  # 占位
-            alu_op2,  # 占位
-            alu_op2,  # 占位
-            alu_op2,  # 占位
-        )
+        alu_result = alu(ctrl.alu_func, alu_op1, alu_op2)
+
+        # ID 停顿时发出的气泡保留 alu_func 但 rd 为 0：以 rd 判断乘法 / 除法是否有效
+        # (写 x0 的乘除法结果本就被丢弃)
+        is_valid_rd = final_rd != Bits(5)(0)
+
+        # 乘法与 ALU 并行进入乘法器第 1 级，乘积在 MEM 级给出
+        is_mul = Bits(1)(0)
+        if multiplier is not None:
+            is_mul = multiplier.issue(ctrl.alu_func, real_rs1, real_rs2, is_valid_rd)
+
+        # 除法：发起时本指令不送往 MEM；给出结果的周期 EX 收到的是气泡 (ID 仍在停顿)，
+        # 由除法结果与其目标寄存器顶替
+        ex_result = alu_result
+        out_rd = final_mem_ctrl.rd_addr
+        div_stall = Bits(1)(0)
+        if divider is not None:
+            div_start, div_done, div_result, div_rd, div_stall = divider.step(
+                ctrl.alu_func,
+                real_rs1,
+                real_rs2,
+                final_rd,
+                is_valid_rd,
+                kill=flush_if if split else None,
+            )
+            ex_result = div_done.select(div_result, alu_result)
+            out_rd = div_start.select(
+                Bits(5)(0), div_done.select(div_rd, final_mem_ctrl.rd_addr)
+            )
+
+        # 已在 ID 级提前读取的 Load：本周期 dout 即为其读出的字，对齐后作为本级结果，
+        # 送往 MEM 时按普通结果处理，不再读 SRAM
+        is_early_load = Bits(1)(0)
+        if agu is not None:
+            is_early_load = agu.early[0] & (final_mem_ctrl.mem_opcode == MemOp.LOAD)
+            early_data = align_load(
+                dcache.dout[0].bitcast(Bits(32)),
+                alu_result,
+                mem_ctrl.mem_width,
+                mem_ctrl.mem_unsigned,
+            )
+            ex_result = is_early_load.select(early_data, ex_result)
 
         # 3. 驱动本级 Bypass 寄存器 (向 ID 级提供数据)
         # 这样下一拍 ID 级就能看到这条指令的结果了
-        ex_mem_bypass[0] = alu_result
+        ex_mem_bypass[0] = ex_result
 
         # 输出ALU结果日志
         log("EX: ALU Result: 0x{:x}", alu_result)
 
         # 输出旁路寄存器更新日志
-        log("EX: Bypass Update: 0x{:x}", alu_result)
+        log("EX: Bypass Update: 0x{:x}", ex_result)
 
         # 输出旁路选择日志
         with Condition(ctrl.rs1_sel == Rs1Sel.RS1):
             log("EX: RS1 source: Register")
         with Condition(ctrl.rs1_sel == Rs1Sel.EX_MEM_BYPASS):
-            log("EX: RS1 source: EX-MEM Bypass (0x{:x})", fwd_from_mem)
+            log("EX: RS1 source: EX-MEM Bypass (0x{:x})", rs1_fwd_mem)
         with Condition(ctrl.rs1_sel == Rs1Sel.MEM_WB_BYPASS):
-            log("EX: RS1 source: MEM-WB Bypass (0x{:x})", fwd_from_wb)
-        with Condition(ctrl.rs1_sel == Rs1Sel.WB_BYPASS):
-            log("EX: RS1 source: WB Bypass (0x{:x})", fwd_from_wb_stage)
+            log("EX: RS1 source: MEM-WB Bypass (0x{:x})", rs1_fwd_wb)
+        with Condition(ctrl.rs1_sel == Rs1Sel.EX2_BYPASS):
+            log("EX: RS1 source: EX2 Bypass (0x{:x})", fwd_from_ex2)
 
         with Condition(ctrl.rs2_sel == Rs2Sel.RS2):
             log("EX: RS2 source: Register")
         with Condition(ctrl.rs2_sel == Rs2Sel.EX_MEM_BYPASS):
-            log("EX: RS2 source: EX-MEM Bypass (0x{:x})", fwd_from_mem)
+            log("EX: RS2 source: EX-MEM Bypass (0x{:x})", rs2_fwd_mem)
         with Condition(ctrl.rs2_sel == Rs2Sel.MEM_WB_BYPASS):
-            log("EX: RS2 source: MEM-WB Bypass (0x{:x})", fwd_from_wb)
-        with Condition(ctrl.rs2_sel == Rs2Sel.WB_BYPASS):
-            log("EX: RS2 source: WB Bypass (0x{:x})", fwd_from_wb_stage)
+            log("EX: RS2 source: MEM-WB Bypass (0x{:x})", rs2_fwd_wb)
+        if not split:
+            with Condition(ctrl.rs2_sel == Rs2Sel.LOAD_DATA):
+                log("EX: RS2 source: Load Data (0x{:x})", load_data)
+        with Condition(ctrl.rs2_sel == Rs2Sel.EX2_BYPASS):
+            log("EX: RS2 source: EX2 Bypass (0x{:x})", fwd_from_ex2)
+
+        # 拆分 EX：访存与分支解析在 EX2 完成，本级把结果与 EX2 需要的操作数送过去
+        # (被冲刷的指令不再解析分支、不访存、不写回)
+        if split:
+            ex2_call = mem_module.async_called(
+                ctrl=ex2_ctrl_signals.bundle(
+                    branch_type=flush_if.select(BranchType.NO_BRANCH, ctrl.branch_type),
+                    next_pc_addr=ctrl.next_pc_addr,
+                    ras_op=ctrl.ras_op,
+                    is_rvc=ctrl.is_rvc,
+                    store_late=ctrl.rs2_sel == Rs2Sel.LOAD_DATA,
+                    mem_ctrl=mem_ctrl_signals.bundle(
+                        mem_opcode=final_mem_opcode,
+                        mem_width=mem_ctrl.mem_width,
+                        mem_unsigned=mem_ctrl.mem_unsigned,
+                        rd_addr=out_rd,
+                    ),
+                ),
+                pc=pc,
+                rs1_data=real_rs1,
+                rs2_data=real_rs2,
+                imm=imm,
+                alu_result=ex_result,
+            )
+            ex2_call.bind.set_fifo_depth(
+                ctrl=1, pc=1, rs1_data=1, rs2_data=1, imm=1, alu_result=1
+            )
+            is_load = final_mem_opcode == MemOp.LOAD
+            return out_rd, is_load, is_mul, div_stall
 
         # --- 访存操作 (Store Handling) ---
         # 仅在 is_write (Store) 为真时驱动 SRAM 的 WE
         # 地址是 ALU 计算结果，数据是经过 Forwarding 的 rs2
         is_store = final_mem_ctrl.mem_opcode == MemOp.STORE
-        is_load = final_mem_ctrl.mem_opcode == MemOp.LOAD
+        is_load = (final_mem_ctrl.mem_opcode == MemOp.LOAD) & ~is_early_load
+
+        # 记下本周期送往 MEM 的访存格式，供下一周期紧随其后的 Store 对齐 Load 数据
+        load_align_reg[0] = load_align_signals.bundle(
+            mem_width=mem_ctrl.mem_width,
+            mem_unsigned=mem_ctrl.mem_unsigned,
+            offset=alu_result[0:1],
+        )
 
         # 直接调用 dcache.build 处理 SRAM 操作
-        dcache.build(
+        # 使用译码级地址生成时由 agu 统一驱动端口 (EX 的请求优先)
+        dcache_build = dcache.build if agu is None else agu.request
+        dcache_build(
             we=is_store,  # 写使能信号（对于Store指令）
             wdata=real_rs2,  # 写入数据（经过Forwarding的rs2）
             addr=alu_result,  # 地址（ALU计算结果）
@@ -181,98 +720,213 @@ class Execution(Module):
         )
 
         # --- 分支处理 (Branch Handling) ---
-        # 1. 使用专用加法器计算跳转地址，对于 JALR，基址是 rs1；对于 JAL/Branch，基址是 PC
-        is_jalr = ctrl.branch_type == BranchType.JALR
-        target_base = is_jalr.select(pc, real_rs1)  # 0: Branch / JAL  # 1: JALR
-
-        # 专用加法器永远做 Base + Imm
-        calc_target = target_base + imm
-
-        # 2. 计算分支条件
-        # 对于 BEQ: alu_result == 0
-        # 对于 BNE: alu_result != 0
-        # 对于 BLT: alu_result[0] == 1
-        # 对于 BGE: alu_result[0] == 0
-        # 对于 BLTU: alu_result[0] == 1
-        # 对于 BGEU: alu_result[0] == 0
-        is_taken = Bits(1)(0)
-        is_branch = ctrl.branch_type != BranchType.NO_BRANCH
-
-        # 输出分支类型日志
-        with Condition(ctrl.branch_type == BranchType.BEQ):
-            log("EX: Branch Type: BEQ")
-        with Condition(ctrl.branch_type == BranchType.BNE):
-            log("EX: Branch Type: BNE")
-        with Condition(ctrl.branch_type == BranchType.BLT):
-            log("EX: Branch Type: BLT")
-        with Condition(ctrl.branch_type == BranchType.BGE):
-            log("EX: Branch Type: BGE")
-        with Condition(ctrl.branch_type == BranchType.BLTU):
-            log("EX: Branch Type: BLTU")
-        with Condition(ctrl.branch_type == BranchType.BGEU):
-            log("EX: Branch Type: BGEU")
-        with Condition(ctrl.branch_type == BranchType.JAL):
-            log("EX: Branch Type: JAL")
-        with Condition(ctrl.branch_type == BranchType.JALR):
-            log("EX: Branch Type: JALR")
-        with Condition(ctrl.branch_type == BranchType.NO_BRANCH):
-            log("EX: Branch Type: NO_BRANCH")
-
-        # 根据不同的分支类型判断分支条件
-        is_eq = alu_result == Bits(32)(0)
-        is_lt = alu_result[31:31] == Bits(1)(1)  # 符号位为1表示小于
-
-        # BEQ, BNE 使用等于判断
-        is_taken_eq = (ctrl.branch_type == BranchType.BEQ) & is_eq
-        is_taken_ne = (ctrl.branch_type == BranchType.BNE) & ~is_eq
-
-        # BLT, BGE 使用小于判断
-        is_taken_lt = (ctrl.branch_type == BranchType.BLT) & is_lt
-        is_taken_ge = (ctrl.branch_type == BranchType.BGE) & ~is_lt
-
-        # BLTU, BGEU 使用无符号小于判断
-        is_taken_ltu = (ctrl.branch_type == BranchType.BLTU) & is_lt
-        is_taken_geu = (ctrl.branch_type == BranchType.BGEU) & ~is_lt
-
-        is_taken = (
-            is_taken_eq
-            | is_taken_ne
-            | is_taken_lt
-            | is_taken_ge
-            | is_taken_ltu
-            | is_taken_geu
-        )
-
-        final_next_pc = flush_if.select(
-            Bits(32)(0),
-            is_branch.select(
-                is_taken.select(
-                    calc_target,  # Taken
-                    pc + Bits(32)(4),  # Not Taken
-                ),
-                ctrl.next_pc_addr,
-            ),
+        resolve_branch(
+            ctrl.branch_type,
+            ctrl.next_pc_addr,
+            ctrl.ras_op,
+            inst_len,
+            pc,
+            imm,
+            real_rs1,
+            alu_result,
+            flush_if,
+            branch_target_reg,
+            bp_update_reg,
         )
 
-        # 4. 写入分支目标寄存器，供 IF 级使用
-        branch_miss = final_next_pc != ctrl.next_pc_addr
-        branch_target_reg[0] = branch_miss.select(
-            final_next_pc,  # 跳转，写入目标地址
-            Bits(32)(0),  # 不跳转，写 0 表示顺序执行
-        )
-
-        # 输出分支目标和分支是否跳转的日志
-        with Condition(is_branch):
-            log("EX: Branch Target: 0x{:x}", calc_target)
-            log("EX: Branch Taken: {}", is_taken == Bits(1)(1))
-
         # --- 下一级绑定与状态反馈 ---
         # 构造发送给 MEM 的包
         # 只有两个参数：控制 + 统一数据
-        mem_call = mem_module.async_called(ctrl=final_mem_ctrl, alu_result=alu_result)
+        out_mem_ctrl = mem_ctrl_signals.bundle(
+            mem_opcode=is_early_load.select(MemOp.NONE, final_mem_opcode),
+            mem_width=mem_ctrl.mem_width,
+            mem_unsigned=mem_ctrl.mem_unsigned,
+            rd_addr=out_rd,
+        )
+        mem_call = mem_module.async_called(ctrl=out_mem_ctrl, alu_result=ex_result)
         mem_call.bind.set_fifo_depth(ctrl=1, alu_result=1)
 
         # 3. 返回状态 (供 HazardUnit 窃听)
         # rd_addr 用于记分牌/依赖检测
-        # is_load 用于检测 Load-Use 冒险
-        return final_mem_ctrl.rd_addr, is_load
+        # is_load / is_mul 的结果在 MEM 级才可用，用于检测 Load-Use (Mul-Use) 冒险
+        # div_stall 为除法器忙，ID/IF 需保持
+        return out_rd, is_load, is_mul, div_stall
+
+
+class Execution2(Module):
+    """
+    拆分 EX (build_cpu(split_ex=True)) 时的第二级 EX2：分支解析与访存发出。
+
+    *   EX1 (Execution) 只做旁路选择、ALU、乘法器第 1 级与除法器，把结果连同本级需要的
+        操作数送来；EX1 末的结果经 ex_bypass_reg 旁路 (Rs1Sel/Rs2Sel.EX_MEM_BYPASS)。
+    *   本级按 ALU 的比较结果解析分支，驱动数据 SRAM，完成乘法器第 2 级，
+        结果写入 ex2_bypass_reg (Rs1Sel/Rs2Sel.EX2_BYPASS) 后送往 MEM。
+    *   Store 写数据晚取：紧邻的 Load 此刻在 MEM 级，按上一周期记下的格式对齐其读出的字。
+    *   上一周期本级解析出跳转时，本级与 EX1 中的指令都在错误路径上，一并作废。
+    """
+
+    def __init__(self):
+        super().__init__(
+            ports={
+                "ctrl": Port(ex2_ctrl_signals),
+                "pc": Port(Bits(32)),
+                # 旁路后的 rs1 (JALR 基址)
+                "rs1_data": Port(Bits(32)),
+                # 旁路后的 rs2 (Store 写数据)
+                "rs2_data": Port(Bits(32)),
+                "imm": Port(Bits(32)),
+                # EX1 的结果 (分支比较结果 / 访存地址 / 写回数据)
+                "alu_result": Port(Bits(32)),
+            }
+        )
+        self.name = "EX2"
+
+    @module.combinational
+    def build(
+        self,
+        mem_module: Module,  # 下一级流水线 (MEM)
+        ex2_bypass: Array,  # 本级末的旁路寄存器
+        branch_target_reg: Array,
+        dcache: SRAM,
+        bp_update_reg: Array = None,  # 分支预测训练通道 (可选)
+        multiplier: PipelinedMultiplier = None,  # 本级完成其第 2 级 (可选)
+    ):
+        ctrl = self.ctrl.pop()
+        pc = self.pc.pop()
+        rs1 = self.rs1_data.pop()
+        rs2 = self.rs2_data.pop()
+        imm = self.imm.pop()
+        alu_result = self.alu_result.pop()
+        mem_ctrl = mem_ctrl_signals.view(ctrl.mem_ctrl)
+
+        flush_if = branch_target_reg[0] != Bits(32)(0)
+        final_rd = flush_if.select(Bits(5)(0), mem_ctrl.rd_addr)
+        final_mem_opcode = flush_if.select(Bits(3)(0), mem_ctrl.mem_opcode)
+
+        # --- 访存操作 ---
+        load_align_reg = RegArray(load_align_signals, 1)
+        load_align = load_align_signals.view(load_align_reg[0])
+        load_data = align_load(
+            dcache.dout[0].bitcast(Bits(32)),
+            load_align.offset,
+            load_align.mem_width,
+            load_align.mem_unsigned,
+        )
+        wdata = ctrl.store_late.select(load_data, rs2)
+        with Condition(ctrl.store_late):
+            log("EX2: Store data from load (0x{:x})", load_data)
+
+        load_align_reg[0] = load_align_signals.bundle(
+            mem_width=mem_ctrl.mem_width,
+            mem_unsigned=mem_ctrl.mem_unsigned,
+            offset=alu_result[0:1],
+        )
+        dcache.build(
+            we=final_mem_opcode == MemOp.STORE,
+            wdata=wdata,
+            addr=alu_result,
+            re=final_mem_opcode == MemOp.LOAD,
+        )
+
+        # --- 乘法器第 2 级 ---
+        result = alu_result
+        if multiplier is not None:
+            mul_valid, mul_result = multiplier.result()
+            result = mul_valid.select(mul_result, result)
+
+        ex2_bypass[0] = result
+        log("EX2: Bypass Update: 0x{:x}", result)
+
+        # --- 分支处理 ---
+        inst_len = ctrl.is_rvc.select(Bits(32)(2), Bits(32)(4))
+        resolve_branch(
+            ctrl.branch_type,
+            ctrl.next_pc_addr,
+            ctrl.ras_op,
+            inst_len,
+            pc,
+            imm,
+            rs1,
+            alu_result,
+            flush_if,
+            branch_target_reg,
+            bp_update_reg,
+        )
+
+        mem_call = mem_module.async_called(
+            ctrl=mem_ctrl_signals.bundle(
+                mem_opcode=final_mem_opcode,
+                mem_width=mem_ctrl.mem_width,
+                mem_unsigned=mem_ctrl.mem_unsigned,
+                rd_addr=final_rd,
+            ),
+            alu_result=result,
+        )
+        mem_call.bind.set_fifo_depth(ctrl=1, alu_result=1)
+
+        return final_rd
+
+
+class AluLane(Downstream):
+    """
+    双发射的第 1 路 (只有 ALU)：EX / MEM / WB 三级，级间寄存器由 DualIssue 持有。
+
+    *   EX：读取 ID 写入的 lane_ex，按旁路选择码与 fwd_lane 从两个通道的旁路中取操作数，
+        经 ALU 算出结果写入 lane_mem。与第 0 路一样，上一周期 EX 解析出跳转时本级作废。
+    *   MEM：不访存，lane_mem 原样前移到 lane_wb。
+    *   WB：lane_wb 经寄存器堆的第二个写口写回。
+
+    lane_mem / lane_wb 即该通道的 EX / MEM 旁路 (与 ex_bypass_reg / mem_bypass_reg 对应)；
+    返回本周期的写口 (rd, data)，供 DecoderImpl 写穿透。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "EX_L1"
+
+    @downstream.combinational
+    def build(
+        self,
+        dual,  # DualIssue：第 1 路的级间寄存器
+        reg_file: Array,
+        ex_mem_bypass: Array,  # 第 0 路的 EX 旁路
+        mem_wb_bypass: Array,  # 第 0 路的 MEM 旁路
+        branch_target_reg: Array,
+    ):
+        ctrl = lane_ex_signals.view(dual.lane_ex[0])
+        mem = lane_result_signals.view(dual.lane_mem[0])
+        wb = lane_result_signals.view(dual.lane_wb[0])
+
+        # --- EX ---
+        flush_if = branch_target_reg[0] != Bits(32)(0)
+        rd = flush_if.select(Bits(5)(0), ctrl.rd_addr)
+
+        fwd_lane = ctrl.fwd_lane
+        rs1_fwd_mem = fwd_lane[0:0].select(mem.data, ex_mem_bypass[0])
+        rs1_fwd_wb = fwd_lane[0:0].select(wb.data, mem_wb_bypass[0])
+        rs2_fwd_mem = fwd_lane[1:1].select(mem.data, ex_mem_bypass[0])
+        rs2_fwd_wb = fwd_lane[1:1].select(wb.data, mem_wb_bypass[0])
+        real_rs1 = ctrl.rs1_sel.select1hot(
+            ctrl.rs1_data, rs1_fwd_mem, rs1_fwd_wb, Bits(32)(0)
+        )
+        real_rs2 = ctrl.rs2_sel.select1hot(
+            ctrl.rs2_data, rs2_fwd_mem, rs2_fwd_wb, Bits(32)(0), Bits(32)(0)
+        )
+
+        alu_op1 = ctrl.op1_sel.select1hot(real_rs1, ctrl.pc, Bits(32)(0))
+        alu_op2 = ctrl.op2_sel.select1hot(real_rs2, ctrl.imm, Bits(32)(4))
+        result = alu(ctrl.alu_func, alu_op1, alu_op2)
+
+        with Condition(rd != Bits(5)(0)):
+            log("EX_L1: ALU Result: 0x{:x} rd={}", result, rd)
+
+        # --- EX -> MEM -> WB ---
+        dual.lane_mem[0] = lane_result_signals.bundle(rd_addr=rd, data=result)
+        dual.lane_wb[0] = dual.lane_mem[0]
+
+        # --- WB：寄存器堆的第二个写口 ---
+        with Condition(wb.rd_addr != Bits(5)(0)):
+            log("WB: Write x{} <= 0x{:x} (lane 1)", wb.rd_addr, wb.data)
+            (reg_file & self)[wb.rd_addr] <= wb.data
+
+        return wb.rd_addr, wb.data
@@ -1,5 +1,7 @@
 from assassyn.frontend import *
 from .control_signals import *
+from .icache import ICache
+from .rvc import align_parcel, is_compressed
 
 
 class Fetcher(Module):
@@ -21,6 +23,616 @@ class Fetcher(Module):
         return pc_reg, last_pc_reg
 
 
+# ==============================================================================
+# 方向预测器 (Direction Predictors)
+#
+# 与 SRAM 类似，预测器本身只持有状态 (RegArray)，读写逻辑由调用者
+# (FetcherImpl) 在自己的 build 中生成。所有预测器提供统一接口，每周期按序调用：
+#   1. train(en, pc, taken, target, recover)：用 EX 回传的结果训练，返回训练前的预测方向；
+#      recover 为 1 (本周期冲刷) 时，推测状态在本周期恢复为提交状态。
+#   2. predict(pc, target)：对本周期取指地址给出预测方向 (target 为 BTB 目标)。
+#   2'. replay(en, taken)：ID 级重定向的周期，在恢复后的历史上补移入该条件分支的实际方向。
+#   3. speculate(en, taken)：en 为 1 时按预测方向推测更新全局历史。
+# 训练时以表中原有的预测方向与实际方向对比，累计 hit_cnt / miss_cnt。
+# ==============================================================================
+
+
+def sat_counter_update(ctr, taken):
+    """2-bit 饱和计数器：taken 加一，否则减一。"""
+    ctr_inc = (ctr == Bits(2)(3)).select(ctr, ctr + Bits(2)(1))
+    ctr_dec = (ctr == Bits(2)(0)).select(ctr, ctr - Bits(2)(1))
+    return taken.select(ctr_inc, ctr_dec)
+
+
+def count_accuracy(hit_cnt, miss_cnt, en, is_hit):
+    with Condition(en & is_hit):
+        hit_cnt[0] = hit_cnt[0] + UInt(32)(1)
+    with Condition(en & ~is_hit):
+        miss_cnt[0] = miss_cnt[0] + UInt(32)(1)
+
+
+class StaticPredictor:
+    """
+    静态预测 (BTFN)：向后跳转 (循环) 预测跳转，向前跳转预测不跳转。无表项。
+    """
+
+    def __init__(self):
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.hit_cnt, self.miss_cnt]
+
+    def predict(self, pc, target):
+        return target < pc
+
+    def train(self, en, pc, taken, target, recover):
+        pred = self.predict(pc, target)
+        count_accuracy(self.hit_cnt, self.miss_cnt, en, pred == taken)
+        return pred
+
+    def replay(self, en, taken):
+        pass
+
+    def speculate(self, en, taken):
+        pass
+
+
+class BimodalPredictor:
+    """
+    PC 索引的 2-bit 饱和计数器表 (Bimodal Predictor)。
+
+    计数器编码：0/1 -> 预测不跳转，2/3 -> 预测跳转。复位为 1 (弱不跳转)。
+    """
+
+    def __init__(self, size_log=6):
+        self.size_log = size_log
+        self.table = RegArray(
+            Bits(2), 1 << size_log, initializer=[1] * (1 << size_log)
+        )
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.hit_cnt, self.miss_cnt]
+
+    def index(self, pc):
+        # 指令按 4 字节对齐，丢弃 pc[1:0]
+        return pc[2 : 2 + self.size_log - 1]
+
+    def predict(self, pc, target=None):
+        # 计数器最高位即预测方向
+        return self.table[self.index(pc)][1:1]
+
+    def train(self, en, pc, taken, target=None, recover=None):
+        idx = self.index(pc)
+        ctr = self.table[idx]
+        is_hit = ctr[1:1] == taken
+
+        with Condition(en):
+            self.table[idx] = sat_counter_update(ctr, taken)
+            log(
+                "BP: Train PC=0x{:x} Taken={} Counter={} Hit={}",
+                pc,
+                taken == Bits(1)(1),
+                ctr,
+                is_hit == Bits(1)(1),
+            )
+        count_accuracy(self.hit_cnt, self.miss_cnt, en, is_hit)
+
+        return ctr[1:1]
+
+    def replay(self, en, taken):
+        pass
+
+    def speculate(self, en, taken):
+        pass
+
+
+class GsharePredictor:
+    """
+    Gshare：全局历史寄存器 (GHR) 与 PC 异或后索引 2-bit 计数器表。
+
+    *   推测历史 (spec_ghr)：IF 级对每条 BTB 命中的条件分支按预测方向移入。
+    *   提交历史 (commit_ghr)：按 EX 解析顺序移入实际方向，训练时用它计算索引。
+    *   修复：冲刷 (EX 写 branch_target_reg) 的周期，推测历史恢复为提交历史。
+    """
+
+    def __init__(self, size_log=8):
+        assert size_log >= 2, "Gshare history must be at least 2 bits"
+        self.size_log = size_log
+        self.table = RegArray(
+            Bits(2), 1 << size_log, initializer=[1] * (1 << size_log)
+        )
+        self.spec_ghr = RegArray(Bits(size_log), 1, initializer=[0])
+        self.commit_ghr = RegArray(Bits(size_log), 1, initializer=[0])
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+        # 本周期预测所用的历史 (由 train 生成)
+        self.base_ghr = None
+
+    def stats(self):
+        return [self.hit_cnt, self.miss_cnt]
+
+    def index(self, pc, ghr):
+        return pc[2 : 2 + self.size_log - 1] ^ ghr
+
+    def shift_in(self, ghr, taken):
+        return concat(ghr[0 : self.size_log - 2], taken)
+
+    def predict(self, pc, target=None):
+        return self.table[self.index(pc, self.base_ghr)][1:1]
+
+    def train(self, en, pc, taken, target=None, recover=Bits(1)(0)):
+        commit_ghr = self.commit_ghr[0]
+        idx = self.index(pc, commit_ghr)
+        ctr = self.table[idx]
+        is_hit = ctr[1:1] == taken
+        next_commit_ghr = en.select(self.shift_in(commit_ghr, taken), commit_ghr)
+
+        with Condition(en):
+            self.table[idx] = sat_counter_update(ctr, taken)
+            self.commit_ghr[0] = next_commit_ghr
+            log(
+                "GSHARE: Train PC=0x{:x} GHR=0x{:x} Taken={} Counter={} Hit={}",
+                pc,
+                commit_ghr,
+                taken == Bits(1)(1),
+                ctr,
+                is_hit == Bits(1)(1),
+            )
+        count_accuracy(self.hit_cnt, self.miss_cnt, en, is_hit)
+
+        self.base_ghr = recover.select(next_commit_ghr, self.spec_ghr[0])
+        return ctr[1:1]
+
+    def replay(self, en, taken):
+        self.base_ghr = en.select(self.shift_in(self.base_ghr, taken), self.base_ghr)
+
+    def speculate(self, en, taken):
+        self.spec_ghr[0] = en.select(
+            self.shift_in(self.base_ghr, taken), self.base_ghr
+        )
+
+
+class TournamentPredictor:
+    """
+    竞争预测：Bimodal 与 Gshare 并行预测，PC 索引的 2-bit 选择表决定采用哪一个
+    (计数器 >= 2 选 Gshare)。两个子预测器都持续训练，各自保留命中计数，
+    便于在同一负载上对比。
+    """
+
+    def __init__(self, size_log=8):
+        self.size_log = size_log
+        self.bimodal = BimodalPredictor(size_log)
+        self.gshare = GsharePredictor(size_log)
+        self.chooser = RegArray(
+            Bits(2), 1 << size_log, initializer=[1] * (1 << size_log)
+        )
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return (
+            [self.hit_cnt, self.miss_cnt] + self.bimodal.stats() + self.gshare.stats()
+        )
+
+    def index(self, pc):
+        return pc[2 : 2 + self.size_log - 1]
+
+    def predict(self, pc, target=None):
+        use_gshare = self.chooser[self.index(pc)][1:1]
+        return use_gshare.select(
+            self.gshare.predict(pc), self.bimodal.predict(pc)
+        )
+
+    def train(self, en, pc, taken, target=None, recover=Bits(1)(0)):
+        bimodal_pred = self.bimodal.train(en, pc, taken, target, recover)
+        gshare_pred = self.gshare.train(en, pc, taken, target, recover)
+
+        idx = self.index(pc)
+        choice = self.chooser[idx]
+        pred = choice[1:1].select(gshare_pred, bimodal_pred)
+        count_accuracy(self.hit_cnt, self.miss_cnt, en, pred == taken)
+
+        # 只在两者意见不同时训练选择表：Gshare 对则加一，否则减一
+        with Condition(en & (bimodal_pred != gshare_pred)):
+            self.chooser[idx] = sat_counter_update(choice, gshare_pred == taken)
+
+        return pred
+
+    def replay(self, en, taken):
+        self.gshare.replay(en, taken)
+
+    def speculate(self, en, taken):
+        self.gshare.speculate(en, taken)
+
+
+def make_direction_predictor(kind, size_log):
+    """按名称构造方向预测器；"none" 表示不做任何预测 (不使用 BTB)。"""
+    if kind == "none":
+        return None
+    if kind == "static":
+        return StaticPredictor()
+    if kind == "bimodal":
+        return BimodalPredictor(size_log)
+    if kind == "gshare":
+        return GsharePredictor(size_log)
+    if kind == "tournament":
+        return TournamentPredictor(size_log)
+    raise ValueError(f"Unknown branch predictor: {kind}")
+
+
+class BranchTargetBuffer:
+    """
+    带标签的分支目标缓冲 (BTB)，支持直接映射 (ways=1) 与组相联 (ways=2^k)。
+
+    每个表项记录：valid, tag, target, is_cond, ras_op (rvc=True 时另有 is_rvc)。
+    *   查询 (lookup)：IF 级用当前取指地址查表，命中即可在同一周期重定向。
+    *   更新 (update)：EX 解析出的每条分支/跳转都会写入 (命中则原地更新，
+        未命中则按组内轮转指针替换)。
+
+    rvc=True 时指令按 2 字节对齐，索引与标签从 pc[1] 开始，同一个字中的两条压缩指令
+    不会互相命中 (否则非跳转指令会带着错误的预测目标流入 EX，而 EX 不校验非跳转指令)。
+    表项同时记录该跳转是否为压缩指令 (is_rvc)，返回地址栈推测压栈时链接地址为 pc + 2 / pc + 4。
+    """
+
+    def __init__(self, size_log=6, ways=1, rvc=False):
+        assert ways & (ways - 1) == 0, "BTB ways must be a power of two"
+        self.size_log = size_log
+        self.ways = ways
+        self.way_bits = max(ways.bit_length() - 1, 1)
+        self.lsb = 1 if rvc else 2
+        self.tag_bits = 32 - self.lsb - size_log
+
+        sets = 1 << size_log
+        self.valid = [
+            RegArray(Bits(1), sets, initializer=[0] * sets) for _ in range(ways)
+        ]
+        self.tag = [RegArray(Bits(self.tag_bits), sets) for _ in range(ways)]
+        self.target = [RegArray(Bits(32), sets) for _ in range(ways)]
+        self.is_cond = [RegArray(Bits(1), sets) for _ in range(ways)]
+        self.ras_op = [RegArray(Bits(3), sets) for _ in range(ways)]
+        self.is_rvc = [RegArray(Bits(1), sets) for _ in range(ways)] if rvc else None
+        # 组内轮转替换指针
+        self.victim = RegArray(Bits(self.way_bits), sets, initializer=[0] * sets)
+
+        # 解析时该分支是否已在 BTB 中
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def index(self, pc):
+        return pc[self.lsb : self.lsb + self.size_log - 1]
+
+    def tag_of(self, pc):
+        return pc[self.lsb + self.size_log : 31]
+
+    def _match(self, pc):
+        idx = self.index(pc)
+        tag = self.tag_of(pc)
+        return [
+            self.valid[w][idx] & (self.tag[w][idx] == tag) for w in range(self.ways)
+        ]
+
+    def lookup(self, pc):
+        idx = self.index(pc)
+        way_hits = self._match(pc)
+
+        hit = Bits(1)(0)
+        target = Bits(32)(0)
+        is_cond = Bits(1)(0)
+        ras_op = RasOp.NONE
+        is_rvc = Bits(1)(0)
+        for w, way_hit in enumerate(way_hits):
+            hit = hit | way_hit
+            target = way_hit.select(self.target[w][idx], target)
+            is_cond = way_hit.select(self.is_cond[w][idx], is_cond)
+            ras_op = way_hit.select(self.ras_op[w][idx], ras_op)
+            if self.is_rvc is not None:
+                is_rvc = way_hit.select(self.is_rvc[w][idx], is_rvc)
+
+        return hit, target, is_cond, ras_op, is_rvc
+
+    def update(self, pc, target, is_cond, ras_op, is_rvc):
+        idx = self.index(pc)
+        tag = self.tag_of(pc)
+        way_hits = self._match(pc)
+
+        hit = Bits(1)(0)
+        for way_hit in way_hits:
+            hit = hit | way_hit
+
+        victim = self.victim[idx]
+        for w, way_hit in enumerate(way_hits):
+            is_victim = ~hit & (victim == Bits(self.way_bits)(w))
+            with Condition(way_hit | is_victim):
+                self.valid[w][idx] = Bits(1)(1)
+                self.tag[w][idx] = tag
+                self.target[w][idx] = target
+                self.is_cond[w][idx] = is_cond
+                self.ras_op[w][idx] = ras_op
+                if self.is_rvc is not None:
+                    self.is_rvc[w][idx] = is_rvc
+
+        with Condition(hit):
+            self.hit_cnt[0] = self.hit_cnt[0] + UInt(32)(1)
+        with Condition(~hit):
+            self.miss_cnt[0] = self.miss_cnt[0] + UInt(32)(1)
+            if self.ways > 1:
+                self.victim[idx] = victim + Bits(self.way_bits)(1)
+
+        log(
+            "BTB: Update PC=0x{:x} Target=0x{:x} Cond={} Hit={}",
+            pc,
+            target,
+            is_cond == Bits(1)(1),
+            hit == Bits(1)(1),
+        )
+
+
+class ReturnAddressStack:
+    """
+    返回地址栈 (RAS)，循环缓冲实现，深度可配置 (2 的幂)。
+
+    *   推测侧 (spec)：IF 级根据 BTB 表项中的 RasOp 在取指时压栈 (pc + 4) / 弹栈，
+        栈内容只由推测侧写入。
+    *   提交侧 (commit)：EX 解析出的 PUSH/POP 经 bp_update_reg 回传，只维护栈指针与计数。
+    *   修复：EX 写 branch_target_reg 冲刷流水线时，推测侧指针/计数恢复为提交侧的值。
+    *   溢出：栈满时压栈覆盖最旧的表项 (计数饱和)；空栈时弹栈不做预测。
+    """
+
+    def __init__(self, depth=8):
+        assert depth >= 2 and depth & (depth - 1) == 0, "RAS depth must be 2^k"
+        self.depth = depth
+        self.ptr_bits = depth.bit_length() - 1
+        self.cnt_bits = depth.bit_length()
+
+        self.stack = RegArray(Bits(32), depth)
+        # ptr 指向下一个空位，栈顶为 ptr - 1
+        self.spec_ptr = RegArray(Bits(self.ptr_bits), 1, initializer=[0])
+        self.spec_cnt = RegArray(Bits(self.cnt_bits), 1, initializer=[0])
+        self.commit_ptr = RegArray(Bits(self.ptr_bits), 1, initializer=[0])
+        self.commit_cnt = RegArray(Bits(self.cnt_bits), 1, initializer=[0])
+
+        # 返回预测正确/错误次数，以及溢出 (覆盖最旧表项) 次数
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.overflow_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def _step(self, ptr, cnt, op):
+        is_push = op == RasOp.PUSH
+        is_pop = (op == RasOp.POP) & (cnt != Bits(self.cnt_bits)(0))
+        is_full = cnt == Bits(self.cnt_bits)(self.depth)
+
+        one_p = Bits(self.ptr_bits)(1)
+        one_c = Bits(self.cnt_bits)(1)
+        next_ptr = is_push.select(ptr + one_p, is_pop.select(ptr - one_p, ptr))
+        next_cnt = is_push.select(
+            is_full.select(cnt, cnt + one_c), is_pop.select(cnt - one_c, cnt)
+        )
+        return next_ptr, next_cnt
+
+    def commit(self, op, mispredicted):
+        """提交侧：返回更新后的 (ptr, cnt)，供同周期修复推测侧使用。"""
+        ptr, cnt = self._step(self.commit_ptr[0], self.commit_cnt[0], op)
+        self.commit_ptr[0] = ptr
+        self.commit_cnt[0] = cnt
+
+        is_pop = op == RasOp.POP
+        with Condition(is_pop & ~mispredicted):
+            self.hit_cnt[0] = self.hit_cnt[0] + UInt(32)(1)
+        with Condition(is_pop & mispredicted):
+            self.miss_cnt[0] = self.miss_cnt[0] + UInt(32)(1)
+
+        return ptr, cnt
+
+    def top(self, ptr, cnt):
+        """返回 (栈顶地址, 栈非空)。"""
+        return self.stack[ptr - Bits(self.ptr_bits)(1)], cnt != Bits(self.cnt_bits)(0)
+
+    def speculate(self, ptr, cnt, op, link_pc, fix_op=None, fix_link=None):
+        """推测侧：以 (ptr, cnt) 为基准执行一次 op，压栈时写入 link_pc。
+
+        fix_op/fix_link 为 ID 级重定向时补做的那条跳转的栈操作，先于 op 生效。
+        栈存储只有一个写口：两者同时压栈时保留 op 的链接地址，fix 表项作废。
+        """
+        full = Bits(self.cnt_bits)(self.depth)
+        is_push = op == RasOp.PUSH
+        write_en = is_push
+        write_data = link_pc
+        overflow = Bits(1)(0)
+
+        if fix_op is not None:
+            fix_push = fix_op == RasOp.PUSH
+            overflow = fix_push & (cnt == full)
+            ptr, cnt = self._step(ptr, cnt, fix_op)
+            write_en = is_push | fix_push
+            write_data = is_push.select(link_pc, fix_link)
+            # 仅 fix 压栈时，写入位置是压栈前的指针
+            fix_only = fix_push & ~is_push
+            write_ptr = fix_only.select(ptr - Bits(self.ptr_bits)(1), ptr)
+        else:
+            write_ptr = ptr
+
+        with Condition(write_en):
+            self.stack[write_ptr] = write_data
+        with Condition(overflow | (is_push & (cnt == full))):
+            self.overflow_cnt[0] = self.overflow_cnt[0] + UInt(32)(1)
+
+        next_ptr, next_cnt = self._step(ptr, cnt, op)
+        self.spec_ptr[0] = next_ptr
+        self.spec_cnt[0] = next_cnt
+
+
+class FetchQueue:
+    """
+    取指队列 (Fetch Queue)：缓存 (pc, next_pc, inst)，把取指与译码解耦。
+
+    *   入队：上一周期发起的取指，其指令字本周期出现在 SRAM dout 上，由 FetcherImpl
+        拆成至多 width 个表项写入队尾 (队列为空时第一个表项直接旁路到出口)。
+    *   出队：Decoder 本周期译码的是上一周期发出的队头，无 Stall 即出队；Stall 时队头保持，
+        下一周期重新发出。
+    *   dout：与 SRAM 的 dout 相同的约定 —— 本周期写入发往 Decoder 的指令字，
+        Decoder 下一周期读取。队列为空时发出 NOP (addi x0, x0, 0)。
+    *   冲刷：重定向的周期清空队列，并丢弃本周期到达的错误路径指令。
+
+    存储按 width 路交织 (第 i 个表项在 bank i % width)，同一周期入队的相邻表项
+    落在不同 bank，每个 bank 每周期至多一次写入。
+
+    lookahead=True 时额外发出队头之后的那一条 (dout2 / next_pc2 / issued2)，
+    组成两条指令的译码窗口 (宏操作融合 / 双发射)；译码级融合或双发射时 advance 的 fuse 为 1，
+    一次出队两条。
+    """
+
+    NOP = 0x00000013
+
+    def __init__(self, depth=4, width=1, lookahead=False):
+        assert depth & (depth - 1) == 0, "Fetch queue depth must be a power of two"
+        assert width in (1, 2), "Fetch width must be 1 or 2"
+        assert depth >= 2 * width, "Fetch queue must hold at least two fetch packets"
+        self.depth = depth
+        self.width = width
+        self.lookahead = lookahead
+        self.ptr_bits = depth.bit_length() - 1
+        self.cnt_bits = depth.bit_length()
+        self.row_bits = self.ptr_bits - (width.bit_length() - 1)
+        self.bank_bits = max(width.bit_length() - 1, 1)
+
+        rows = depth // width
+        self.pc = [RegArray(Bits(32), rows) for _ in range(width)]
+        self.next_pc = [RegArray(Bits(32), rows) for _ in range(width)]
+        self.inst = [RegArray(Bits(32), rows) for _ in range(width)]
+        self.head = RegArray(Bits(self.ptr_bits), 1, initializer=[0])
+        self.tail = RegArray(Bits(self.ptr_bits), 1, initializer=[0])
+        self.count = RegArray(Bits(self.cnt_bits), 1, initializer=[0])
+
+        # 上一周期是否发起了取指 (本周期 SRAM dout 有效)、预测的下一条地址，
+        # 以及该次取指是否取回两条指令 (仅 width=2)
+        self.inflight = RegArray(Bits(1), 1, initializer=[0])
+        self.inflight_next = RegArray(Bits(32), 1, initializer=[0])
+        self.inflight_two = RegArray(Bits(1), 1, initializer=[0])
+        # 上一周期是否向 Decoder 发出了队列中的指令 (而非 NOP)
+        self.issued = RegArray(Bits(1), 1, initializer=[0])
+        self.dout = RegArray(Bits(32), 1, initializer=[self.NOP])
+        if lookahead:
+            self.issued2 = RegArray(Bits(1), 1, initializer=[0])
+            self.next_pc2 = RegArray(Bits(32), 1, initializer=[0])
+            self.dout2 = RegArray(Bits(32), 1, initializer=[self.NOP])
+
+        # 队列满导致取指暂停的周期数 / 队列空导致译码空转的周期数
+        self.full_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.empty_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.full_cnt, self.empty_cnt]
+
+    def _bank(self, ptr):
+        if self.width == 1:
+            return Bits(1)(0), ptr
+        return ptr[0:0], ptr[1 : self.ptr_bits - 1]
+
+    def _read(self, arrays, ptr):
+        bank, row = self._bank(ptr)
+        value = arrays[0][row]
+        for b in range(1, self.width):
+            value = (bank == Bits(self.bank_bits)(b)).select(arrays[b][row], value)
+        return value
+
+    def advance(self, flush, stall_if, entries, fuse=Bits(1)(0)):
+        """
+        完成本周期的出队与入队，返回 (can_fetch, out_valid, out_pc, out_next_pc)。
+
+        entries 为本周期到达的表项列表 [(valid, pc, next_pc, inst), ...]，按程序顺序排列，
+        有效位须连续。can_fetch 表示下一周期到达的一整个取指包一定有空位。
+        fuse 为 1 时译码级把队头与下一条融合 (或同时发出)，两条一起出队。
+        """
+        one_p = Bits(self.ptr_bits)(1)
+        one_c = Bits(self.cnt_bits)(1)
+        head = self.head[0]
+        tail = self.tail[0]
+        count = self.count[0]
+
+        consume = self.issued[0] & ~stall_if
+        pop2 = consume & fuse
+        head = consume.select(head + pop2.select(one_p + one_p, one_p), head)
+        count = consume.select(count - pop2.select(one_c + one_c, one_c), count)
+
+        # 入队：第 k 个表项写入 tail + k
+        ptr = tail
+        count_in = count
+        writes = []
+        for valid, pc, next_pc, inst in entries:
+            valid = valid & ~flush
+            writes.append((ptr, valid, pc, next_pc, inst))
+            ptr = valid.select(ptr + one_p, ptr)
+            count_in = valid.select(count_in + one_c, count_in)
+
+        for b in range(self.width):
+            # 每个 bank 只接收一个表项 (相邻表项落在不同 bank)
+            w_valid, w_row = Bits(1)(0), Bits(self.row_bits)(0)
+            w_pc, w_next, w_inst = Bits(32)(0), Bits(32)(0), Bits(32)(0)
+            for w_ptr, valid, pc, next_pc, inst in writes:
+                bank, row = self._bank(w_ptr)
+                hit = valid & (bank == Bits(self.bank_bits)(b))
+                w_valid = w_valid | hit
+                w_row = hit.select(row, w_row)
+                w_pc = hit.select(pc, w_pc)
+                w_next = hit.select(next_pc, w_next)
+                w_inst = hit.select(inst, w_inst)
+            with Condition(w_valid):
+                self.pc[b][w_row] = w_pc
+                self.next_pc[b][w_row] = w_next
+                self.inst[b][w_row] = w_inst
+
+        # 出口：队列 (出队后) 为空时旁路本周期的第一个表项
+        first_valid, first_pc, first_next, first_inst = entries[0]
+        bypass = count == Bits(self.cnt_bits)(0)
+        out_valid = ~flush & (~bypass | first_valid)
+        out_pc = bypass.select(first_pc, self._read(self.pc, head))
+        out_next_pc = bypass.select(first_next, self._read(self.next_pc, head))
+        out_inst = bypass.select(first_inst, self._read(self.inst, head))
+
+        self.head[0] = flush.select(Bits(self.ptr_bits)(0), head)
+        self.tail[0] = flush.select(Bits(self.ptr_bits)(0), ptr)
+        self.count[0] = flush.select(Bits(self.cnt_bits)(0), count_in)
+        self.issued[0] = out_valid
+        self.dout[0] = out_valid.select(out_inst, Bits(32)(self.NOP))
+
+        if self.lookahead:
+            # 队头之后的那一条：仍在存储中，或是本周期到达 (同时写入队列) 的表项
+            stored = ~(count < Bits(self.cnt_bits)(2))
+            arrive1 = count == Bits(self.cnt_bits)(1)
+            second_valid = stored | (arrive1 & first_valid)
+            second_next = stored.select(
+                self._read(self.next_pc, head + one_p), first_next
+            )
+            second_inst = stored.select(self._read(self.inst, head + one_p), first_inst)
+            if self.width == 2:
+                second_valid_b, _, second_next_b, second_inst_b = entries[1]
+                second_valid = second_valid | (bypass & second_valid_b)
+                second_next = bypass.select(second_next_b, second_next)
+                second_inst = bypass.select(second_inst_b, second_inst)
+            second_valid = ~flush & second_valid
+            self.issued2[0] = second_valid
+            self.next_pc2[0] = second_next
+            self.dout2[0] = second_valid.select(second_inst, Bits(32)(self.NOP))
+
+        room = count_in <= Bits(self.cnt_bits)(self.depth - self.width)
+        can_fetch = flush | room
+        with Condition(~can_fetch):
+            self.full_cnt[0] = self.full_cnt[0] + UInt(32)(1)
+        with Condition(~out_valid):
+            self.empty_cnt[0] = self.empty_cnt[0] + UInt(32)(1)
+
+        return can_fetch, out_valid, out_pc, out_next_pc
+
+    def issue(self, fetch_en, next_pc, two=Bits(1)(0)):
+        """记录本周期发起的取指，其指令字下一周期到达。"""
+        self.inflight[0] = fetch_en
+        self.inflight_next[0] = next_pc
+        self.inflight_two[0] = two
+
+
 class FetcherImpl(Downstream):
 
     def __init__(self):
@@ -33,31 +645,252 @@ class FetcherImpl(Downstream):
         # --- 资源引用 ---
         pc_reg: Array,  # 引用 Fetcher 的 PC
         last_pc_reg: Array,  # 引用 Fetcher 的 Last PC
-        icache: SRAM,  # 引用 ICache
+        icache: SRAM,  # 引用 ICache (平坦 SRAM，或带回填状态机的 ICache)
         decoder: Module,  # 下一级模块 (用于发送指令)
         # --- 反馈控制信号 (来自 DataHazardUnit/ControlHazardUnit) ---
         stall_if: Bits(1),  # 暂停取指 (保持当前 PC)
         branch_target: Array,  # 不为0时，根据目标地址冲刷流水线
+        # --- 分支预测 (可选) ---
+        predictor=None,  # 方向预测器 (见 make_direction_predictor)
+        bp_update: Array = None,  # EX 写入的训练通道 (bp_update_signals)
+        btb: BranchTargetBuffer = None,  # 分支目标缓冲
+        ras: ReturnAddressStack = None,  # 返回地址栈 (需要 BTB 提供表项类型、bp_update 提交)
+        # --- ID 级重定向 (可选) ---
+        id_redirect: Array = None,  # DecoderImpl 写入的重定向通道 (id_redirect_signals)
+        # --- 取指队列 (可选，None 时为刚性流水线) ---
+        fetch_queue: FetchQueue = None,
+        # --- 循环缓冲 (可选，仅刚性流水线) ---
+        loop_buffer=None,
+        # --- 宏操作融合 (可选，需要带 lookahead 的取指队列) ---
+        fusion=None,
+        # --- 双发射 (可选，需要带 lookahead 的取指队列) ---
+        dual=None,
+        # --- RV32C 压缩指令 (可选，指令存储为 64 位窗口，仅单路取指) ---
+        rvc=False,
     ):
-        # 读取当前 PC
-        current_pc = stall_if.select(last_pc_reg[0], pc_reg[0])
+        if ras is not None:
+            # 推测侧的栈操作来自 BTB 表项，提交侧跟随 bp_update 中 EX 的解析结果
+            assert btb is not None and bp_update is not None, "RAS requires the BTB and bp_update"
 
         flush_if = branch_target[0] != Bits(32)(0)
         target_pc = branch_target[0]
+
+        # ID 级重定向：优先级低于 EX 级冲刷 (同周期 EX 冲刷时，ID 的那条跳转本身在错误路径上)
+        id_flush = Bits(1)(0)
+        if id_redirect is not None:
+            id_req = id_redirect_signals.view(id_redirect[0])
+            id_flush = id_req.valid & ~flush_if
+        redirect = flush_if | id_flush
+
+        # 取指宽度：两路取指时指令存储为 64 位宽，每次取回一对对齐的指令
+        width = 1 if fetch_queue is None else fetch_queue.width
+        # 压缩指令模式下指令存储为 64 位窗口 (见 rvc.py)
+        word_bits = 64 if rvc else 32 * width
+
+        # 压缩指令：取指时还不知道指令长度，顺序预测按 4 字节推进 (pc_reg = pc + 4)；
+        # 上一次取回的指令本周期才出现在 dout 上，是压缩指令时把顺序地址改为 pc + 2。
+        # Decoder 对 next_pc 做同样的修正，EX 校验的仍是一致的预测
+        fetch_pc = pc_reg[0]
+        if rvc:
+            assert width == 1, "Compressed instructions require single-wide fetch"
+            prev_pc = last_pc_reg[0]
+            prev_inst = align_parcel(icache.dout[0].bitcast(Bits(64)), prev_pc)
+            seq_fix = is_compressed(prev_inst) & (
+                pc_reg[0] == prev_pc + UInt(32)(4)
+            )
+            if fetch_queue is not None:
+                # 解耦模式：上一周期没有发起取指时 dout 无意义
+                seq_fix = seq_fix & fetch_queue.inflight[0]
+            fetch_pc = seq_fix.select(prev_pc + UInt(32)(2), fetch_pc)
+
+        # 读取当前 PC
+        if fetch_queue is None:
+            # 刚性流水线：Stall 时重新取 ID 级那条指令
+            current_pc = stall_if.select(last_pc_reg[0], fetch_pc)
+            hold = stall_if
+        else:
+            # 解耦模式：Stall 由队列保持队头，取指只在队列满时暂停
+            in_valid = fetch_queue.inflight[0]
+            in_pc = last_pc_reg[0]
+            in_next = fetch_queue.inflight_next[0]
+            if width == 1 and rvc:
+                # 入队的是按 pc 对齐后的 32 位 (压缩指令由 Decoder 展开)
+                in_inst = align_parcel(icache.dout[0].bitcast(Bits(64)), in_pc)
+                in_next = seq_fix.select(fetch_pc, in_next)
+                entries = [(in_valid, in_pc, in_next, in_inst)]
+            elif width == 1:
+                entries = [(in_valid, in_pc, in_next, icache.dout[0].bitcast(Bits(32)))]
+            else:
+                # 指令对：低 32 位为 8 字节对齐地址处的指令 (slot 0)，高 32 位为 slot 1；
+                # 奇对齐 PC 只取回 slot 1
+                pair = icache.dout[0].bitcast(Bits(64))
+                lo, hi = pair[0:31], pair[32:63]
+                in_odd = in_pc[2:2]
+                in_two = fetch_queue.inflight_two[0]
+                in_pc1 = in_pc + UInt(32)(4)
+                entries = [
+                    (
+                        in_valid,
+                        in_pc,
+                        in_two.select(in_pc1, in_next),
+                        in_odd.select(hi, lo),
+                    ),
+                    (in_valid & in_two, in_pc1, in_next, hi),
+                ]
+            # 融合或双发射时队头与下一条一起出队
+            pop2 = Bits(1)(0)
+            if fusion is not None:
+                pop2 = fusion.fuse
+            if dual is not None:
+                pop2 = dual.pair
+            can_fetch, _, fq_pc, fq_next_pc = fetch_queue.advance(
+                redirect, stall_if, entries, pop2
+            )
+            if fusion is not None:
+                # 融合的操作本周期进入 EX (未被 Stall / 冲刷)，计一次
+                fusion.count(~stall_if & ~redirect)
+            current_pc = fetch_pc
+            hold = ~can_fetch
+
+        if id_redirect is not None:
+            current_pc = id_flush.select(id_req.target, current_pc)
         final_current_pc = flush_if.select(target_pc, current_pc)
+        # 暂停时重新取的地址已在首次取指时完成预测与推测状态更新
+        stalled = hold & ~redirect
 
         # --- 1. 驱动 SRAM (组合逻辑输出) ---
         # 决定是否给 SRAM 喂地址以及喂什么地址
         # 如果 Flush，为了让下一拍 ID 能拿到新指令，必须立刻喂 Target
         # 如果 Stall，必须输入上一周期地址以稳住输出
         # 如果 Normal，喂 Current 读取当前指令
-        sram_addr = (final_current_pc) >> UInt(32)(2)
+        if width == 1:
+            sram_addr = (final_current_pc) >> UInt(32)(2)
+        else:
+            sram_addr = (final_current_pc) >> UInt(32)(3)
         log("IF: SRAM Addr=0x{:x}", sram_addr)
-        icache.build(we=Bits(1)(0), re=Bits(1)(1), addr=sram_addr, wdata=Bits(32)(0))
+
+        # 循环缓冲命中：下一周期 Decoder 直接回放缓存的译码结果，不读指令存储器
+        lb_replay = Bits(1)(0)
+        if loop_buffer is not None:
+            assert fetch_queue is None, "Loop buffer requires the rigid pipeline"
+            lb_replay = loop_buffer.hit(final_current_pc)
+
+        icache_ready = icache.build(
+            we=Bits(1)(0),
+            re=~lb_replay,
+            addr=sram_addr,
+            wdata=Bits(word_bits)(0),
+        )
+
+        # ICache 缺失：本周期的取指作废 (dout 为 NOP)，下一周期重取同一地址，
+        # 且不做推测更新
+        icache_miss = Bits(1)(0)
+        if isinstance(icache, ICache):
+            icache_miss = ~icache_ready & ~lb_replay
+        no_fetch = stalled | icache_miss
+
+        if loop_buffer is not None:
+            loop_buffer.replay[0] = lb_replay
+            loop_buffer.fetched[0] = ~icache_miss
+
+        # --- 1.5 分支预测训练 ---
+        # 用上一周期 EX 解析的结果更新方向预测表 (仅条件分支) 与 BTB
+        if bp_update is not None:
+            update = bp_update_signals.view(bp_update[0])
+            if predictor is not None:
+                predictor.train(
+                    update.valid & update.is_cond,
+                    update.pc,
+                    update.taken,
+                    update.target,
+                    redirect,
+                )
+                if id_redirect is not None:
+                    predictor.replay(id_flush & id_req.is_cond, id_req.taken)
+            if btb is not None:
+                with Condition(update.valid):
+                    btb.update(
+                        update.pc,
+                        update.target,
+                        update.is_cond,
+                        update.ras_op,
+                        update.is_rvc,
+                    )
 
         # --- 2. 计算 Next PC (时序逻辑输入) ---
-        # 默认：PC + 4
-        final_next_pc = final_current_pc + UInt(32)(4)
+        # pred_pc：决定下一次取指地址的那条指令。
+        # 两路取指时，slot 0 命中 BTB (可能跳转) 则取指包只含 slot 0，否则含两条指令，
+        # 由 slot 1 的预测决定下一次取指；奇对齐 PC 只有 slot 1
+        pred_pc = final_current_pc
+        two = Bits(1)(0)
+        if width == 2:
+            aligned = final_current_pc[2:2] == Bits(1)(0)
+            slot0_branch = Bits(1)(0)
+            if btb is not None:
+                slot0_branch, _, _, _, _ = btb.lookup(final_current_pc)
+            two = aligned & ~slot0_branch
+            pred_pc = two.select(final_current_pc + UInt(32)(4), final_current_pc)
+
+        # 默认：顺序执行下一条
+        seq_pc = pred_pc + UInt(32)(4)
+        final_next_pc = seq_pc
+
+        # BTB 命中时同周期重定向：无条件跳转总是跳，条件分支由方向预测表决定
+        if btb is not None:
+            btb_hit, btb_target, btb_is_cond, btb_ras_op, btb_is_rvc = btb.lookup(
+                pred_pc
+            )
+            dir_taken = Bits(1)(0)
+            if predictor is not None:
+                dir_taken = predictor.predict(pred_pc, btb_target)
+                predictor.speculate(btb_hit & btb_is_cond & ~no_fetch, dir_taken)
+            pred_taken = btb_hit & (~btb_is_cond | dir_taken)
+            final_next_pc = pred_taken.select(btb_target, seq_pc)
+
+            # 返回地址栈：提交侧跟随 EX 结果，冲刷时推测侧恢复为提交侧
+            if ras is not None:
+                commit_op = update.valid.select(update.ras_op, RasOp.NONE)
+                commit_ptr, commit_cnt = ras.commit(commit_op, flush_if)
+                base_ptr = redirect.select(commit_ptr, ras.spec_ptr[0])
+                base_cnt = redirect.select(commit_cnt, ras.spec_cnt[0])
+
+                # ID 级重定向时，提交侧恰好包含跳转之前的所有指令，补做跳转本身的栈操作
+                fix_op, fix_link = None, None
+                top_ptr, top_cnt = base_ptr, base_cnt
+                if id_redirect is not None:
+                    fix_op = id_flush.select(id_req.ras_op, RasOp.NONE)
+                    fix_link = id_req.link
+                    top_ptr, top_cnt = ras._step(base_ptr, base_cnt, fix_op)
+
+                ras_top, ras_valid = ras.top(top_ptr, top_cnt)
+                if fix_op is not None:
+                    # 补做的压栈本周期才写入栈存储，直接旁路链接地址
+                    ras_top = (fix_op == RasOp.PUSH).select(fix_link, ras_top)
+                pred_ret = btb_hit & (btb_ras_op == RasOp.POP) & ras_valid
+                final_next_pc = pred_ret.select(ras_top, final_next_pc)
+
+                # 压栈的链接地址按跳转指令的长度计算 (压缩调用为 pc + 2)
+                spec_op = (btb_hit & ~no_fetch).select(btb_ras_op, RasOp.NONE)
+                link_pc = pred_pc + btb_is_rvc.select(UInt(32)(2), UInt(32)(4))
+                ras.speculate(base_ptr, base_cnt, spec_op, link_pc, fix_op, fix_link)
+
+            log(
+                "IF: BTB Lookup PC=0x{:x} Hit={} Taken={} Target=0x{:x}",
+                pred_pc,
+                btb_hit == Bits(1)(1),
+                pred_taken == Bits(1)(1),
+                btb_target,
+            )
+
+        if fetch_queue is None:
+            # Stall 时沿用首次取指时的预测结果 (已在 pc_reg 中)
+            final_next_pc = stalled.select(pc_reg[0], final_next_pc)
+        else:
+            # 队列满时本周期的取指作废，下一周期重取同一地址
+            final_next_pc = stalled.select(final_current_pc, final_next_pc)
+        final_next_pc = icache_miss.select(final_current_pc, final_next_pc)
+        if fetch_queue is not None:
+            fetch_queue.issue(~no_fetch, final_next_pc, two)
 
         # 更新 PC 寄存器
         pc_reg[0] <= final_next_pc
@@ -66,12 +899,17 @@ class FetcherImpl(Downstream):
         # --- 3. 驱动下游 Decoder (流控) ---
         # 记录日志
         log(
-            "IF: PC=0x{:x} Stall={} Flush={}",
+            "IF: PC=0x{:x} Stall={} Flush={} IdRedirect={}",
             final_next_pc,
             stall_if == Bits(1)(1),
             flush_if == Bits(1)(1),
+            id_flush == Bits(1)(1),
         )
 
-        # 发送到下一级，只传递 PC 值
-        call = decoder.async_called(pc=final_current_pc)
-        call.bind.set_fifo_depth(pc=1)
+        # 发送到下一级：PC 与预测的下一条地址 (供 EX 校验预测结果)
+        if fetch_queue is None:
+            call = decoder.async_called(pc=final_current_pc, next_pc=final_next_pc)
+        else:
+            # 指令字经 fetch_queue.dout 送达；队列为空时是 NOP，pc/next_pc 无意义
+            call = decoder.async_called(pc=fq_pc, next_pc=fq_next_pc)
+        call.bind.set_fifo_depth(pc=1, next_pc=1)
@@ -0,0 +1,409 @@
+from assassyn.frontend import *
+from .control_signals import *
+
+
+class ICacheState:
+    IDLE = Bits(4)(0b0001)  # 空闲，可以响应查询
+    WAIT = Bits(4)(0b0010)  # 缺失，等待后备存储器的首字延迟
+    FILL = Bits(4)(0b0100)  # 逐字读取后备存储器并写回缓存行
+    PROMOTE = Bits(4)(0b1000)  # 把预取缓冲中命中的行搬入缓存 (不阻塞查询)
+
+
+class StreamPrefetcher:
+    """
+    流式指令预取器 (Next-Line / N-Line Stream)，挂在 ICache 与后备存储器之间。
+
+    *   触发：取指访问到新的一行 L 时，把预取流重置为 L+1 .. L+degree (degree=1 即 Next-Line)。
+    *   发起：ICache 不在回填且本周期没有需求缺失时，按顺序检查流中的下一行；已在缓存或
+        预取缓冲中则跳过，否则占用后备存储器端口把该行读入预取缓冲 (轮转替换)。
+        需求访问正好落在正在预取的行上时等待预取完成，不另发回填。
+    *   隔离：预取的行只进入预取缓冲，不污染缓存；需求访问命中预取缓冲时才由 ICache
+        搬入缓存 (PROMOTE)，并计为一次有效预取。
+    *   让路：需求缺失时立即放弃正在进行的预取，端口让给回填。
+
+    统计：issue_cnt (发起的预取行数)、useful_cnt (被需求访问用到的预取行数)。
+    准确率 = useful / issue，覆盖率 = useful / (useful + ICache miss)。
+    """
+
+    def __init__(self, cache, degree=1, entries=2):
+        assert entries >= 2 and entries & (entries - 1) == 0, (
+            "Prefetch buffer entries must be a power of two (at least 2)"
+        )
+        assert 1 <= degree < 256, "Prefetch degree must be in [1, 255]"
+        self.cache = cache
+        self.degree = degree
+        self.entries = entries
+        self.slot_bits = entries.bit_length() - 1
+        self.line_bits = cache.tag_bits + cache.set_bits
+        off_bits = cache.off_bits
+
+        self.valid = [RegArray(Bits(1), 1, initializer=[0]) for _ in range(entries)]
+        self.line = [RegArray(Bits(self.line_bits), 1) for _ in range(entries)]
+        self.data = RegArray(Bits(cache.width), entries << off_bits)
+        self.victim = RegArray(Bits(self.slot_bits), 1, initializer=[0])
+
+        # 预取引擎 (与 ICache 回填相同的 IDLE / WAIT / FILL 流程)
+        self.state = RegArray(Bits(4), 1, initializer=[0b0001])
+        self.wait_cnt = RegArray(Bits(16), 1, initializer=[0])
+        self.fill_cnt = RegArray(Bits(off_bits + 1), 1, initializer=[0])
+        self.cur_line = RegArray(Bits(self.line_bits), 1)
+        self.cur_slot = RegArray(Bits(self.slot_bits), 1, initializer=[0])
+
+        # 预取流：下一条候选行与剩余行数，以及最近一次访问的行
+        self.stream_next = RegArray(Bits(self.line_bits), 1)
+        self.stream_left = RegArray(Bits(8), 1, initializer=[0])
+        # 初值取全 1，保证第一次访问 (通常是第 0 行) 也能触发预取流
+        self.last_line = RegArray(
+            Bits(self.line_bits), 1, initializer=[(1 << self.line_bits) - 1]
+        )
+
+        self.issue_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.useful_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+    def stats(self):
+        return [self.issue_cnt, self.useful_cnt]
+
+    def _index(self, slot, offset):
+        return concat(slot, offset)
+
+    def lookup(self, line, offset):
+        """返回 (hit, data, slot)：预取缓冲中已完整到达的行。"""
+        hit = Bits(1)(0)
+        slot = Bits(self.slot_bits)(0)
+        for e in range(self.entries):
+            match = self.valid[e][0] & (self.line[e][0] == line)
+            hit = hit | match
+            slot = match.select(Bits(self.slot_bits)(e), slot)
+        return hit, self.data[self._index(slot, offset)], slot
+
+    def read(self, slot, offset):
+        return self.data[self._index(slot, offset)]
+
+    def pending(self, line):
+        """该行正在被预取 (尚未到齐)：需求访问等它完成，而不是另发一次回填。"""
+        return (self.state[0] != ICacheState.IDLE) & (self.cur_line[0] == line)
+
+    def step(self, access, line, demand_miss, port_free, busy, busy_slot, release):
+        """
+        推进预取流与预取引擎，返回后备存储器请求 (re, 行地址, 行内字偏移)。
+
+        access：本周期有需求访问 (用于触发预取流)；demand_miss：本周期发生需求缺失
+        (放弃预取)；port_free：ICache 本周期及之后不占用后备存储器端口；
+        busy：ICache 正在搬移 busy_slot，该表项不能被替换；release：搬移完成，该表项作废。
+        """
+        cache = self.cache
+        off_bits = cache.off_bits
+        one_l = Bits(self.line_bits)(1)
+
+        state = self.state[0]
+        eng_idle = state == ICacheState.IDLE
+        in_wait = state == ICacheState.WAIT
+        in_fill = state == ICacheState.FILL
+
+        # --- 1. 预取流触发与推进 ---
+        trigger = access & (line != self.last_line[0])
+        with Condition(access):
+            self.last_line[0] = line
+
+        cand = self.stream_next[0]
+        left = self.stream_left[0]
+        cand_in_cache, _, _ = cache.lookup(concat(cand, Bits(off_bits)(0)))
+        cand_in_buf, _, _ = self.lookup(cand, Bits(off_bits)(0))
+        slot = self.victim[0]
+        blocked = busy & (slot == busy_slot)
+        consider = ~trigger & eng_idle & port_free & ~blocked & (left != Bits(8)(0))
+        start = consider & ~cand_in_cache & ~cand_in_buf
+
+        self.stream_next[0] = trigger.select(
+            line + one_l, consider.select(cand + one_l, cand)
+        )
+        self.stream_left[0] = trigger.select(
+            Bits(8)(self.degree), consider.select(left - Bits(8)(1), left)
+        )
+
+        # --- 2. 预取引擎 ---
+        with Condition(start):
+            self.victim[0] = slot + Bits(self.slot_bits)(1)
+            self.cur_line[0] = cand
+            self.cur_slot[0] = slot
+            self.wait_cnt[0] = Bits(16)(cache.latency - 1)
+            self.issue_cnt[0] = self.issue_cnt[0] + UInt(32)(1)
+            log("Prefetch: Issue Line=0x{:x} Slot={}", cand, slot)
+
+        wait_done = in_wait & (self.wait_cnt[0] == Bits(16)(0))
+        with Condition(in_wait & ~wait_done):
+            self.wait_cnt[0] = self.wait_cnt[0] - Bits(16)(1)
+
+        fill_cnt = self.fill_cnt[0]
+        last = Bits(off_bits + 1)(cache.line_words)
+        cur_slot = self.cur_slot[0]
+        issue = in_fill & (fill_cnt != last) & ~demand_miss
+        arrive = in_fill & (fill_cnt != Bits(off_bits + 1)(0)) & ~demand_miss
+        prev_word = (fill_cnt - Bits(off_bits + 1)(1))[0 : off_bits - 1]
+        with Condition(arrive):
+            self.data[self._index(cur_slot, prev_word)] = cache.backing.dout[
+                0
+            ].bitcast(Bits(cache.width))
+        done = in_fill & (fill_cnt == last) & ~demand_miss
+
+        # 表项有效位：开始预取时作废，到齐后置位，被搬入缓存后作废
+        for e in range(self.entries):
+            is_e = Bits(self.slot_bits)(e)
+            take = start & (slot == is_e)
+            fin = done & (cur_slot == is_e)
+            free = release & (busy_slot == is_e)
+            with Condition(take | fin | free):
+                self.valid[e][0] = fin
+            with Condition(take):
+                self.line[e][0] = cand
+
+        zero = Bits(off_bits + 1)(0)
+        next_fill = done.select(zero, fill_cnt + Bits(off_bits + 1)(1))
+        self.fill_cnt[0] = (in_fill & ~demand_miss).select(next_fill, zero)
+
+        next_state = start.select(ICacheState.WAIT, state)
+        next_state = wait_done.select(ICacheState.FILL, next_state)
+        next_state = done.select(ICacheState.IDLE, next_state)
+        next_state = demand_miss.select(ICacheState.IDLE, next_state)
+        self.state[0] = next_state
+
+        return issue, self.cur_line[0], fill_cnt[0 : off_bits - 1]
+
+
+class ICache:
+    """
+    指令缓存 (ICache)：带标签的组相联缓存，位于较慢的后备存储器 (SRAM) 之前。
+
+    与 SRAM 的接口约定相同：调用者在本周期 build(we, re, addr, wdata) 给出字地址，
+    下一周期从 dout 读取指令字。不同之处在于 build 返回 ready：
+    *   ready = 1：命中，dout 下一周期有效。
+    *   ready = 0：缺失或正在回填，dout 下一周期为 NOP，调用者需保持地址重试。
+
+    缺失时由回填状态机处理 (阻塞式，回填期间所有查询都返回 ready = 0)：
+    IDLE --缺失--> WAIT (等待 latency 周期) --> FILL (每周期读一个字，共 line_words 个)
+    --> 写入标签与有效位 --> IDLE。
+    若开启预取 (prefetch_degree > 0)，缺失但命中预取缓冲时直接从缓冲返回 (ready = 1)，
+    并在后台把该行搬入缓存 (PROMOTE，搬移期间仍可响应查询)。
+
+    尺寸参数均以字节为单位取 log2：size_log 为总容量，line_log 为行大小。
+    addr_bits 为后备存储器的字地址位宽 (depth = 2^addr_bits)。
+    """
+
+    def __init__(
+        self,
+        backing: SRAM,
+        addr_bits,
+        size_log=10,
+        line_log=4,
+        ways=2,
+        latency=8,
+        width=32,
+        prefetch_degree=0,
+        prefetch_entries=2,
+    ):
+        word_log = (width // 8).bit_length() - 1
+        assert ways & (ways - 1) == 0, "ICache ways must be a power of two"
+        assert line_log > word_log, "ICache line must hold at least two words"
+        assert size_log - line_log - (ways.bit_length() - 1) >= 1, (
+            "ICache must have at least two sets"
+        )
+        assert latency >= 1, "Backing memory latency must be at least one cycle"
+
+        self.backing = backing
+        self.width = width
+        self.ways = ways
+        self.latency = latency
+        self.way_bits = max(ways.bit_length() - 1, 1)
+
+        # 字地址划分：| tag | set | offset |
+        self.off_bits = line_log - word_log
+        self.set_bits = size_log - line_log - (ways.bit_length() - 1)
+        self.tag_bits = addr_bits - self.set_bits - self.off_bits
+        self.addr_bits = addr_bits
+        self.line_words = 1 << self.off_bits
+
+        sets = 1 << self.set_bits
+        words = sets * self.line_words
+        self.valid = [
+            RegArray(Bits(1), sets, initializer=[0] * sets) for _ in range(ways)
+        ]
+        self.tag = [RegArray(Bits(self.tag_bits), sets) for _ in range(ways)]
+        self.data = [RegArray(Bits(width), words) for _ in range(ways)]
+        self.victim = RegArray(Bits(self.way_bits), sets, initializer=[0] * sets)
+
+        # 回填状态机
+        self.state = RegArray(Bits(4), 1, initializer=[0b0001])
+        self.wait_cnt = RegArray(Bits(16), 1, initializer=[0])
+        self.fill_cnt = RegArray(Bits(self.off_bits + 1), 1, initializer=[0])
+        self.miss_line = RegArray(Bits(self.tag_bits + self.set_bits), 1)
+        self.fill_way = RegArray(Bits(self.way_bits), 1, initializer=[0])
+
+        # 与 SRAM 相同的输出约定：本周期写入，下一周期读取
+        nop = 0x00000013 if width == 32 else 0x0000001300000013
+        self.nop = Bits(width)(nop)
+        self.dout = RegArray(Bits(width), 1, initializer=[nop])
+
+        self.hit_cnt = RegArray(UInt(32), 1, initializer=[0])
+        self.miss_cnt = RegArray(UInt(32), 1, initializer=[0])
+
+        self.prefetcher = None
+        if prefetch_degree:
+            self.prefetcher = StreamPrefetcher(self, prefetch_degree, prefetch_entries)
+            self.promote_slot = RegArray(Bits(self.prefetcher.slot_bits), 1)
+
+    def stats(self):
+        stats = [self.hit_cnt, self.miss_cnt]
+        if self.prefetcher is not None:
+            stats += self.prefetcher.stats()
+        return stats
+
+    def _widen(self, addr):
+        if self.addr_bits == 32:
+            return addr
+        return concat(Bits(32 - self.addr_bits)(0), addr)
+
+    def lookup(self, addr):
+        """返回 (hit, data, way_hits)：纯组合的标签比较，不改变状态。"""
+        set_idx = addr[self.off_bits : self.off_bits + self.set_bits - 1]
+        tag = addr[self.off_bits + self.set_bits : self.addr_bits - 1]
+        word_idx = addr[0 : self.off_bits + self.set_bits - 1]
+
+        hit = Bits(1)(0)
+        data = self.nop
+        way_hits = []
+        for w in range(self.ways):
+            way_hit = self.valid[w][set_idx] & (self.tag[w][set_idx] == tag)
+            hit = hit | way_hit
+            data = way_hit.select(self.data[w][word_idx], data)
+            way_hits.append(way_hit)
+        return hit, data, way_hits
+
+    def build(self, we, re, addr, wdata):
+        """查询并推进回填状态机；返回 ready (本次访问命中)。we/wdata 仅为与 SRAM 接口一致。"""
+        pf = self.prefetcher
+        state = self.state[0]
+        idle = state == ICacheState.IDLE
+        in_wait = state == ICacheState.WAIT
+        in_fill = state == ICacheState.FILL
+        in_promote = state == ICacheState.PROMOTE
+        serve = idle | in_promote
+
+        line_addr = addr[self.off_bits : self.addr_bits - 1]
+        set_idx = addr[self.off_bits : self.off_bits + self.set_bits - 1]
+        word_off = addr[0 : self.off_bits - 1]
+
+        hit, data, _ = self.lookup(addr)
+        pf_hit, pf_data, pf_slot = Bits(1)(0), self.nop, None
+        pf_pending = Bits(1)(0)
+        if pf is not None:
+            pf_hit, pf_data, pf_slot = pf.lookup(line_addr, word_off)
+            pf_pending = pf.pending(line_addr)
+
+        ready = re & serve & (hit | pf_hit)
+        miss = re & idle & ~hit & ~pf_hit & ~pf_pending
+        promote = re & idle & ~hit & pf_hit
+
+        self.dout[0] = ready.select(hit.select(data, pf_data), self.nop)
+        with Condition(re & serve & hit):
+            self.hit_cnt[0] = self.hit_cnt[0] + UInt(32)(1)
+
+        # --- IDLE：缺失 (或命中预取缓冲)，记录目标行与替换路 ---
+        victim = self.victim[set_idx]
+        with Condition(miss | promote):
+            self.miss_line[0] = line_addr
+            self.fill_way[0] = victim
+        with Condition(miss):
+            self.miss_cnt[0] = self.miss_cnt[0] + UInt(32)(1)
+            self.wait_cnt[0] = Bits(16)(self.latency - 1)
+            log("ICache: Miss Addr=0x{:x}", addr)
+        if pf is not None:
+            with Condition(promote):
+                self.promote_slot[0] = pf_slot
+                pf.useful_cnt[0] = pf.useful_cnt[0] + UInt(32)(1)
+                log("ICache: Prefetch Hit Addr=0x{:x}", addr)
+
+        # --- WAIT：模拟后备存储器的访问延迟 ---
+        wait_done = in_wait & (self.wait_cnt[0] == Bits(16)(0))
+        with Condition(in_wait & ~wait_done):
+            self.wait_cnt[0] = self.wait_cnt[0] - Bits(16)(1)
+
+        # --- FILL：第 k 拍读取第 k 个字，第 k+1 拍写入缓存 ---
+        # --- PROMOTE：第 k 拍把预取缓冲中的第 k 个字写入缓存 ---
+        fill_cnt = self.fill_cnt[0]
+        line = self.miss_line[0]
+        fill_set = line[0 : self.set_bits - 1]
+        fill_word = fill_cnt[0 : self.off_bits - 1]
+        last = Bits(self.off_bits + 1)(self.line_words)
+
+        issue = in_fill & (fill_cnt != last)
+        prev_word = (fill_cnt - Bits(self.off_bits + 1)(1))[0 : self.off_bits - 1]
+        arrive = in_fill & (fill_cnt != Bits(self.off_bits + 1)(0))
+        fill_data = self.backing.dout[0].bitcast(Bits(self.width))
+        write_word = prev_word
+        done = in_fill & (fill_cnt == last)
+        release = Bits(1)(0)
+        if pf is not None:
+            fill_data = in_promote.select(
+                pf.read(self.promote_slot[0], fill_word), fill_data
+            )
+            write_word = in_promote.select(fill_word, prev_word)
+            release = in_promote & (
+                fill_cnt == Bits(self.off_bits + 1)(self.line_words - 1)
+            )
+            done = done | release
+            arrive = arrive | in_promote
+
+        fill_way = self.fill_way[0]
+        for w in range(self.ways):
+            with Condition(arrive & (fill_way == Bits(self.way_bits)(w))):
+                self.data[w][concat(fill_set, write_word)] = fill_data
+
+        # 有效位：回填/搬移完成时置位；开始搬移时先作废被替换的行 (搬移期间仍响应查询)
+        fill_tag = line[self.set_bits : self.set_bits + self.tag_bits - 1]
+        for w in range(self.ways):
+            is_w = Bits(self.way_bits)(w)
+            finish_w = done & (fill_way == is_w)
+            evict_w = promote & (victim == is_w)
+            with Condition(finish_w | evict_w):
+                self.valid[w][evict_w.select(set_idx, fill_set)] = finish_w
+            with Condition(finish_w):
+                self.tag[w][fill_set] = fill_tag
+        with Condition(done):
+            if self.ways > 1:
+                # 组内轮转替换
+                self.victim[fill_set] = fill_way + Bits(self.way_bits)(1)
+            log("ICache: Refill Done Line=0x{:x}", line)
+
+        zero = Bits(self.off_bits + 1)(0)
+        next_fill = done.select(zero, fill_cnt + Bits(self.off_bits + 1)(1))
+        self.fill_cnt[0] = (in_fill | in_promote).select(next_fill, zero)
+
+        # --- 后备存储器端口：回填优先，空闲时让给预取器 ---
+        port_re = issue
+        port_addr = concat(line, fill_word)
+        if pf is not None:
+            pf_re, pf_line, pf_word = pf.step(
+                access=re & serve,
+                line=line_addr,
+                demand_miss=miss,
+                port_free=serve & ~miss & ~promote,
+                busy=in_promote,
+                busy_slot=self.promote_slot[0],
+                release=release,
+            )
+            port_re = issue | pf_re
+            port_addr = issue.select(port_addr, concat(pf_line, pf_word))
+        self.backing.build(
+            we=Bits(1)(0),
+            re=port_re,
+            addr=self._widen(port_addr),
+            wdata=Bits(self.width)(0),
+        )
+
+        next_state = miss.select(ICacheState.WAIT, state)
+        next_state = promote.select(ICacheState.PROMOTE, next_state)
+        next_state = wait_done.select(ICacheState.FILL, next_state)
+        next_state = done.select(ICacheState.IDLE, next_state)
+        self.state[0] = next_state
+
+        return ready
@@ -2,75 +2,122 @@ from .control_signals import *
 
 # RV32I 指令真值表
 # 表格列定义:
-# Key, Opcode, Funct3, Bit30, ImmType | ALU_Func, Rs1_use, Rs2_use, Op1, Op2, Mem_Op, Width, Sign, WB, branch_type
+# Key, Opcode, Funct3, Funct7, Rs2, ImmType | ALU_Func, Rs1_use, Rs2_use, Op1, Op2, Mem_Op, Width, Sign, WB, branch_type
 
 rv32i_table = [
     
     # --- R-Type ---
-    ('add',    OP_R_TYPE, 0x0,  0,    ImmType.R, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('sub',    OP_R_TYPE, 0x0,  1,    ImmType.R, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('sll',    OP_R_TYPE, 0x1,  0,    ImmType.R, ALUOp.SLL, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('slt',    OP_R_TYPE, 0x2,  0,    ImmType.R, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('sltu',   OP_R_TYPE, 0x3,  0,    ImmType.R, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('xor',    OP_R_TYPE, 0x4,  0,    ImmType.R, ALUOp.XOR, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('srl',    OP_R_TYPE, 0x5,  0,    ImmType.R, ALUOp.SRL, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('sra',    OP_R_TYPE, 0x5,  1,    ImmType.R, ALUOp.SRA, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('or',     OP_R_TYPE, 0x6,  0,    ImmType.R, ALUOp.OR,  RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('and',    OP_R_TYPE, 0x7,  0,    ImmType.R, ALUOp.AND, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('add',    OP_R_TYPE, 0x0,  0x00, None, ImmType.R, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sub',    OP_R_TYPE, 0x0,  0x20, None, ImmType.R, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sll',    OP_R_TYPE, 0x1,  0x00, None, ImmType.R, ALUOp.SLL, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('slt',    OP_R_TYPE, 0x2,  0x00, None, ImmType.R, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sltu',   OP_R_TYPE, 0x3,  0x00, None, ImmType.R, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('xor',    OP_R_TYPE, 0x4,  0x00, None, ImmType.R, ALUOp.XOR, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('srl',    OP_R_TYPE, 0x5,  0x00, None, ImmType.R, ALUOp.SRL, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sra',    OP_R_TYPE, 0x5,  0x20, None, ImmType.R, ALUOp.SRA, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('or',     OP_R_TYPE, 0x6,  0x00, None, ImmType.R, ALUOp.OR,  RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('and',    OP_R_TYPE, 0x7,  0x00, None, ImmType.R, ALUOp.AND, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- M 扩展 (乘法) ---
+    # funct7 = 0000001；结果由两级流水乘法器在 MEM 级给出
+    ('mul',    OP_R_TYPE, 0x0,  0x01, None, ImmType.R, ALUOp.MUL,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('mulh',   OP_R_TYPE, 0x1,  0x01, None, ImmType.R, ALUOp.MULH,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('mulhsu', OP_R_TYPE, 0x2,  0x01, None, ImmType.R, ALUOp.MULHSU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('mulhu',  OP_R_TYPE, 0x3,  0x01, None, ImmType.R, ALUOp.MULHU,  RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- M 扩展 (除法) ---
+    # 结果由 EX 级的多周期除法器给出，迭代期间 ID/IF 停顿
+    ('div',    OP_R_TYPE, 0x4,  0x01, None, ImmType.R, ALUOp.DIV,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('divu',   OP_R_TYPE, 0x5,  0x01, None, ImmType.R, ALUOp.DIVU,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('rem',    OP_R_TYPE, 0x6,  0x01, None, ImmType.R, ALUOp.REM,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('remu',   OP_R_TYPE, 0x7,  0x01, None, ImmType.R, ALUOp.REMU,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
 
     # --- I-Type (ALU) ---
-    ('addi',   OP_I_TYPE, 0x0,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('slti',   OP_I_TYPE, 0x2,  None, ImmType.I, ALUOp.SLT, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('sltiu',  OP_I_TYPE, 0x3,  None, ImmType.I, ALUOp.SLTU, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('xori',   OP_I_TYPE, 0x4,  None, ImmType.I, ALUOp.XOR, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('ori',    OP_I_TYPE, 0x6,  None, ImmType.I, ALUOp.OR,  RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('andi',   OP_I_TYPE, 0x7,  None, ImmType.I, ALUOp.AND, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    # Shift Imm (Bit30 distinguishes Logic/Arith shift)
-    ('slli',   OP_I_TYPE, 0x1,  None,    ImmType.I, ALUOp.SLL, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('srli',   OP_I_TYPE, 0x5,  0,    ImmType.I, ALUOp.SRL, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
-    ('srai',   OP_I_TYPE, 0x5,  1,    ImmType.I, ALUOp.SRA, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('addi',   OP_I_TYPE, 0x0,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('slti',   OP_I_TYPE, 0x2,  None, None, ImmType.I, ALUOp.SLT, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sltiu',  OP_I_TYPE, 0x3,  None, None, ImmType.I, ALUOp.SLTU, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('xori',   OP_I_TYPE, 0x4,  None, None, ImmType.I, ALUOp.XOR, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('ori',    OP_I_TYPE, 0x6,  None, None, ImmType.I, ALUOp.OR,  RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('andi',   OP_I_TYPE, 0x7,  None, None, ImmType.I, ALUOp.AND, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    # Shift Imm (Funct7 distinguishes Logic/Arith shift)
+    ('slli',   OP_I_TYPE, 0x1,  0x00, None, ImmType.I, ALUOp.SLL, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('srli',   OP_I_TYPE, 0x5,  0x00, None, ImmType.I, ALUOp.SRL, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('srai',   OP_I_TYPE, 0x5,  0x20, None, ImmType.I, ALUOp.SRA, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- Zba (地址计算) ---
+    ('sh1add', OP_R_TYPE, 0x2,  0x10, None, ImmType.R, ALUOp.SH1ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sh2add', OP_R_TYPE, 0x4,  0x10, None, ImmType.R, ALUOp.SH2ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sh3add', OP_R_TYPE, 0x6,  0x10, None, ImmType.R, ALUOp.SH3ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- Zbb (R-Type) ---
+    ('andn',   OP_R_TYPE, 0x7,  0x20, None, ImmType.R, ALUOp.ANDN,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('orn',    OP_R_TYPE, 0x6,  0x20, None, ImmType.R, ALUOp.ORN,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('xnor',   OP_R_TYPE, 0x4,  0x20, None, ImmType.R, ALUOp.XNOR,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('min',    OP_R_TYPE, 0x4,  0x05, None, ImmType.R, ALUOp.MIN,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('minu',   OP_R_TYPE, 0x5,  0x05, None, ImmType.R, ALUOp.MINU,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('max',    OP_R_TYPE, 0x6,  0x05, None, ImmType.R, ALUOp.MAX,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('maxu',   OP_R_TYPE, 0x7,  0x05, None, ImmType.R, ALUOp.MAXU,   RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('rol',    OP_R_TYPE, 0x1,  0x30, None, ImmType.R, ALUOp.ROL,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('ror',    OP_R_TYPE, 0x5,  0x30, None, ImmType.R, ALUOp.ROR,    RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    # zext.h 的 rs2 字段固定为 0 (不读 rs2)
+    ('zext.h', OP_R_TYPE, 0x4,  0x04, 0,    ImmType.R, ALUOp.ZEXTH,  RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- Zicond (条件清零，用于无分支的条件选择) ---
+    ('czero.eqz', OP_R_TYPE, 0x5, 0x07, None, ImmType.R, ALUOp.CZEROEQZ, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('czero.nez', OP_R_TYPE, 0x7, 0x07, None, ImmType.R, ALUOp.CZERONEZ, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+
+    # --- Zbb (I-Type) ---
+    # 单操作数指令的 rs2 字段是功能码的一部分 (Rs2 列参与匹配)
+    ('clz',    OP_I_TYPE, 0x1,  0x30, 0,    ImmType.I, ALUOp.CLZ,    RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('ctz',    OP_I_TYPE, 0x1,  0x30, 1,    ImmType.I, ALUOp.CTZ,    RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('cpop',   OP_I_TYPE, 0x1,  0x30, 2,    ImmType.I, ALUOp.CPOP,   RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sext.b', OP_I_TYPE, 0x1,  0x30, 4,    ImmType.I, ALUOp.SEXTB,  RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('sext.h', OP_I_TYPE, 0x1,  0x30, 5,    ImmType.I, ALUOp.SEXTH,  RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('rori',   OP_I_TYPE, 0x5,  0x30, None, ImmType.I, ALUOp.ROR,    RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('orc.b',  OP_I_TYPE, 0x5,  0x14, 7,    ImmType.I, ALUOp.ORCB,   RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('rev8',   OP_I_TYPE, 0x5,  0x34, 24,   ImmType.I, ALUOp.REV8,   RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE,  Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
 
     # --- I-type (Load) ---
     # ALU 计算地址 (RS1 + Imm)，Mem 读取
-    ('lb',     OP_LOAD,   0x0,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.BYTE, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
-    ('lh',     OP_LOAD,   0x1,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.HALF, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
-    ('lw',     OP_LOAD,   0x2,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.WORD, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
-    ('lbu',    OP_LOAD,   0x4,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.BYTE, MemSign.UNSIGNED, WB.YES, BranchType.NO_BRANCH),
-    ('lhu',    OP_LOAD,   0x5,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.HALF, MemSign.UNSIGNED, WB.YES, BranchType.NO_BRANCH),
+    ('lb',     OP_LOAD,   0x0,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.BYTE, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
+    ('lh',     OP_LOAD,   0x1,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.HALF, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
+    ('lw',     OP_LOAD,   0x2,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.WORD, MemSign.SIGNED,   WB.YES, BranchType.NO_BRANCH),
+    ('lbu',    OP_LOAD,   0x4,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.BYTE, MemSign.UNSIGNED, WB.YES, BranchType.NO_BRANCH),
+    ('lhu',    OP_LOAD,   0x5,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.LOAD,  MemWidth.HALF, MemSign.UNSIGNED, WB.YES, BranchType.NO_BRANCH),
 
     # --- S-type (Store) ---
     # ALU 计算地址 (RS1 + Imm)，Mem 写入
-    ('sb',     OP_STORE,  0x0,  None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.BYTE, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
-    ('sh',     OP_STORE,  0x1,  None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.HALF, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
-    ('sw',     OP_STORE,  0x2,  None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.WORD, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
+    ('sb',     OP_STORE,  0x0,  None, None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.BYTE, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
+    ('sh',     OP_STORE,  0x1,  None, None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.HALF, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
+    ('sw',     OP_STORE,  0x2,  None, None, ImmType.S, ALUOp.ADD, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.IMM, MemOp.STORE, MemWidth.WORD, Bits(1)(0), WB.NO,  BranchType.NO_BRANCH),
 
     # --- Branch ---
     # ALU 做比较 (Sub/Cmp)，PC Adder 算目标 (PC+Imm)，不写回
-    ('beq',    OP_BRANCH, 0x0,  None, ImmType.B, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BEQ),
-    ('bne',    OP_BRANCH, 0x1,  None, ImmType.B, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BNE),
-    ('blt',    OP_BRANCH, 0x4,  None, ImmType.B, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BLT),
-    ('bge',    OP_BRANCH, 0x5,  None, ImmType.B, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BGE),
-    ('bltu',   OP_BRANCH, 0x6,  None, ImmType.B, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BLTU),
-    ('bgeu',   OP_BRANCH, 0x7,  None, ImmType.B, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BGEU),
+    ('beq',    OP_BRANCH, 0x0,  None, None, ImmType.B, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BEQ),
+    ('bne',    OP_BRANCH, 0x1,  None, None, ImmType.B, ALUOp.SUB, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BNE),
+    ('blt',    OP_BRANCH, 0x4,  None, None, ImmType.B, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BLT),
+    ('bge',    OP_BRANCH, 0x5,  None, None, ImmType.B, ALUOp.SLT, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BGE),
+    ('bltu',   OP_BRANCH, 0x6,  None, None, ImmType.B, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BLTU),
+    ('bgeu',   OP_BRANCH, 0x7,  None, None, ImmType.B, ALUOp.SLTU, RsUse.YES, RsUse.YES, Op1Sel.RS1, Op2Sel.RS2, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.BGEU),
 
     # --- JAL ---
     # ALU: PC + 4 (Link Data -> WB)
     # Tgt: PC + Imm (Jump Target -> IF)
-    ('jal',    OP_JAL,    None, None, ImmType.J, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.PC,  Op2Sel.CONST_4, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.JAL),
+    ('jal',    OP_JAL,    None, None, None, ImmType.J, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.PC,  Op2Sel.CONST_4, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.JAL),
 
     # --- JALR ---
     # ALU: PC + 4 (Link Data -> WB)
     # Tgt: RS1 + Imm (Jump Target -> IF)
-    ('jalr',   OP_JALR,   0x0,  None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.PC,  Op2Sel.CONST_4, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.JALR),
+    ('jalr',   OP_JALR,   0x0,  None, None, ImmType.I, ALUOp.ADD, RsUse.YES, RsUse.NO,  Op1Sel.PC,  Op2Sel.CONST_4, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.JALR),
 
     # --- U-Type ---
     # LUI:   ALU 算 0 + Imm
-    ('lui',    OP_LUI,    None, None, ImmType.U, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.ZERO, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('lui',    OP_LUI,    None, None, None, ImmType.U, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.ZERO, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
     # AUIPC: ALU 算 PC + Imm
-    ('auipc',  OP_AUIPC,  None, None, ImmType.U, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.PC,  Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
+    ('auipc',  OP_AUIPC,  None, None, None, ImmType.U, ALUOp.ADD, RsUse.NO,  RsUse.NO,  Op1Sel.PC,  Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.YES, BranchType.NO_BRANCH),
 
     # --- Environment (ECALL/EBREAK) ---
     # 作为特殊 I-Type 处理，但这里只给基本信号，具体逻辑由 Decoder/Execution 中的 finish() 逻辑拦截，直接停止模拟。
-    ('ecall',  OP_SYSTEM, 0x0,  0, ImmType.I, ALUOp.NOP, RsUse.NO,  RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.NO_BRANCH),
-    ('ebreak', OP_SYSTEM, 0x0,  0, ImmType.I, ALUOp.NOP, RsUse.NO,  RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.NO_BRANCH),
+    ('ecall',  OP_SYSTEM, 0x0,  0x00, None, ImmType.I, ALUOp.NOP, RsUse.NO,  RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.NO_BRANCH),
+    ('ebreak', OP_SYSTEM, 0x0,  0x00, None, ImmType.I, ALUOp.NOP, RsUse.NO,  RsUse.NO,  Op1Sel.RS1, Op2Sel.IMM, MemOp.NONE, Bits(3)(0), Bits(1)(0), WB.NO, BranchType.NO_BRANCH),
 ]
\ No newline at end of file
@@ -10,16 +10,48 @@ from assassyn import utils
 
 # 导入所有模块
 from .control_signals import *
-from .fetch import Fetcher, FetcherImpl
-from .decoder import Decoder, DecoderImpl
-from .data_hazard import DataHazardUnit
-from .execution import Execution
+from .fetch import (
+    Fetcher,
+    FetcherImpl,
+    FetchQueue,
+    BranchTargetBuffer,
+    ReturnAddressStack,
+    make_direction_predictor,
+)
+from .icache import ICache
+from .rvc import window_instruction_file
+from .decoder import Decoder, DecoderImpl, LoopBuffer, MacroFusion, EarlyAGU, DualIssue
+from .data_hazard import DataHazardUnit, Scoreboard
+from .execution import (
+    Execution,
+    Execution2,
+    PipelinedMultiplier,
+    IterativeDivider,
+    AluLane,
+)
 from .memory import MemoryAccess
 from .writeback import WriteBack
 
 # 全局工作区路径
 current_path = os.path.dirname(os.path.abspath(__file__))
 workspace = f"{current_path}/../.workspace/"
+# 由 workspace 中的镜像派生的指令镜像 (两路取指 / 压缩指令)，不写入源码树 (已在 .gitignore 中)
+build_dir = f"{current_path}/../.build/"
+
+
+def pair_instruction_file(src, dst):
+    """把每行一个 32 位字的指令镜像两两合并为 64 位字 (低 32 位为低地址指令)。"""
+    words = []
+    with open(src) as f:
+        for line in f:
+            line = line.split("//")[0].strip()
+            if line:
+                words.append(int(line, 16))
+    if len(words) % 2:
+        words.append(0)
+    with open(dst, "w") as f:
+        for lo, hi in zip(words[0::2], words[1::2]):
+            f.write(f"{hi:08x}{lo:08x}\n")
 
 
 # 辅助模块：用于初始化 offset (参考 minor_cpu)
@@ -41,10 +73,10 @@ class Driver(Module):
         super().__init__(ports={})
 
     @module.combinational
-    def build(self, fetcher: Module, user: Module):
+    def build(self, fetcher: Module, user: Module, init_file):
         init_reg = RegArray(UInt(1), 1, initializer=[1])
         # 使用 workload.init 初始化 offset
-        init_cache = SRAM(width=32, depth=32, init_file=f"{workspace}/workload.init")
+        init_cache = SRAM(width=32, depth=32, init_file=init_file)
         init_cache.build(
             we=Bits(1)(0),
             re=init_reg[0].bitcast(Bits(1)),
@@ -58,47 +90,174 @@ class Driver(Module):
             init_reg[0] = UInt(1)(0)
 
         # Cycle >0: 启动 Fetcher (点火)
-        # 注意：这里我们只负责 "kickstart"，Fetcher 后续会自动流转
-        # 但在 Assassyn 的刚性流水线模型中，通常需要持续驱动
-        # 不过根据我们的 FetcherImpl 设计，它只要有 stall/flush 信号就会自我驱动
-        # 这里为了兼容性，保留这个启动信号，或者 Fetcher 内部有自举逻辑
+        # 注意：在 Assassyn 的刚性流水线模型中需要持续驱动 Fetcher，
+        # FetcherImpl 随之每周期执行一次
+        with Condition(init_reg[0] == UInt(1)(0)):
+            fetcher.async_called()
 
         return init_cache
 
 
-def build_cpu(depth_log=16):
+def build_cpu(
+    depth_log=16,
+    predictor="none",  # none / static / bimodal / gshare / tournament
+    bp_size_log=6,
+    btb_size_log=6,
+    btb_ways=1,
+    ras_depth=8,
+    id_redirect=False,  # ID 级提前解析跳转/分支并重定向取指
+    fetch_queue_depth=0,  # 取指队列深度，0 表示刚性流水线 (不使用队列)
+    fetch_width=1,  # 每周期取指条数 (1 或 2)，2 需要取指队列
+    icache_size_log=0,  # ICache 容量 (字节，log2)，0 表示单周期的理想指令存储器
+    icache_line_log=4,  # ICache 行大小 (字节，log2)
+    icache_ways=2,
+    icache_latency=8,  # 后备存储器首字延迟 (周期)
+    prefetch_degree=0,  # 指令预取深度 (行)，0 关闭，1 为 Next-Line，N 为 N 行流式预取
+    prefetch_entries=2,  # 预取缓冲行数
+    loop_buffer_size=0,  # 循环缓冲条数 (2 的幂)，0 表示不使用
+    macro_fusion=False,  # 译码级宏操作融合，需要取指队列
+    rvc=False,  # RV32C 压缩指令，仅单路取指，不与循环缓冲/宏操作融合同时使用
+    early_agu=False,  # 译码级地址生成：基址就绪的 Load 在 ID 级提前读数据 SRAM
+    dual_issue=False,  # 双发射：窗口中的第二条可同周期发往只含 ALU 的第二执行通道，需要两路取指
+    encoded_ctrl=False,  # ID->EX 的独热控制字段按二进制下标传递，EX 入口译回 (缩小级间 FIFO)
+    split_ex=False,  # EX 拆为 EX1 (旁路 + ALU) / EX2 (分支解析 + 访存发出) 两级，缩短 EX 的关键路径
+    sim_threshold=1000000,  # 仿真周期上限
+    workload=workspace,  # 负载镜像所在目录 (workload_ins.exe / workload_mem.exe / workload.init)
+):
+    if fetch_width == 2 and fetch_queue_depth < 4:
+        raise ValueError("Two-wide fetch requires fetch_queue_depth >= 4")
+    if loop_buffer_size and fetch_queue_depth:
+        raise ValueError("Loop buffer requires the rigid pipeline (fetch_queue_depth=0)")
+    if macro_fusion and not fetch_queue_depth:
+        raise ValueError("Macro-op fusion requires a fetch queue (fetch_queue_depth > 0)")
+    if dual_issue and (fetch_width != 2 or macro_fusion):
+        raise ValueError("Dual issue requires two-wide fetch without macro-op fusion")
+    if rvc and (fetch_width != 1 or loop_buffer_size or macro_fusion):
+        raise ValueError(
+            "Compressed instructions require single-wide fetch without loop buffer or macro-op fusion"
+        )
+    if split_ex and (dual_issue or early_agu):
+        raise ValueError("Split EX cannot be combined with dual issue or early AGU")
+
     sys_name = "rv32i_cpu"
     sys = SysBuilder(sys_name)
 
     with sys:
         # 1. 物理资源初始化
         main_memory = SRAM(
-            width=32, depth=1 << depth_log, init_file=f"{workspace}/workload_mem.exe"
-        )
-        icache = SRAM(
-            width=32, depth=1 << depth_log, init_file=f"{workspace}/workload_ins.exe"
+            width=32, depth=1 << depth_log, init_file=f"{workload}/workload_mem.exe"
         )
+        if rvc:
+            # 压缩指令：64 位窗口 {word[w+1], word[w]}，跨字的 32 位指令一次读出
+            os.makedirs(build_dir, exist_ok=True)
+            window_instruction_file(
+                f"{workload}/workload_ins.exe", f"{build_dir}/workload_ins_rvc.exe"
+            )
+            ins_addr_bits = depth_log
+            ins_memory = SRAM(
+                width=64,
+                depth=1 << ins_addr_bits,
+                init_file=f"{build_dir}/workload_ins_rvc.exe",
+            )
+        elif fetch_width == 1:
+            ins_addr_bits = depth_log
+            ins_memory = SRAM(
+                width=32,
+                depth=1 << ins_addr_bits,
+                init_file=f"{workload}/workload_ins.exe",
+            )
+        else:
+            # 两路取指：64 位宽指令存储，一次读出一对对齐的指令
+            os.makedirs(build_dir, exist_ok=True)
+            pair_instruction_file(
+                f"{workload}/workload_ins.exe", f"{build_dir}/workload_ins64.exe"
+            )
+            ins_addr_bits = depth_log - 1
+            ins_memory = SRAM(
+                width=64,
+                depth=1 << ins_addr_bits,
+                init_file=f"{build_dir}/workload_ins64.exe",
+            )
+
+        # 指令缓存：位于指令存储器 (此时作为较慢的后备存储器) 之前
+        icache = ins_memory
+        if icache_size_log:
+            icache = ICache(
+                backing=ins_memory,
+                addr_bits=ins_addr_bits,
+                size_log=icache_size_log,
+                line_log=icache_line_log,
+                ways=icache_ways,
+                latency=icache_latency,
+                width=64 if rvc else 32 * fetch_width,
+                prefetch_degree=prefetch_degree,
+                prefetch_entries=prefetch_entries,
+            )
 
         # 寄存器堆
         reg_file = RegArray(Bits(32), 32)
 
         # 全局状态寄存器
         branch_target_reg = RegArray(Bits(32), 1)
-        wb_bypass_reg = RegArray(Bits(32), 1)
         ex_bypass_reg = RegArray(Bits(32), 1)
         mem_bypass_reg = RegArray(Bits(32), 1)
+        ex2_bypass_reg = RegArray(Bits(32), 1) if split_ex else None
+        bp_update_reg = RegArray(bp_update_signals, 1)
+        id_redirect_reg = RegArray(id_redirect_signals, 1) if id_redirect else None
+
+        # M 扩展乘法器：第 1 级在 EX，第 2 级在 MEM (拆分 EX 时在 EX2)
+        multiplier = PipelinedMultiplier()
+        # M 扩展除法器：EX 级多周期迭代，忙时 ID/IF 停顿
+        divider = IterativeDivider()
+
+        # 记分牌：登记结果晚于 EX 末给出的功能部件 (其余按 ALU 延迟 1 处理)
+        # 除法器延迟可变，按 1 处理并在忙时保持表项
+        # 拆分 EX 时 Load 晚一级 (EX2 才发出读请求)，乘法器第 2 级移到 EX2，延迟不变
+        scoreboard = Scoreboard(split_ex=split_ex)
+        load_latency = 3 if split_ex else 2
+        scoreboard.register(latency=load_latency, mem_op=MemOp.LOAD)  # Load：MEM 级末给出
+        scoreboard.register(latency=2, alu_ops=PipelinedMultiplier.OPS)  # 两级乘法器
+
+        # 译码级地址生成：与 EX 共用数据 SRAM 的唯一端口 (EX 优先)
+        agu = EarlyAGU(main_memory) if early_agu else None
+
+        # 分支预测部件 (由 FetcherImpl 读写)，"none" 时 IF 始终取 pc + 4
+        dir_predictor = make_direction_predictor(predictor, bp_size_log)
+        btb, ras = None, None
+        if predictor != "none":
+            btb = BranchTargetBuffer(size_log=btb_size_log, ways=btb_ways, rvc=rvc)
+            ras = ReturnAddressStack(depth=ras_depth)
+
+        # 取指队列：Decoder 改从队列的 dout 读取指令字
+        fetch_queue = None
+        if fetch_queue_depth:
+            fetch_queue = FetchQueue(
+                fetch_queue_depth,
+                width=fetch_width,
+                lookahead=macro_fusion or dual_issue,
+            )
+        decode_src = icache.dout if fetch_queue is None else fetch_queue.dout
+
+        # 循环缓冲：短小内层循环回放译码结果，不再读取指令存储器
+        loop_buffer = LoopBuffer(loop_buffer_size) if loop_buffer_size else None
+        # 宏操作融合：队头与下一条组成译码窗口
+        fusion = MacroFusion(fetch_queue) if macro_fusion else None
+        # 双发射：窗口中的第二条满足条件时同周期发往第二执行通道
+        dual = DualIssue(fetch_queue, scoreboard) if dual_issue else None
 
         # 2. 模块实例化
         fetcher = Fetcher()
         fetcher_impl = FetcherImpl()
 
-        decoder = Decoder()
+        decoder = Decoder(rvc=rvc)
         decoder_impl = DecoderImpl()
         hazard_unit = DataHazardUnit()
 
-        executor = Execution()
+        executor = Execution(encoded=encoded_ctrl)
+        executor2 = Execution2() if split_ex else None
         memory_unit = MemoryAccess()
         writeback = WriteBack()
+        alu_lane = AluLane() if dual_issue else None
 
         # 辅助模块 (Offset Loader)
         mem_user = MemUser()
@@ -107,29 +266,60 @@ def build_cpu(depth_log=16):
         # 3. 逆序构建 (Reverse Build)
 
         # --- Step A: WB 阶段 ---
-        wb_rd = writeback.build(reg_file)
+        wb_rd, wb_data = writeback.build(reg_file)
+        wb_rd2, wb_data2 = None, None
+        if alu_lane is not None:
+            # 第二执行通道：EX/MEM/WB 都在其中，写回走寄存器堆的第二个写口
+            wb_rd2, wb_data2 = alu_lane.build(
+                dual=dual,
+                reg_file=reg_file,
+                ex_mem_bypass=ex_bypass_reg,
+                mem_wb_bypass=mem_bypass_reg,
+                branch_target_reg=branch_target_reg,
+            )
 
         # --- Step B: MEM 阶段 ---
-        mem_rd = memory_unit.build(
+        memory_unit.build(
             wb_module=writeback,
             sram_dout=main_memory.dout,
             mem_bypass_reg=mem_bypass_reg,
+            multiplier=None if split_ex else multiplier,
         )
 
         # --- Step C: EX 阶段 ---
-        ex_rd, ex_is_load = executor.build(
-            mem_module=memory_unit,
+        ex_next = memory_unit
+        if executor2 is not None:
+            # 拆分 EX：EX2 解析分支、驱动数据 SRAM，再送往 MEM
+            executor2.build(
+                mem_module=memory_unit,
+                ex2_bypass=ex2_bypass_reg,
+                branch_target_reg=branch_target_reg,
+                dcache=main_memory,
+                bp_update_reg=bp_update_reg,
+                multiplier=multiplier,
+            )
+            ex_next = executor2
+        _, _, _, ex_div_busy = executor.build(
+            mem_module=ex_next,
             ex_mem_bypass=ex_bypass_reg,
             mem_wb_bypass=mem_bypass_reg,
-            wb_bypass=wb_bypass_reg,
             branch_target_reg=branch_target_reg,
             dcache=main_memory,
+            bp_update_reg=bp_update_reg,
+            multiplier=multiplier,
+            divider=divider,
+            agu=agu,
+            dual=dual,
+            ex2_bypass=ex2_bypass_reg,
         )
 
         # --- Step D: ID 阶段 (Shell) ---
         pre_pkt, rs1, rs2, use1, use2 = decoder.build(
-            icache_dout=icache.dout,
+            icache_dout=decode_src,
             reg_file=reg_file,
+            loop_buffer=loop_buffer,
+            fusion=fusion,
+            dual=dual,
         )
 
         # --- Step E: Hazard Unit ---
@@ -138,47 +328,107 @@ def build_cpu(depth_log=16):
             rs2_idx=rs2,
             rs1_used=use1,
             rs2_used=use2,
-            ex_rd=ex_rd,
-            ex_is_load=ex_is_load,
-            mem_rd=mem_rd,
-            wb_rd=wb_rd,
+            pre=pre_pkt,
+            ex_div_busy=ex_div_busy,
+            scoreboard=scoreboard,
+            dual=dual,
         )
 
         # --- Step F: ID 阶段 (Core) ---
-        stall_if = decoder_impl.build(
+        decoder_impl.build(
             pre=pre_pkt,
             executor=executor,
             rs1_sel=rs1_sel,
             rs2_sel=rs2_sel,
             stall_if=stall_if,
             branch_target_reg=branch_target_reg,
+            id_redirect_reg=id_redirect_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            ex_div_busy=ex_div_busy,
+            agu=agu,
+            dual=dual,
+            wb_rd2=wb_rd2,
+            wb_data2=wb_data2,
+            mem_stage_bypass=ex2_bypass_reg if split_ex else ex_bypass_reg,
         )
 
         # --- Step G: IF 阶段 ---
-        pc_reg = fetcher.build()
+        pc_reg, last_pc_reg = fetcher.build()
         fetcher_impl.build(
             pc_reg=pc_reg,
-            icache=main_memory,
+            last_pc_reg=last_pc_reg,
+            icache=icache,
             decoder=decoder,
             stall_if=stall_if,
             branch_target=branch_target_reg,
+            predictor=dir_predictor,
+            bp_update=bp_update_reg,
+            btb=btb,
+            ras=ras,
+            id_redirect=id_redirect_reg,
+            fetch_queue=fetch_queue,
+            loop_buffer=loop_buffer,
+            fusion=fusion,
+            dual=dual,
+            rvc=rvc,
         )
 
         # --- Step H: 辅助驱动 ---
-        init_cache = driver.build(fetcher, mem_user)
+        init_cache = driver.build(fetcher, mem_user, f"{workload}/workload.init")
         offset_reg = mem_user.build(init_cache.dout)
 
         # 4. 顶层暴露 (Expose)
         # --------------------------------------------------------
         sys.expose_on_top(reg_file, kind="Output")
         sys.expose_on_top(pc_reg, kind="Output")
+        # 分支预测统计：各方向预测器的命中/未命中，BTB 与 RAS 计数
+        if dir_predictor is not None:
+            for stat in dir_predictor.stats():
+                sys.expose_on_top(stat, kind="Output")
+        if btb is not None:
+            sys.expose_on_top(btb.hit_cnt, kind="Output")
+            sys.expose_on_top(btb.miss_cnt, kind="Output")
+            sys.expose_on_top(ras.hit_cnt, kind="Output")
+            sys.expose_on_top(ras.miss_cnt, kind="Output")
+            sys.expose_on_top(ras.overflow_cnt, kind="Output")
+        # ICache 统计：命中 / 缺失次数
+        if icache_size_log:
+            for stat in icache.stats():
+                sys.expose_on_top(stat, kind="Output")
+        # 取指队列统计：队列满 (取指暂停) / 队列空 (译码空转) 周期数
+        if fetch_queue is not None:
+            for stat in fetch_queue.stats():
+                sys.expose_on_top(stat, kind="Output")
+        # 循环缓冲统计：由缓冲提供译码结果的指令数
+        if loop_buffer is not None:
+            for stat in loop_buffer.stats():
+                sys.expose_on_top(stat, kind="Output")
+        # 宏操作融合统计：各组合的融合次数 (即少执行的指令槽数)
+        if fusion is not None:
+            for stat in fusion.stats():
+                sys.expose_on_top(stat, kind="Output")
+        # 除法器统计：因等待除法结果而停顿的周期数
+        for stat in divider.stats():
+            sys.expose_on_top(stat, kind="Output")
+        # 译码级地址生成统计：在 ID 级提前读取的 Load 条数
+        if agu is not None:
+            for stat in agu.stats():
+                sys.expose_on_top(stat, kind="Output")
+        # 双发射统计：双发射的周期数 / 总周期数
+        if dual is not None:
+            for stat in dual.stats():
+                sys.expose_on_top(stat, kind="Output")
         # 可以暴露更多用于调试
 
     # 5. 生成仿真器
     print(f"Building System: {sys_name}")
     conf = config(
         verilog=False,  # 单元测试通常不需要 Verilog，集成测试可以开
-        sim_threshold=1000000,
+        sim_threshold=sim_threshold,
         idle_threshold=500000,
         fifo_depth=1,
     )
@@ -2,6 +2,44 @@ from assassyn.frontend import *
 from .control_signals import *
 
 
+def align_load(raw_mem, addr, mem_width, mem_unsigned):
+    """Load 数据对齐：按地址低 2 位与位宽从 SRAM 读出的字中取出字节 / 半字并扩展。"""
+    # 二分选择半字 (16-bit Candidates)
+    # 根据 addr[1:1] (地址第1位) 选择高16位还是低16位
+    # 0 -> 低16位 [15:0]
+    # 1 -> 高16位 [31:16]
+    half_selected = addr[1:1].select(raw_mem[16:31], raw_mem[0:15])
+
+    # 二分选择字节 (8-bit Candidates)
+    # 在刚才选出的半字基础上，根据 addr[0:0] (地址第0位) 选择高8位还是低8位
+    # 0 -> 低8位
+    # 1 -> 高8位
+    byte_selected = addr[0:0].select(half_selected[8:15], half_selected[0:7])
+
+    # 统一处理符号位
+    # 对于 Byte：如果是无符号，填充0；否则填充最高位(第7位)
+    pad_bit_8 = mem_unsigned.select(Bits(1)(0), byte_selected[7:7])
+    # 生成 24 位的填充掩码 (全0 或 全1)
+    padding_8 = pad_bit_8.select(Bits(24)(0xFFFFFF), Bits(24)(0))
+    # 拼接
+    byte_extended = concat(padding_8, byte_selected)
+
+    # 对于 Half：如果是无符号，填充0；否则填充最高位(第15位)
+    pad_bit_16 = mem_unsigned.select(Bits(1)(0), half_selected[15:15])
+    # 生成 16 位的填充掩码
+    padding_16 = pad_bit_16.select(Bits(16)(0xFFFF), Bits(16)(0))
+    # 拼接
+    half_extended = concat(padding_16, half_selected)
+
+    # 根据位宽指令选择最终结果
+    # 使用 mem_width 作为选择信号 (独热码)
+    return mem_width.select1hot(
+        byte_extended,  # 对应 MemWidth.BYTE
+        half_extended,  # 对应 MemWidth.HALF
+        raw_mem,  # 对应 MemWidth.WORD
+    )
+
+
 class MemoryAccess(Module):
     def __init__(self):
         super().__init__(
@@ -23,6 +61,7 @@ class MemoryAccess(Module):
         wb_module: Module,  # 下一级流水线 (writeback.py)
         sram_dout: Array,  # SRAM 的输出端口 (Ref)
         mem_bypass_reg: Array,  # 全局 Bypass 寄存器 (数据)
+        multiplier=None,  # M 扩展乘法器 (可选，本级完成其第 2 级)
     ):
         # 1. 弹出并解包
         ctrl, alu_result = self.pop_all_ports(False)
@@ -36,40 +75,7 @@ class MemoryAccess(Module):
         # 读取 SRAM 原始数据 (32-bit)
         raw_mem = sram_dout[0].bitcast(Bits(32))
 
-        # 二分选择半字 (16-bit Candidates)
-        # 根据 alu_result[1:1] (地址第1位) 选择高16位还是低16位
-        # 0 -> 低16位 [15:0]
-        # 1 -> 高16位 [31:16]
-        half_selected = alu_result[1:1].select(raw_mem[16:31], raw_mem[0:15])
-
-        # 二分选择字节 (8-bit Candidates)
-        # 在刚才选出的半字基础上，根据 alu_result[0:0] (地址第0位) 选择高8位还是低8位
-        # 0 -> 低8位
-        # 1 -> 高8位
-        byte_selected = alu_result[0:0].select(half_selected[8:15], half_selected[0:7])
-
-        # 统一处理符号位
-        # 对于 Byte：如果是无符号，填充0；否则填充最高位(第7位)
-        pad_bit_8 = mem_unsigned.select(Bits(1)(0), byte_selected[7:7])
-        # 生成 24 位的填充掩码 (全0 或 全1)
-        padding_8 = pad_bit_8.select(Bits(24)(0xFFFFFF), Bits(24)(0))
-        # 拼接
-        byte_extended = concat(padding_8, byte_selected)
-
-        # 对于 Half：如果是无符号，填充0；否则填充最高位(第15位)
-        pad_bit_16 = mem_unsigned.select(Bits(1)(0), half_selected[15:15])
-        # 生成 16 位的填充掩码
-        padding_16 = pad_bit_16.select(Bits(16)(0xFFFF), Bits(16)(0))
-        # 拼接
-        half_extended = concat(padding_16, half_selected)
-
-        # 根据位宽指令选择最终结果
-        # 使用 mem_width 作为选择信号 (独热码)
-        processed_mem_result = mem_width.select1hot(
-            byte_extended,  # 对应 MemWidth.BYTE
-            half_extended,  # 对应 MemWidth.HALF
-            raw_mem,  # 对应 MemWidth.WORD
-        )
+        processed_mem_result = align_load(raw_mem, alu_result, mem_width, mem_unsigned)
 
         # 3. 最终数据选择 (Final Mux)
         # 如果是 Load 指令，用加工后的内存数据
@@ -77,6 +83,11 @@ class MemoryAccess(Module):
         is_load = mem_opcode == MemOp.LOAD  # 检查是否为 Load 指令
         final_data = is_load.select(processed_mem_result, alu_result)
 
+        # 乘法指令：用乘法器第 2 级的结果，与 Load 数据一样从本级进入旁路网络
+        if multiplier is not None:
+            mul_valid, mul_result = multiplier.result()
+            final_data = mul_valid.select(mul_result, final_data)
+
         # 4. 输出驱动 (Output Driver)
         # 驱动全局 Bypass 寄存器 (Side Channel)
         # 这使得下下条指令 (ID级) 能在当前周期看到结果
@@ -0,0 +1,198 @@
+from assassyn.frontend import *
+from .control_signals import *
+
+
+# ==============================================================================
+# RV32C 压缩指令支持
+#
+# 指令存储按"窗口"组织：第 w 项为 {word[w+1], word[w]} (64 位)，以 pc >> 2 寻址，
+# 一次读出就包含从任意 2 字节对齐地址开始的 32 位，跨字的 32 位指令无需第二次访问。
+#   1. align_parcel：按 pc[1] 从窗口中取出以 pc 开头的 32 位 (压缩指令只用低 16 位)。
+#   2. is_compressed：低两位不为 0b11 即为 16 位指令。
+#   3. expand_rvc：把 16 位指令展开为等价的 32 位指令，之后的译码 (rv32i_table) 不变。
+# ==============================================================================
+
+
+def window_instruction_file(src, dst):
+    """把每行一个 32 位字的指令镜像转为 64 位窗口：第 w 行为 {word[w+1], word[w]}。"""
+    words = []
+    with open(src) as f:
+        for line in f:
+            line = line.split("//")[0].strip()
+            if line:
+                words.append(int(line, 16))
+    words.append(0)
+    with open(dst, "w") as f:
+        for lo, hi in zip(words[:-1], words[1:]):
+            f.write(f"{hi:08x}{lo:08x}\n")
+
+
+def align_parcel(window, pc):
+    """从 64 位窗口中取出以 pc 开头的 32 位 (pc[1] 为 1 时从高半字开始)。"""
+    return pc[1:1].select(window[16:47], window[0:31])
+
+
+def is_compressed(inst):
+    return inst[0:1] != Bits(2)(0b11)
+
+
+def _pad(width, sign):
+    return sign.select(Bits(width)((1 << width) - 1), Bits(width)(0))
+
+
+# --- 32 位指令编码 (imm 为 12 位或 32 位的 Bits) ---
+def _enc_r(funct7, rs2, rs1, funct3, rd, opcode):
+    return concat(Bits(7)(funct7), rs2, rs1, Bits(3)(funct3), rd, opcode)
+
+
+def _enc_i(imm12, rs1, funct3, rd, opcode):
+    return concat(imm12, rs1, Bits(3)(funct3), rd, opcode)
+
+
+def _enc_s(imm12, rs2, rs1, funct3):
+    return concat(imm12[5:11], rs2, rs1, Bits(3)(funct3), imm12[0:4], OP_STORE)
+
+
+def _enc_b(off, rs1, funct3):
+    return concat(
+        off[12:12],
+        off[5:10],
+        Bits(5)(0),  # rs2 = x0
+        rs1,
+        Bits(3)(funct3),
+        off[1:4],
+        off[11:11],
+        OP_BRANCH,
+    )
+
+
+def _enc_j(off, rd):
+    return concat(off[20:20], off[1:10], off[11:11], off[12:19], rd, OP_JAL)
+
+
+def expand_rvc(c):
+    """
+    把 RV32C 指令 (c 的低 16 位) 展开为等价的 32 位指令。
+    只覆盖整数子集；浮点与保留编码 (包括全 0) 展开为 NOP —— ICache 缺失时的 NOP 窗口
+    在 pc[1] 为 1 时对齐出的低半字为 0，也按 NOP 译码。
+    """
+    quad = c[0:1]
+    funct3 = c[13:15]
+    sign = c[12:12]
+
+    # 寄存器字段：完整的 5 位编号，与压缩编号 (x8 ~ x15)
+    rd = c[7:11]
+    rs2 = c[2:6]
+    rd_p = concat(Bits(2)(0b01), c[7:9])  # rd' / rs1'
+    rs2_p = concat(Bits(2)(0b01), c[2:4])  # rd' / rs2'
+    x0, x1, x2 = Bits(5)(0), Bits(5)(1), Bits(5)(2)
+
+    # 立即数
+    imm6 = concat(_pad(6, sign), sign, c[2:6])  # c.addi / c.li / c.andi (12 位有符号)
+    shamt = concat(Bits(7)(0), c[2:6])
+    uimm_lw = concat(Bits(5)(0), c[5:5], c[10:12], c[6:6], Bits(2)(0))
+    uimm_lwsp = concat(Bits(4)(0), c[2:3], c[12:12], c[4:6], Bits(2)(0))
+    uimm_swsp = concat(Bits(4)(0), c[7:8], c[9:12], Bits(2)(0))
+    nzuimm_4spn = concat(Bits(2)(0), c[7:10], c[11:12], c[5:5], c[6:6], Bits(2)(0))
+    nzimm_16sp = concat(_pad(3, sign), c[3:4], c[5:5], c[2:2], c[6:6], Bits(4)(0))
+    nzimm_lui = concat(_pad(14, sign), sign, c[2:6])
+    off_j = concat(
+        _pad(20, sign), sign, c[8:8], c[9:10], c[6:6], c[7:7], c[2:2], c[11:11], c[3:5],
+        Bits(1)(0),
+    )
+    off_b = concat(
+        _pad(23, sign), sign, c[5:6], c[2:2], c[10:11], c[3:4], Bits(1)(0)
+    )
+
+    def is_op(q, f3):
+        return (quad == Bits(2)(q)) & (funct3 == Bits(3)(f3))
+
+    rd_zero = rd == x0
+    rs2_zero = rs2 == x0
+    alu_f2 = c[10:11]
+    arith = is_op(0b01, 0b100) & (alu_f2 == Bits(2)(0b11)) & ~sign
+    cr = is_op(0b10, 0b100)
+
+    # (匹配条件, 32 位指令)，条件两两互斥
+    cases = [
+        # --- Quadrant 0 ---
+        # c.addi4spn (nzuimm = 0 为保留编码，包括全 0 的非法指令)
+        (
+            is_op(0b00, 0b000) & (c[5:12] != Bits(8)(0)),
+            _enc_i(nzuimm_4spn, x2, 0b000, rs2_p, OP_I_TYPE),
+        ),
+        (is_op(0b00, 0b010), _enc_i(uimm_lw, rd_p, 0b010, rs2_p, OP_LOAD)),  # c.lw
+        (is_op(0b00, 0b110), _enc_s(uimm_lw, rs2_p, rd_p, 0b010)),  # c.sw
+        # --- Quadrant 1 ---
+        (is_op(0b01, 0b000), _enc_i(imm6, rd, 0b000, rd, OP_I_TYPE)),  # c.addi / c.nop
+        (is_op(0b01, 0b001), _enc_j(off_j, x1)),  # c.jal
+        (is_op(0b01, 0b010), _enc_i(imm6, x0, 0b000, rd, OP_I_TYPE)),  # c.li
+        (
+            is_op(0b01, 0b011) & (rd == x2),
+            _enc_i(nzimm_16sp, x2, 0b000, x2, OP_I_TYPE),  # c.addi16sp
+        ),
+        (
+            is_op(0b01, 0b011) & (rd != x2),
+            concat(nzimm_lui, rd, OP_LUI),  # c.lui
+        ),
+        (
+            is_op(0b01, 0b100) & (alu_f2 == Bits(2)(0b00)),
+            _enc_i(shamt, rd_p, 0b101, rd_p, OP_I_TYPE),  # c.srli
+        ),
+        (
+            is_op(0b01, 0b100) & (alu_f2 == Bits(2)(0b01)),
+            _enc_i(shamt | Bits(12)(0x400), rd_p, 0b101, rd_p, OP_I_TYPE),  # c.srai
+        ),
+        (
+            is_op(0b01, 0b100) & (alu_f2 == Bits(2)(0b10)),
+            _enc_i(imm6, rd_p, 0b111, rd_p, OP_I_TYPE),  # c.andi
+        ),
+        (
+            arith & (c[5:6] == Bits(2)(0b00)),
+            _enc_r(0b0100000, rs2_p, rd_p, 0b000, rd_p, OP_R_TYPE),  # c.sub
+        ),
+        (
+            arith & (c[5:6] == Bits(2)(0b01)),
+            _enc_r(0, rs2_p, rd_p, 0b100, rd_p, OP_R_TYPE),  # c.xor
+        ),
+        (
+            arith & (c[5:6] == Bits(2)(0b10)),
+            _enc_r(0, rs2_p, rd_p, 0b110, rd_p, OP_R_TYPE),  # c.or
+        ),
+        (
+            arith & (c[5:6] == Bits(2)(0b11)),
+            _enc_r(0, rs2_p, rd_p, 0b111, rd_p, OP_R_TYPE),  # c.and
+        ),
+        (is_op(0b01, 0b101), _enc_j(off_j, x0)),  # c.j
+        (is_op(0b01, 0b110), _enc_b(off_b, rd_p, 0b000)),  # c.beqz
+        (is_op(0b01, 0b111), _enc_b(off_b, rd_p, 0b001)),  # c.bnez
+        # --- Quadrant 2 ---
+        (is_op(0b10, 0b000), _enc_i(shamt, rd, 0b001, rd, OP_I_TYPE)),  # c.slli
+        (is_op(0b10, 0b010), _enc_i(uimm_lwsp, x2, 0b010, rd, OP_LOAD)),  # c.lwsp
+        (
+            cr & ~sign & rs2_zero & ~rd_zero,
+            _enc_i(Bits(12)(0), rd, 0b000, x0, OP_JALR),  # c.jr
+        ),
+        (
+            cr & ~sign & ~rs2_zero,
+            _enc_r(0, rs2, x0, 0b000, rd, OP_R_TYPE),  # c.mv
+        ),
+        (
+            cr & sign & rs2_zero & rd_zero,
+            Bits(32)(0x00100073),  # c.ebreak
+        ),
+        (
+            cr & sign & rs2_zero & ~rd_zero,
+            _enc_i(Bits(12)(0), rd, 0b000, x1, OP_JALR),  # c.jalr
+        ),
+        (
+            cr & sign & ~rs2_zero,
+            _enc_r(0, rs2, rd, 0b000, rd, OP_R_TYPE),  # c.add
+        ),
+        (is_op(0b10, 0b110), _enc_s(uimm_swsp, rs2, x2, 0b010)),  # c.swsp
+    ]
+
+    inst = Bits(32)(0x00000013)  # addi x0, x0, 0
+    for match, expanded in cases:
+        inst = match.select(expanded, inst)
+    return inst
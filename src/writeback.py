@@ -15,7 +15,7 @@ class WriteBack(Module):
         self.name = "WB"
 
     @module.combinational
-    def build(self, reg_file: Array, wb_bypass_reg: Array):
+    def build(self, reg_file: Array):
         # 1. 获取输入 (Consume)
         # 从 MEM->WB 的 FIFO 中弹出数据
         # 由于采用刚性流水线（NOP注入），这里假定总是能 pop 到数据
@@ -33,8 +33,7 @@ class WriteBack(Module):
             # 驱动寄存器堆的 D 端和 WE 端
             reg_file[rd] = wdata
 
-            wb_bypass_reg[0] = wdata
-
-        # 3. 状态反馈 (Feedback to Hazard Unit)
-        # 将当前的 rd 返回，供 DataHazardUnit (Downstream) 使用
-        return rd
+        # 3. 写口反馈 (Write Port)
+        # 寄存器堆写入要到下一周期才可见，这里把本周期的写口 (rd, wdata) 返回，
+        # 供 ID 级 (Downstream) 在同一周期实现写穿透读
+        return rd, wdata
@@ -3,6 +3,9 @@ from assassyn.backend import elaborate, config
 from assassyn import utils
 from assassyn.frontend import SRAM
 
+from src.decoder import DualIssue
+from src.fetch import FetchQueue
+
 def run_test_module(sys_builder, check_func):
     print(f"🚀 Compiling system: {sys_builder.name}...")
 
@@ -57,3 +60,179 @@ def create_initialized_sram(width, depth, init_file=None):
         sram = SRAM(width=width, depth=depth)
     
     return sram
+
+
+# ==============================================================================
+# 指令编码：以程序形式给出激励的测试共用
+# ==============================================================================
+def r_type(funct7, rs2, rs1, funct3, rd, opcode=0b0110011):
+    return (funct7 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+
+def i_type(imm, rs1, funct3, rd, opcode=0b0010011):
+    return ((imm & 0xFFF) << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+
+def s_type(imm, rs2, rs1, funct3):
+    return (
+        (((imm >> 5) & 0x7F) << 25)
+        | (rs2 << 20)
+        | (rs1 << 15)
+        | (funct3 << 12)
+        | ((imm & 0x1F) << 7)
+        | 0b0100011
+    )
+
+
+def b_type(offset, rs2, rs1, funct3):
+    imm = offset & 0x1FFF
+    return (
+        ((imm >> 12) << 31)
+        | (((imm >> 5) & 0x3F) << 25)
+        | (rs2 << 20)
+        | (rs1 << 15)
+        | (funct3 << 12)
+        | (((imm >> 1) & 0xF) << 8)
+        | (((imm >> 11) & 0x1) << 7)
+        | 0b1100011
+    )
+
+
+def u_type(imm20, rd, opcode):
+    return (imm20 << 12) | (rd << 7) | opcode
+
+
+def j_type(offset, rd):
+    imm = offset & 0x1FFFFF
+    return (
+        ((imm >> 20) << 31)
+        | (((imm >> 1) & 0x3FF) << 21)
+        | (((imm >> 11) & 0x1) << 20)
+        | (((imm >> 12) & 0xFF) << 12)
+        | (rd << 7)
+        | 0b1101111
+    )
+
+
+def lw(imm, rs1, rd):
+    return i_type(imm, rs1, 0x2, rd, opcode=0b0000011)
+
+
+def sw(imm, rs2, rs1):
+    return s_type(imm, rs2, rs1, 0x2)
+
+
+def beq(offset, rs2, rs1):
+    return b_type(offset, rs2, rs1, 0x0)
+
+
+# addi x0, x0, 0
+NOP = i_type(0, 0, 0x0, 0)
+
+
+def program_words(program, drain):
+    """取出程序各项的指令字 (第 2 个字段)，结尾补 drain 条 NOP 把最后几条指令推到 WB。"""
+    return [entry[1] for entry in program] + [NOP] * drain
+
+
+# ==============================================================================
+# Driver 模块定义：前三行不能改，这是Assassyn的约定。
+# ==============================================================================
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(self, cycles):
+        cnt = RegArray(UInt(32), 1)
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+
+        with Condition(cnt[0] > UInt(32)(cycles)):
+            finish()
+
+        return cnt
+
+
+class Feeder(Downstream):
+    """代替 IF：每周期送出一条指令 (预测顺序执行)，ID 停顿时重发上一条；
+    给出 branch_target_reg 时，冲刷转到目标。"""
+
+    def __init__(self, words):
+        super().__init__()
+        self.name = "Feeder"
+        self.words = words
+
+    @downstream.combinational
+    def build(
+        self,
+        cnt: Array,
+        dut: Module,
+        icache_dout: Array,
+        stall_if: Bits(1),
+        branch_target_reg: Array = None,
+    ):
+        prev_reg = RegArray(UInt(32), 1)
+        next_reg = RegArray(UInt(32), 1)
+        idx = stall_if.select(prev_reg[0], next_reg[0])
+        if branch_target_reg is not None:
+            target = branch_target_reg[0]
+            idx = (target != Bits(32)(0)).select(
+                (target >> UInt(32)(2)).bitcast(UInt(32)), idx
+            )
+        prev_reg[0] = idx
+        next_reg[0] = idx + UInt(32)(1)
+        log("Feeder: Cycle {} Index {} Stall {}", cnt[0], idx, stall_if)
+
+        pc, inst = Bits(32)(0), Bits(32)(0)
+        for i, w in enumerate(self.words):
+            is_match = idx == UInt(32)(i)
+            pc = is_match.select(Bits(32)(i * 4), pc)
+            inst = is_match.select(Bits(32)(w), inst)
+
+        with Condition(idx < UInt(32)(len(self.words))):
+            dut_call = dut.async_called(pc=pc, next_pc=pc + Bits(32)(4))
+            dut_call.bind.set_fifo_depth(pc=1, next_pc=1)
+            icache_dout[0] = inst
+
+
+class WindowFeeder(Downstream):
+    """代替取指队列：每周期送出两条指令的译码窗口，按停顿 / 双发射前进 0 / 1 / 2 条。"""
+
+    def __init__(self, words):
+        super().__init__()
+        self.name = "Feeder"
+        self.words = words
+
+    @downstream.combinational
+    def build(
+        self,
+        cnt: Array,
+        dut: Module,
+        fetch_queue: FetchQueue,
+        stall_if: Bits(1),
+        dual: DualIssue,
+    ):
+        # prev_reg 为上一周期送出的窗口起点 (初值 -1：第一周期送出第 0 条)
+        prev_reg = RegArray(UInt(32), 1, initializer=[0xFFFFFFFF])
+        prev = prev_reg[0]
+        step = dual.pair.select(UInt(32)(2), UInt(32)(1))
+        idx = stall_if.select(prev, prev + step)
+        prev_reg[0] = idx
+        log("Feeder: Cycle {} Index {} Stall {} Pair {}", cnt[0], idx, stall_if, dual.pair)
+
+        words = self.words
+        inst, inst2 = Bits(32)(0), Bits(32)(0)
+        for i, w in enumerate(words):
+            inst = (idx == UInt(32)(i)).select(Bits(32)(w), inst)
+            inst2 = (idx + UInt(32)(1) == UInt(32)(i)).select(Bits(32)(w), inst2)
+        pc = (idx << UInt(32)(2)).bitcast(Bits(32))
+
+        valid = idx < UInt(32)(len(words))
+        with Condition(valid):
+            fetch_queue.dout[0] = inst
+            fetch_queue.issued[0] = Bits(1)(1)
+            fetch_queue.dout2[0] = inst2
+            fetch_queue.next_pc2[0] = pc + Bits(32)(8)
+            fetch_queue.issued2[0] = idx + UInt(32)(1) < UInt(32)(len(words))
+            dut_call = dut.async_called(pc=pc, next_pc=pc + Bits(32)(4))
+            dut_call.bind.set_fifo_depth(pc=1, next_pc=1)
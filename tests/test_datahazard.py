@@ -9,7 +9,7 @@ from assassyn.backend import elaborate
 from assassyn import utils
 
 # 导入你的设计
-from src.data_hazard import DataHazardUnit
+from src.data_hazard import DataHazardUnit, Scoreboard
 from src.control_signals import *
 from tests.common import run_test_module
 
@@ -23,22 +23,23 @@ class Driver(Module):
 
     @module.combinational
     # [修改] build 函数返回 cnt，使其成为 Output Wire
-    def build(self, dut: Module, hazard_impl: Module):
+    def build(self, dut: Module, scoreboard: Scoreboard):
         # --- 测试向量定义 ---
-        # 格式: (rs1_idx, rs2_idx, rs1_used, rs2_used, ex_rd, ex_is_load, mem_rd, wb_rd)
+        # 格式: (rs1_idx, rs2_idx, rs1_used, rs2_used, ex_rd, ex_is_load, mem_rd)
+        # ex_rd / mem_rd 为 EX / MEM 级写入者的目标寄存器，按此写入记分牌表项
         vectors = [
             # 测试用例1：没有冒险的情况
-            (0x2, 0x3, 1, 1, 0x4, 0, 0x7, 0xA),
+            (0x2, 0x3, 1, 1, 0x4, 0, 0x7),
             # 测试用例2：EX阶段旁路
-            (0x2, 0x4, 1, 1, 0x4, 0, 0x7, 0xA),
+            (0x2, 0x4, 1, 1, 0x4, 0, 0x7),
             # 测试用例3：MEM阶段旁路
-            (0x2, 0x7, 1, 1, 0x4, 0, 0x7, 0xA),
-            # 测试用例4：WB阶段旁路
-            (0x2, 0xA, 1, 1, 0x4, 0, 0x7, 0xA),
+            (0x2, 0x7, 1, 1, 0x4, 0, 0x7),
+            # 测试用例4：WB 级正在写回的寄存器 (x10)：寄存器堆写穿透，直接读寄存器
+            (0x2, 0xA, 1, 1, 0x4, 0, 0x7),
             # 测试用例5：Load-Use冒险（必须停顿）
-            (0x2, 0x4, 1, 1, 0x4, 1, 0x7, 0xA),
+            (0x2, 0x4, 1, 1, 0x4, 1, 0x7),
             # 测试用例6：零寄存器（不应该产生冒险）
-            (0x0, 0x2, 1, 1, 0x0, 0, 0x7, 0xA),
+            (0x0, 0x2, 1, 1, 0x0, 0, 0x7),
         ]
 
         # --- 激励生成逻辑 ---
@@ -57,10 +58,9 @@ class Driver(Module):
         ex_rd = Bits(5)(0)
         ex_is_load = Bits(1)(0)
         mem_rd = Bits(5)(0)
-        wb_rd = Bits(5)(0)
 
         # 这里的循环展开会生成一棵 Mux 树
-        for i, (r1, r2, u1, u2, ex, ex_load, mem, wb) in enumerate(vectors):
+        for i, (r1, r2, u1, u2, ex, ex_load, mem) in enumerate(vectors):
             is_match = idx == UInt(32)(i)
             rs1_idx = is_match.select(Bits(5)(r1), rs1_idx)
             rs2_idx = is_match.select(Bits(5)(r2), rs2_idx)
@@ -69,23 +69,31 @@ class Driver(Module):
             ex_rd = is_match.select(Bits(5)(ex), ex_rd)
             ex_is_load = is_match.select(Bits(1)(ex_load), ex_is_load)
             mem_rd = is_match.select(Bits(5)(mem), mem_rd)
-            wb_rd = is_match.select(Bits(5)(wb), wb_rd)
 
-        # 4. 发送数据
         # 只有当 idx 在向量范围内时才发送 (valid)
         valid_test = idx < UInt(32)(len(vectors))
 
+        # 3. 写记分牌：与请求同一周期写入，DUT 下一周期查表时恰好看到本用例的状态
+        #    EX 级写入者：stage=0b01，Load 的结果还差 1 个周期 (wait=1)；MEM 级：stage=0b10
+        with Condition(valid_test):
+            for r in range(1, 32):
+                in_ex = ex_rd == Bits(5)(r)
+                in_mem = (mem_rd == Bits(5)(r)) & ~in_ex
+                scoreboard.stage[r] = concat(in_mem, in_ex)
+                scoreboard.wait[r] = (in_ex & ex_is_load).select(UInt(2)(1), UInt(2)(0))
+                scoreboard.load_data[r] = in_ex & ex_is_load
+
+        # 4. 发送数据
         with Condition(valid_test):
             # 打印 Driver 发出的请求，方便对比调试
             log(
-                "Driver: Case {} rs1=x{} rs2=x{} ex_rd=x{} ex_is_load={} mem_rd=x{} wb_rd=x{}",
+                "Driver: Case {} rs1=x{} rs2=x{} ex_rd=x{} ex_is_load={} mem_rd=x{}",
                 idx,
                 rs1_idx,
                 rs2_idx,
                 ex_rd,
                 ex_is_load,
                 mem_rd,
-                wb_rd,
             )
 
             # 建立连接 (async_called)
@@ -94,20 +102,12 @@ class Driver(Module):
                 rs2_idx=rs2_idx,
                 rs1_used=rs1_used,
                 rs2_used=rs2_used,
-                ex_rd=ex_rd,
-                ex_is_load=ex_is_load,
-                mem_rd=mem_rd,
-                wb_rd=wb_rd,
             )
             call.bind.set_fifo_depth(
                 rs1_idx=1,
                 rs2_idx=1,
                 rs1_used=1,
                 rs2_used=1,
-                ex_rd=1,
-                ex_is_load=1,
-                mem_rd=1,
-                wb_rd=1,
             )  # 设置 FIFO 深度，防止阻塞
 
         # [关键] 返回 cnt，让它成为模块的输出
@@ -125,22 +125,16 @@ class DataHazardUnitWrapper(Module):
                 "rs2_idx": Port(Bits(5)),
                 "rs1_used": Port(Bits(1)),
                 "rs2_used": Port(Bits(1)),
-                "ex_rd": Port(Bits(5)),
-                "ex_is_load": Port(Bits(1)),
-                "mem_rd": Port(Bits(5)),
-                "wb_rd": Port(Bits(5)),
             }
         )
 
     @module.combinational
     def build(self):
         # 消费端口数据
-        rs1_idx, rs2_idx, rs1_used, rs2_used, ex_rd, ex_is_load, mem_rd, wb_rd = (
-            self.pop_all_ports(False)
-        )
+        rs1_idx, rs2_idx, rs1_used, rs2_used = self.pop_all_ports(False)
 
         # 返回结果
-        return rs1_idx, rs2_idx, rs1_used, rs2_used, ex_rd, ex_is_load, mem_rd, wb_rd
+        return rs1_idx, rs2_idx, rs1_used, rs2_used
 
 
 # ==============================================================================
@@ -151,13 +145,13 @@ def check(raw_output):
 
     # 预期结果映射表 (Case ID -> (rs1_sel, rs2_sel, stall))
     # 注意：这里的预期值必须跟上面修改后的 vectors 对应
-    # Sel: 1=REG, 2=EX, 4=MEM, 8=WB
+    # Sel: 1=REG, 2=EX, 4=MEM
     expected_map = {
         0: (1, 1, 0),  # No Hazard
         1: (1, 2, 0),  # EX Fwd (rs1)
-        2: (1, 4, 0),
-        3: (1, 8, 0),  # MEM Fwd
-        4: (1, 1, 1),  # WB Fwd
+        2: (1, 4, 0),  # MEM Fwd
+        3: (1, 1, 0),  # WB 写穿透 (不需旁路)
+        4: (1, 1, 1),  # Load-Use -> Stall
         5: (1, 1, 0),  # EX Load 优先 -> Stall
     }
 
@@ -233,26 +227,24 @@ if __name__ == "__main__":
         # 实例化DataHazardUnitWrapper
         hazard_wrapper = DataHazardUnitWrapper()
 
+        # 记分牌：表项由 Driver 按测试向量直接写入
+        scoreboard = Scoreboard()
+
         # 实例化Driver
         driver = Driver()
 
         # [关键] 获取 Driver 的返回值 (cnt)
-        driver_cnt = driver.build(hazard_wrapper, hazard_impl)
+        driver_cnt = driver.build(hazard_wrapper, scoreboard)
 
         # 获取 DUT 的返回值 (rs1_sel, rs2_sel, stall_if)
-        rs1_idx, rs2_idx, rs1_used, rs2_used, ex_rd, ex_is_load, mem_rd, wb_rd = (
-            hazard_wrapper.build()
-        )
+        rs1_idx, rs2_idx, rs1_used, rs2_used = hazard_wrapper.build()
 
         hazard_impl.build(
             rs1_idx=rs1_idx,
             rs2_idx=rs2_idx,
             rs1_used=rs1_used,
             rs2_used=rs2_used,
-            ex_rd=ex_rd,
-            ex_is_load=ex_is_load,
-            mem_rd=mem_rd,
-            wb_rd=wb_rd,
+            scoreboard=scoreboard,
         )
 
     run_test_module(sys, check)
@@ -69,7 +69,7 @@ class Driver(Module):
 
         with Condition(valid_test):
             icache_dout[0] = curr_inst
-            dut.async_called(pc=curr_pc)
+            dut.async_called(pc=curr_pc, next_pc=curr_pc + Bits(32)(4))
             # 打印输入，方便定位
             log("Driver Input: Test[{}] Inst=0x{:x}", vec_idx, curr_inst)
 
@@ -286,7 +286,7 @@ if __name__ == "__main__":
         reg_file = RegArray(Bits(32), 32)  # 32个寄存器
 
         rs1_sel = Bits(4)(0)
-        rs2_sel = Bits(4)(0)
+        rs2_sel = Bits(5)(0)
         stall_if = Bits(1)(0)
         branch_target_reg = RegArray(Bits(32), 1)
 
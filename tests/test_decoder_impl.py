@@ -38,8 +38,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000000),
                 Bits(32)(0x002081B3),
-                Bits(4)(0x2),
-                Bits(4)(0x3),
+                Bits(3)(0x2),
+                Bits(3)(0x3),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -47,8 +47,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000004),
                 Bits(32)(0x402081B3),
-                Bits(4)(0x2),
-                Bits(4)(0x3),
+                Bits(3)(0x2),
+                Bits(3)(0x3),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -57,8 +57,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000008),
                 Bits(32)(0x00510093),
-                Bits(4)(0x2),
-                Bits(4)(0x0),
+                Bits(3)(0x2),
+                Bits(3)(0x0),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -67,8 +67,8 @@ class Driver(Module):
             (
                 Bits(32)(0x0000000C),
                 Bits(32)(0x00412083),
-                Bits(4)(0x2),
-                Bits(4)(0x0),
+                Bits(3)(0x2),
+                Bits(3)(0x0),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -77,8 +77,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000010),
                 Bits(32)(0x00112223),
-                Bits(4)(0x2),
-                Bits(4)(0x1),
+                Bits(3)(0x2),
+                Bits(3)(0x1),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -87,8 +87,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000014),
                 Bits(32)(0x00208463),
-                Bits(4)(0x1),
-                Bits(4)(0x2),
+                Bits(3)(0x1),
+                Bits(3)(0x2),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -97,8 +97,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000018),
                 Bits(32)(0x123450B7),
-                Bits(4)(0x0),
-                Bits(4)(0x0),
+                Bits(3)(0x0),
+                Bits(3)(0x0),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -107,8 +107,8 @@ class Driver(Module):
             (
                 Bits(32)(0x0000001C),
                 Bits(32)(0x100000EF),
-                Bits(4)(0x0),
-                Bits(4)(0x0),
+                Bits(3)(0x0),
+                Bits(3)(0x0),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -117,8 +117,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000020),
                 Bits(32)(0x00000073),
-                Bits(4)(0x0),
-                Bits(4)(0x0),
+                Bits(3)(0x0),
+                Bits(3)(0x0),
                 Bits(1)(0),
                 Bits(32)(0),
             ),
@@ -127,8 +127,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000024),
                 Bits(32)(0x002081B3),
-                Bits(4)(0x2),
-                Bits(4)(0x3),
+                Bits(3)(0x2),
+                Bits(3)(0x3),
                 Bits(1)(1),
                 Bits(32)(0),
             ),
@@ -137,8 +137,8 @@ class Driver(Module):
             (
                 Bits(32)(0x00000028),
                 Bits(32)(0x002081B3),
-                Bits(4)(0x2),
-                Bits(4)(0x3),
+                Bits(3)(0x2),
+                Bits(3)(0x3),
                 Bits(1)(0),
                 Bits(32)(0x100),
             ),
@@ -170,7 +170,7 @@ class Driver(Module):
         current_pc = Bits(32)(0)
         current_instruction = Bits(32)(0)
         current_rs1_sel = Bits(4)(0)
-        current_rs2_sel = Bits(4)(0)
+        current_rs2_sel = Bits(5)(0)
         current_stall_if = Bits(1)(0)
         current_branch_target = Bits(32)(0)
 
@@ -198,8 +198,10 @@ class Driver(Module):
         # 打印输入，方便定位
         with Condition(valid_test):
             # 设置Decoder的PC输入
-            dut_call = dut.async_called(pc=current_pc)
-            dut_call.bind.set_fifo_depth(pc=1)
+            dut_call = dut.async_called(
+                pc=current_pc, next_pc=current_pc + Bits(32)(4)
+            )
+            dut_call.bind.set_fifo_depth(pc=1, next_pc=1)
 
             # 设置icache_dout的值
             icache_dout[0] = current_instruction
@@ -0,0 +1,223 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl
+from src.writeback import WriteBack
+from src.data_hazard import Scoreboard
+from src.control_signals import *
+from tests.common import run_test_module
+from tests.test_mock import MockExecutor, MockDataHazardUnit
+
+
+# ==============================================================================
+# 1. Driver 模块定义：前三行不能改，这是Assassyn的约定。
+# ==============================================================================
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(
+        self,
+        dut: Decoder,
+        icache_dout: Array,
+        reg_file: Array,
+        mock_dhu: MockDataHazardUnit,
+        wb: WriteBack,
+    ):
+        # --- 测试向量定义 ---
+        # 格式: (pc, instruction, next_pc, rs1_sel, rs2_sel, stall_if, wb_rd)
+        # wb_rd: 同一周期 WB 级写回 0x10 的寄存器 (0 表示不写)
+        RS1, RS2 = Rs1Sel.RS1, Rs2Sel.RS2
+        vectors = [
+            # jal x1, 0x100 @0x1C，IF 预测 pc+4 -> ID 重定向到 0x11C
+            (0x1C, 0x100000EF, 0x20, RS1, RS2, 0, 0),
+            # 跳转后面那条指令 -> 被 ID 重定向冲刷
+            (0x20, 0x002081B3, 0x24, RS1, RS2, 0, 0),
+            # jal x1, 0x100 @0x1C，IF 已预测正确 -> 不重定向
+            (0x1C, 0x100000EF, 0x11C, RS1, RS2, 0, 0),
+            # jalr x0, 4(x1) @0x40，rs1 无冒险 -> ID 重定向到 0x14
+            (0x40, 0x00408067, 0x44, RS1, RS2, 0, 0),
+            # 跳转后面那条指令 -> 被 ID 重定向冲刷
+            (0x44, 0x002081B3, 0x48, RS1, RS2, 0, 0),
+            # jalr x0, 4(x1) @0x40，rs1 来自 EX 旁路 -> 交给 EX 解析
+            (0x40, 0x00408067, 0x44, Rs1Sel.EX_MEM_BYPASS, RS2, 0, 0),
+            # jal x1, 0x100 @0x1C，Stall -> 不重定向
+            (0x1C, 0x100000EF, 0x20, RS1, RS2, 1, 0),
+            # beq x1, x2, 8 @0x60 (0x10 != 0x20 不跳转)，IF 预测跳转 -> 重定向到 0x64
+            (0x60, 0x00208463, 0x68, RS1, RS2, 0, 0),
+            # 分支后面那条指令 -> 被 ID 重定向冲刷
+            (0x68, 0x002081B3, 0x6C, RS1, RS2, 0, 0),
+            # bne x1, x2, 8 @0x60 (跳转)，IF 预测正确 -> 不重定向
+            (0x60, 0x00209463, 0x68, RS1, RS2, 0, 0),
+            # beq x1, x2, 8 @0x60，x2 同一周期由 WB 写回 0x10 (写穿透，相等跳转) -> 重定向到 0x68
+            (0x60, 0x00208463, 0x64, RS1, RS2, 0, 2),
+            # 分支后面那条指令 -> 被 ID 重定向冲刷
+            (0x64, 0x002081B3, 0x68, RS1, RS2, 0, 0),
+            # blt x1, x2, 8 @0x60，rs2 来自 EX 旁路 -> 交给 EX 解析
+            (0x60, 0x0020C463, 0x64, RS1, Rs2Sel.EX_MEM_BYPASS, 0, 0),
+            # beq x1, x2, 8 @0x60，rs2 来自 MEM 旁路 (旁路寄存器中为 0x10，相等跳转) -> 重定向到 0x68
+            (0x60, 0x00208463, 0x64, RS1, Rs2Sel.MEM_WB_BYPASS, 0, 0),
+            # 分支后面那条指令 -> 被 ID 重定向冲刷
+            (0x64, 0x002081B3, 0x68, RS1, RS2, 0, 0),
+        ]
+
+        cnt = RegArray(UInt(32), 1)
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+        idx = cnt[0]
+
+        # 预设环境：x1=0x10, x2=0x20
+        with Condition(idx == UInt(32)(0)):
+            reg_file[1] = Bits(32)(0x10)
+        with Condition(idx == UInt(32)(1)):
+            reg_file[2] = Bits(32)(0x20)
+
+        vec_idx = idx - UInt(32)(2)
+        valid_test = (idx >= UInt(32)(2)) & (vec_idx < UInt(32)(len(vectors)))
+
+        pc, inst, next_pc = Bits(32)(0), Bits(32)(0), Bits(32)(0)
+        rs1_sel, rs2_sel, stall_if = Bits(4)(0), Bits(5)(0), Bits(1)(0)
+        wb_rd = Bits(5)(0)
+        for i, vec in enumerate(vectors):
+            is_match = vec_idx == UInt(32)(i)
+            pc = is_match.select(Bits(32)(vec[0]), pc)
+            inst = is_match.select(Bits(32)(vec[1]), inst)
+            next_pc = is_match.select(Bits(32)(vec[2]), next_pc)
+            rs1_sel = is_match.select(vec[3], rs1_sel)
+            rs2_sel = is_match.select(vec[4], rs2_sel)
+            stall_if = is_match.select(Bits(1)(vec[5]), stall_if)
+            wb_rd = is_match.select(Bits(5)(vec[6]), wb_rd)
+
+        with Condition(valid_test):
+            dut_call = dut.async_called(pc=pc, next_pc=next_pc)
+            dut_call.bind.set_fifo_depth(pc=1, next_pc=1)
+
+            icache_dout[0] = inst
+
+            call = mock_dhu.async_called(
+                rs1_sel=rs1_sel,
+                rs2_sel=rs2_sel,
+                stall_if=stall_if,
+            )
+            call.bind.set_fifo_depth(rs1_sel=1, rs2_sel=1, stall_if=1)
+
+            wb_call = wb.async_called(ctrl=wb_rd, wdata=Bits(32)(0x10))
+            wb_call.bind.set_fifo_depth(ctrl=1, wdata=1)
+
+        with Condition(idx > UInt(32)(len(vectors) + 4)):
+            finish()
+
+
+# ==============================================================================
+# 2. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证 ID 级重定向...")
+
+    BR_NONE = 0b0000000000000001
+
+    redirects = []
+    executed = []
+    for line in raw_output.split("\n"):
+        m = re.search(r"ID: Redirect PC=0x([0-9a-fA-F]+) Target=0x([0-9a-fA-F]+)", line)
+        if m:
+            redirects.append((int(m.group(1), 16), int(m.group(2), 16)))
+        if "MockExecutor:" in line:
+            br = int(re.search(r"branch_type=0x([0-9a-fA-F]+)", line).group(1), 16)
+            nxt = int(re.search(r"next_addr=0x([0-9a-fA-F]+)", line).group(1), 16)
+            pc = int(re.search(r" pc=0x([0-9a-fA-F]+)", line).group(1), 16)
+            executed.append((pc, br != BR_NONE, nxt))
+
+    expected_redirects = [
+        (0x1C, 0x11C),
+        (0x40, 0x14),
+        (0x60, 0x64),
+        (0x60, 0x68),
+        (0x60, 0x68),
+    ]
+    print(f"Redirects: {redirects}")
+    assert redirects == expected_redirects, "ID redirect mismatch"
+
+    # (pc, 是否仍是有效跳转, 交给 EX 校验的下一条地址)
+    expected_exec = [
+        (0x1C, True, 0x11C),
+        (0x20, False, 0x24),
+        (0x1C, True, 0x11C),
+        (0x40, True, 0x14),
+        (0x44, False, 0x48),
+        (0x40, True, 0x44),
+        (0x1C, False, 0x20),
+        (0x60, True, 0x64),
+        (0x68, False, 0x6C),
+        (0x60, True, 0x68),
+        (0x60, True, 0x68),
+        (0x64, False, 0x68),
+        (0x60, True, 0x64),
+        (0x60, True, 0x68),
+        (0x64, False, 0x68),
+    ]
+    print(f"Executed: {executed}")
+    assert executed[: len(expected_exec)] == expected_exec, "EX packet mismatch"
+
+    print("✅ ID 级重定向验证通过！")
+    print("  - JAL 与无冒险 JALR 在 ID 级解析并重定向")
+    print("  - 条件分支经 ID 级比较器解析，WB 同周期写回的操作数经写穿透可用")
+    print("  - MEM 旁路的操作数取自旁路寄存器，同样在 ID 级解析")
+    print("  - 跳转后面那条指令被冲刷")
+    print("  - 预测正确、操作数需 EX 旁路、Stall 时不重定向")
+
+
+# ==============================================================================
+# 3. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_decoder_redirect")
+
+    with sys:
+        driver = Driver()
+        dut = Decoder()
+        dut_impl = DecoderImpl()
+        executor = MockExecutor()
+        datahazardunit = MockDataHazardUnit()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        id_redirect_reg = RegArray(id_redirect_signals, 1)
+        # MEM 级写入者的结果 (记分牌为空，写入者均不是 Load / 乘法)
+        mem_stage_bypass = RegArray(Bits(32), 1, initializer=[0x10])
+        scoreboard = Scoreboard()
+
+        wb = WriteBack()
+
+        driver.build(dut, icache_dout, reg_file, datahazardunit, wb)
+
+        pre_pkt, rs1, rs2, _, _ = dut.build(icache_dout, reg_file)
+        stall_if, rs1_sel, rs2_sel = datahazardunit.build()
+        wb_rd, wb_data = wb.build(reg_file)
+
+        dut_impl.build(
+            pre_pkt,
+            executor,
+            rs1_sel,
+            rs2_sel,
+            stall_if,
+            branch_target_reg,
+            id_redirect_reg=id_redirect_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            mem_stage_bypass=mem_stage_bypass,
+        )
+
+        executor.build()
+
+    run_test_module(sys, check)
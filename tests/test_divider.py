@@ -0,0 +1,140 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.execution import IterativeDivider
+from src.control_signals import *
+from tests.common import run_test_module
+
+
+# 格式: (alu_func, a, b)
+VECTORS = [
+    (ALUOp.DIVU, 100, 7),
+    (ALUOp.REMU, 100, 7),
+    (ALUOp.DIV, 0xFFFFFF9C, 7),  # -100 / 7
+    (ALUOp.REM, 0xFFFFFF9C, 7),  # -100 % 7
+    (ALUOp.DIV, 100, 0xFFFFFFF9),  # 100 / -7
+    (ALUOp.REM, 100, 0xFFFFFFF9),
+    (ALUOp.DIVU, 3, 5),  # 小于除数：不迭代
+    (ALUOp.DIVU, 0xFFFFFFFF, 1),  # 最长：32 次迭代
+    (ALUOp.DIV, 0x12345678, 0),  # 除零
+    (ALUOp.REMU, 0x12345678, 0),
+    (ALUOp.DIV, 0x80000000, 0xFFFFFFFF),  # 溢出
+    (ALUOp.REM, 0x80000000, 0xFFFFFFFF),
+]
+
+
+# ==============================================================================
+# 1. Driver 模块定义：前三行不能改，这是Assassyn的约定。
+# ==============================================================================
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(self, divider: IterativeDivider):
+        cycle = RegArray(UInt(32), 1, initializer=[0])
+        cycle[0] = cycle[0] + UInt(32)(1)
+
+        # 上一条除法给出结果后才发出下一条
+        idx = RegArray(UInt(32), 1, initializer=[0])
+        pending = RegArray(Bits(1), 1, initializer=[0])
+        issued_at = RegArray(UInt(32), 1, initializer=[0])
+
+        alu_func, a, b = ALUOp.NOP, Bits(32)(0), Bits(32)(0)
+        for i, (f, va, vb) in enumerate(VECTORS):
+            is_match = idx[0] == UInt(32)(i)
+            alu_func = is_match.select(f, alu_func)
+            a = is_match.select(Bits(32)(va), a)
+            b = is_match.select(Bits(32)(vb), b)
+
+        valid = ~pending[0] & (idx[0] < UInt(32)(len(VECTORS)))
+        # rd 用作向量编号 (从 1 开始)
+        rd = (idx[0] + UInt(32)(1)).bitcast(Bits(32))[0:4]
+        start, done, result, done_rd, _ = divider.step(alu_func, a, b, rd, valid)
+
+        pending[0] = (pending[0] | start) & ~done
+        with Condition(start):
+            idx[0] = idx[0] + UInt(32)(1)
+            issued_at[0] = cycle[0]
+        with Condition(done):
+            log(
+                "DIV: Vec={} Result=0x{:x} Latency={}",
+                done_rd,
+                result,
+                cycle[0] - issued_at[0],
+            )
+
+        with Condition(cycle[0] > UInt(32)(len(VECTORS) * 40)):
+            finish()
+
+
+# ==============================================================================
+# 2. 验证逻辑 (Python Check)
+# ==============================================================================
+def reference(func, a, b):
+    sa = a - (1 << 32) if a >> 31 else a
+    sb = b - (1 << 32) if b >> 31 else b
+    is_signed = func is ALUOp.DIV or func is ALUOp.REM
+    want_rem = func is ALUOp.REM or func is ALUOp.REMU
+    if b == 0:
+        return a if want_rem else 0xFFFFFFFF
+    if not is_signed:
+        return a % b if want_rem else a // b
+    if sa == -(1 << 31) and sb == -1:
+        return 0 if want_rem else 0x80000000
+    q = abs(sa) // abs(sb)
+    q = -q if (sa < 0) != (sb < 0) else q
+    return ((sa - q * sb) if want_rem else q) & 0xFFFFFFFF
+
+
+def latency(func, a, b):
+    """提前结束：迭代次数为商的有效位数，不足一次时为 1 个周期。"""
+    is_signed = func is ALUOp.DIV or func is ALUOp.REM
+    ua = (-a) & 0xFFFFFFFF if is_signed and a >> 31 else a
+    ub = (-b) & 0xFFFFFFFF if is_signed and b >> 31 else b
+    if ub == 0 or ua < ub:
+        return 1
+    return ua.bit_length() - ub.bit_length() + 1
+
+
+def check(raw_output):
+    print(">>> 开始验证多周期除法器...")
+
+    results = []
+    for line in raw_output.split("\n"):
+        m = re.search(r"DIV: Vec=(\d+) Result=0x([0-9a-fA-F]+) Latency=(\d+)", line)
+        if m:
+            results.append((int(m.group(1)), int(m.group(2), 16), int(m.group(3))))
+
+    print(f"Results: {[(v, hex(r), l) for v, r, l in results]}")
+    assert len(results) == len(VECTORS), "Missing divider results"
+    for i, ((vec, r, lat), (f, a, b)) in enumerate(zip(results, VECTORS)):
+        assert vec == i + 1, f"Vector {i}: out of order ({vec})"
+        expected = reference(f, a, b)
+        assert r == expected, f"Vector {i}: 0x{r:08x} != 0x{expected:08x}"
+        assert lat == latency(f, a, b), f"Vector {i}: latency {lat} != {latency(f, a, b)}"
+
+    print("✅ 多周期除法器验证通过！")
+    print("  - DIV/DIVU/REM/REMU，含除零与溢出")
+    print("  - 迭代次数随商的有效位数提前结束")
+
+
+# ==============================================================================
+# 3. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_divider")
+
+    with sys:
+        divider = IterativeDivider()
+        driver = Driver()
+
+        driver.build(divider)
+
+    run_test_module(sys, check)
@@ -0,0 +1,220 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl, DualIssue
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution, PipelinedMultiplier, AluLane
+from src.fetch import FetchQueue
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    lw,
+    sw,
+    program_words,
+    Driver,
+    WindowFeeder,
+)
+from tests.test_mock import MockSRAM
+
+
+# 格式: (助记符, 指令字)
+# MockSRAM 不保存数据，Load 读出的值恒为 0
+PROGRAM = [
+    ("addi x1, x0, 5", i_type(5, 0, 0x0, 1)),
+    ("addi x2, x0, 7", i_type(7, 0, 0x0, 2)),  # 双发射：两条无关
+    ("add  x3, x1, x2", r_type(0x00, 2, 1, 0x0, 3)),  # x1 取第 0 路 EX 旁路，x2 取第 1 路
+    ("sub  x4, x2, x1", r_type(0x20, 1, 2, 0x0, 4)),  # 双发射：第 1 路取第 0 路的旁路
+    ("xor  x5, x3, x4", r_type(0x00, 4, 3, 0x4, 5)),
+    ("or   x6, x5, x1", r_type(0x00, 1, 5, 0x6, 6)),  # 读上一条的 rd：不配对
+    ("and  x7, x4, x3", r_type(0x00, 3, 4, 0x7, 7)),  # 双发射
+    ("lw   x8, 16(x0)", lw(16, 0, 8)),
+    ("addi x9, x6, 1", i_type(1, 6, 0x0, 9)),  # 双发射：Load 在第 0 路
+    ("add  x10, x8, x9", r_type(0x00, 9, 8, 0x0, 10)),  # Load-Use：停顿 1 拍后与下一条配对
+    ("slli x11, x9, 2", i_type(2, 9, 0x1, 11)),
+    ("mul  x12, x10, x11", r_type(0x01, 11, 10, 0x0, 12)),
+    ("addi x13, x11, -3", i_type(-3, 11, 0x0, 13)),  # 双发射：乘法在第 0 路
+    ("add  x14, x13, x12", r_type(0x00, 12, 13, 0x0, 14)),  # 乘法结果紧随使用：停顿 1 拍
+    ("addi x15, x12, 1", i_type(1, 12, 0x0, 15)),  # 双发射：乘法结果经 MEM 旁路
+    ("addi x16, x14, 1", i_type(1, 14, 0x0, 16)),
+    ("lw   x17, 20(x0)", lw(20, 0, 17)),  # 第二条访存：不配对
+    ("addi x18, x17, 2", i_type(2, 17, 0x0, 18)),
+    ("addi x19, x0, 9", i_type(9, 0, 0x0, 19)),
+    ("addi x20, x19, 1", i_type(1, 19, 0x0, 20)),
+    ("add  x21, x20, x0", r_type(0x00, 0, 20, 0x0, 21)),
+    ("mul  x22, x1, x2", r_type(0x01, 2, 1, 0x0, 22)),  # 第二条是乘法：不配对
+    ("add  x23, x22, x1", r_type(0x00, 1, 22, 0x0, 23)),
+    ("sw   x23, 32(x0)", sw(32, 23, 0)),
+    ("addi x24, x23, 4", i_type(4, 23, 0x0, 24)),  # 双发射：Store 在第 0 路
+    ("add  x25, x24, x23", r_type(0x00, 23, 24, 0x0, 25)),  # x24 取第 1 路 EX 旁路
+]
+
+# 第 1 路发出的指令地址 (按上面的配对规则与 Load/乘法延迟 2 推得)
+EXPECTED_PAIRS = [0x04, 0x0C, 0x18, 0x20, 0x28, 0x30, 0x38, 0x48, 0x60]
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 6
+
+
+def reference():
+    """按程序顺序执行，得到每个寄存器的写回序列与 (addr, data) 写存储器序列。"""
+    regs = [0] * 32
+    writes, stores = {}, []
+    for _, inst in PROGRAM:
+        opcode, rd = inst & 0x7F, (inst >> 7) & 0x1F
+        f3, rs1, rs2 = (inst >> 12) & 0x7, (inst >> 15) & 0x1F, (inst >> 20) & 0x1F
+        f7 = inst >> 25
+        a, b = regs[rs1], regs[rs2]
+        if opcode == 0b0100011:
+            stores.append((a + ((f7 << 5) | rd), b))
+            continue
+        if opcode == 0b0000011:
+            val = 0
+        elif opcode == 0b0010011:
+            imm = inst >> 20
+            imm = imm - (1 << 12) if imm >> 11 else imm
+            val = a << (imm & 0x1F) if f3 == 0x1 else a + imm
+        elif f7 == 0x01:
+            val = a * b
+        elif f7 == 0x20:
+            val = a - b
+        else:
+            val = {0x0: a + b, 0x4: a ^ b, 0x6: a | b, 0x7: a & b}[f3]
+        if rd != 0:
+            regs[rd] = val & 0xFFFFFFFF
+            writes.setdefault(rd, []).append(regs[rd])
+    return writes, stores
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证双发射...")
+
+    writes, stores, pairs = {}, [], []
+    lane1 = 0
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.setdefault(int(m.group(1)), []).append(int(m.group(2), 16))
+            lane1 += "(lane 1)" in line
+        m = re.search(r"SRAM: .*WRITE addr=0x([0-9a-fA-F]+) wdata=0x([0-9a-fA-F]+)", line)
+        if m:
+            stores.append((int(m.group(1), 16), int(m.group(2), 16)))
+        m = re.search(r"ID: Dual issue PC=0x([0-9a-fA-F]+)", line)
+        if m and int(m.group(1), 16) < len(PROGRAM) * 4:
+            pairs.append(int(m.group(1), 16))
+
+    expected_writes, expected_stores = reference()
+    print(f"Writes:   {writes}")
+    print(f"Expected: {expected_writes}")
+    print(f"Stores:   {[(hex(a), hex(v)) for a, v in stores]}")
+    print(f"Pairs:    {[hex(p) for p in pairs]}")
+    # 同一周期两个写口的日志先后不定，按寄存器比较写回序列
+    assert writes == expected_writes, "Write-back mismatch"
+    assert stores == expected_stores, "Store sequence mismatch"
+    assert pairs == EXPECTED_PAIRS, "Dual-issue pairs mismatch"
+    assert lane1 == len(EXPECTED_PAIRS), "Second lane write-back count mismatch"
+
+    print("✅ 双发射验证通过！")
+    print("  - 无关的两条同周期发出，第二条只含 ALU 操作")
+    print("  - 两条相关、第二条访存 / 乘法或操作数未就绪时不配对")
+    print("  - 两个通道之间经 EX/MEM 旁路与写穿透互相取得结果")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_dual_issue")
+
+    with sys:
+        driver = Driver()
+        feeder = WindowFeeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution()
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+        alu_lane = AluLane()
+
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+        multiplier = PipelinedMultiplier()
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+        scoreboard.register(latency=2, alu_ops=PipelinedMultiplier.OPS)
+
+        fetch_queue = FetchQueue(depth=4, width=2, lookahead=True)
+        dual = DualIssue(fetch_queue, scoreboard)
+
+        cnt = driver.build(len(PROGRAM) * 4)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        wb_rd2, wb_data2 = alu_lane.build(
+            dual=dual,
+            reg_file=reg_file,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+        )
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg, multiplier=multiplier)
+        executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+            multiplier=multiplier,
+            dual=dual,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(
+            fetch_queue.dout, reg_file, dual=dual
+        )
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            pre=pre_pkt,
+            scoreboard=scoreboard,
+            dual=dual,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            dual=dual,
+            wb_rd2=wb_rd2,
+            wb_data2=wb_data2,
+        )
+        feeder.build(cnt, decoder, fetch_queue, stall_if, dual)
+
+        sys.expose_on_top(reg_file, kind="Output")
+        for stat in dual.stats():
+            sys.expose_on_top(stat, kind="Output")
+
+    run_test_module(sys, check)
@@ -0,0 +1,184 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl, EarlyAGU
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    lw,
+    sw,
+    program_words,
+    Driver,
+    Feeder,
+)
+from tests.test_mock import MockSRAM
+
+
+# 格式: (助记符, 指令字)
+# MockSRAM 不保存数据，Load 读出的值恒为 0
+PROGRAM = [
+    ("addi x1, x0, 5", i_type(5, 0, 0x0, 1)),
+    ("addi x3, x0, 40", i_type(40, 0, 0x0, 3)),
+    ("lw   x1, 16(x0)", lw(16, 0, 1)),  # 基址 x0：ID 级提前读取
+    ("addi x2, x1, 7", i_type(7, 1, 0x0, 2)),  # 经 EX 旁路取得 Load 结果，不停顿
+    ("lw   x4, 0(x3)", lw(0, 3, 4)),  # x3 正在 WB 写回 (写穿透)：提前读取
+    ("add  x5, x4, x2", r_type(0x00, 2, 4, 0x0, 5)),  # 不停顿
+    ("addi x6, x0, 8", i_type(8, 0, 0x0, 6)),
+    ("lw   x7, 4(x6)", lw(4, 6, 7)),  # 基址需要 EX 旁路：回到 EX 级读取
+    ("addi x8, x7, 1", i_type(1, 7, 0x0, 8)),  # Load-Use：停顿 1 拍
+    ("sw   x8, 0(x0)", sw(0, 8, 0)),
+    ("lw   x9, 0(x0)", lw(0, 0, 9)),  # EX 级的 Store 占用端口：回到 EX 级读取
+    ("add  x10, x9, x9", r_type(0x00, 9, 9, 0x0, 10)),  # Load-Use：停顿 1 拍
+    ("lw   x11, 8(x0)", lw(8, 0, 11)),  # 连续两条提前读取
+    ("lw   x12, 12(x11)", lw(12, 11, 12)),  # 基址需要 EX 旁路：回到 EX 级读取
+]
+
+# 提前读取的 Load 条数与 Load-Use 停顿周期数
+EXPECTED_EARLY = 3
+EXPECTED_STALLS = 2
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 4
+
+
+def reference():
+    """按程序顺序执行，得到 (rd, value) 写回序列 (rd != 0) 与 (addr, data) 写存储器序列。"""
+    regs = [0] * 32
+    writes, stores = [], []
+    for _, inst in PROGRAM:
+        opcode, rd = inst & 0x7F, (inst >> 7) & 0x1F
+        f3, rs1, rs2 = (inst >> 12) & 0x7, (inst >> 15) & 0x1F, (inst >> 20) & 0x1F
+        f7 = inst >> 25
+        a, b = regs[rs1], regs[rs2]
+        if opcode == 0b0100011:
+            stores.append((a + ((f7 << 5) | rd), b))
+            continue
+        if opcode == 0b0000011:
+            val = 0
+        elif opcode == 0b0010011:
+            imm = inst >> 20
+            val = a + (imm - (1 << 12) if imm >> 11 else imm)
+        elif f7 == 0x01:
+            val = {0x0: a * b, 0x4: a // b, 0x6: a % b}[f3]
+        else:
+            val = a + b
+        if rd != 0:
+            regs[rd] = val & 0xFFFFFFFF
+            writes.append((rd, regs[rd]))
+    return writes, stores
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证译码级地址生成...")
+
+    writes, stores = [], []
+    stalls, early = 0, 0
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.append((int(m.group(1)), int(m.group(2), 16)))
+        m = re.search(r"SRAM: .*WRITE addr=0x([0-9a-fA-F]+) wdata=0x([0-9a-fA-F]+)", line)
+        if m:
+            stores.append((int(m.group(1), 16), int(m.group(2), 16)))
+        if re.search(r"DataHazardUnit: .*stall_if=1", line):
+            stalls += 1
+        if "AGU: Early load" in line:
+            early += 1
+
+    expected_writes, expected_stores = reference()
+    print(f"Writes:   {[(rd, hex(v)) for rd, v in writes]}")
+    print(f"Expected: {[(rd, hex(v)) for rd, v in expected_writes]}")
+    print(f"Stores:   {[(hex(a), hex(v)) for a, v in stores]}")
+    print(f"Early loads: {early}, stall cycles: {stalls}")
+    assert writes == expected_writes, "Write-back sequence mismatch"
+    assert stores == expected_stores, "Store sequence mismatch"
+    assert early == EXPECTED_EARLY, f"Expected {EXPECTED_EARLY} early loads"
+    assert stalls == EXPECTED_STALLS, f"Expected {EXPECTED_STALLS} load-use stalls"
+
+    print("✅ 译码级地址生成验证通过！")
+    print("  - 基址就绪的 Load 在 ID 级读取，紧随其后的相关指令不停顿")
+    print("  - 基址需要旁路或 EX 占用端口时回到 EX 级读取")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_early_agu")
+
+    with sys:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution()
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+        agu = EarlyAGU(dcache)
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+
+        cnt = driver.build(len(PROGRAM) * 8)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg)
+        executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+            agu=agu,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            pre=pre_pkt,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            agu=agu,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if)
+
+        sys.expose_on_top(reg_file, kind="Output")
+
+    run_test_module(sys, check)
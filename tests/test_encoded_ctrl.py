@@ -0,0 +1,188 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    u_type,
+    s_type,
+    b_type,
+    j_type,
+    program_words,
+    Driver,
+    Feeder,
+)
+from tests.test_mock import MockSRAM
+
+M32 = 0xFFFFFFFF
+
+
+def _s32(x):
+    return x - (1 << 32) if x >> 31 else x
+
+
+# 格式: (助记符, 指令字, 目标寄存器, 期望值函数 f(regs, pc))
+# 覆盖 ALUOp 的高低位 (czero 位于最高段)、三种操作数来源、全部旁路来源与各类分支功能码。
+# 分支/跳转的目标都是下一条指令，与 Feeder 的顺序预测一致，不会冲刷；
+# 译码错一位的功能码都会让写回序列或跳转目标出错。MockSRAM 不保存数据，Load 读出的值恒为 0
+PROGRAM = [
+    ("lui   x1, 0x12345", u_type(0x12345, 1, 0b0110111), 1, lambda r, pc: 0x12345000),
+    ("addi  x2, x0, -7", i_type(-7, 0, 0x0, 2), 2, lambda r, pc: -7 & M32),
+    ("auipc x3, 1", u_type(1, 3, 0b0010111), 3, lambda r, pc: pc + 0x1000),
+    ("sub   x4, x1, x2", r_type(0x20, 2, 1, 0x0, 4), 4, lambda r, pc: (r[1] - r[2]) & M32),
+    ("sll   x5, x2, x2", r_type(0x00, 2, 2, 0x1, 5), 5, lambda r, pc: (r[2] << (r[2] & 31)) & M32),
+    ("srai  x6, x2, 1", i_type(0x401, 2, 0x5, 6), 6, lambda r, pc: (_s32(r[2]) >> 1) & M32),
+    ("srli  x7, x2, 28", i_type(28, 2, 0x5, 7), 7, lambda r, pc: r[2] >> 28),
+    ("slt   x8, x2, x0", r_type(0x00, 0, 2, 0x2, 8), 8, lambda r, pc: int(_s32(r[2]) < 0)),
+    ("sltu  x9, x0, x2", r_type(0x00, 2, 0, 0x3, 9), 9, lambda r, pc: int(0 < r[2])),
+    ("and   x10, x1, x4", r_type(0x00, 4, 1, 0x7, 10), 10, lambda r, pc: r[1] & r[4]),
+    ("or    x11, x1, x2", r_type(0x00, 2, 1, 0x6, 11), 11, lambda r, pc: r[1] | r[2]),
+    ("xor   x12, x11, x5", r_type(0x00, 5, 11, 0x4, 12), 12, lambda r, pc: r[11] ^ r[5]),
+    ("beq   x0, x0, +4", b_type(4, 0, 0, 0x0), 0, None),  # 跳转，目标即下一条
+    ("bne   x0, x0, +8", b_type(8, 0, 0, 0x1), 0, None),  # 不跳转
+    ("blt   x2, x0, +4", b_type(4, 0, 2, 0x4), 0, None),
+    ("bgeu  x0, x2, +8", b_type(8, 2, 0, 0x7), 0, None),
+    ("jal   x13, +4", j_type(4, 13), 13, lambda r, pc: pc + 4),
+    ("jalr  x14, 72(x0)", i_type(72, 0, 0x0, 14, opcode=0b1100111), 14, lambda r, pc: pc + 4),
+    ("sw    x4, 8(x0)", s_type(8, 4, 0, 0x2), 0, None),
+    ("lw    x15, 8(x0)", i_type(8, 0, 0x2, 15, opcode=0b0000011), 15, lambda r, pc: 0),
+    ("lbu   x16, 1(x0)", i_type(1, 0, 0x4, 16, opcode=0b0000011), 16, lambda r, pc: 0),
+    ("add   x17, x16, x4", r_type(0x00, 4, 16, 0x0, 17), 17, lambda r, pc: r[4]),  # Load-Use
+    ("andn  x18, x1, x2", r_type(0x20, 2, 1, 0x7, 18), 18, lambda r, pc: r[1] & ~r[2] & M32),
+    ("czero.eqz x19, x1, x9", r_type(0x07, 9, 1, 0x5, 19), 19, lambda r, pc: r[1] if r[9] else 0),
+]
+
+# jalr 的目标是绝对地址，须等于下一条指令的地址
+assert PROGRAM[17][1] == i_type(17 * 4 + 4, 0, 0x0, 14, opcode=0b1100111)
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 4
+
+BRANCH_TYPES = ["BEQ", "BNE", "BLT", "BGEU", "JAL", "JALR"]
+
+
+def reference():
+    """按程序顺序执行，得到 (rd, value) 写回序列 (rd != 0)。"""
+    regs = [0] * 32
+    writes = []
+    for i, (_, _, rd, fn) in enumerate(PROGRAM):
+        if fn is None:
+            continue
+        regs[rd] = fn(regs, i * 4) & M32
+        writes.append((rd, regs[rd]))
+    return writes
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证编码的控制字段...")
+
+    writes, stores, branch_types = [], [], []
+    taken = 0
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.append((int(m.group(1)), int(m.group(2), 16)))
+        m = re.search(r"SRAM: .*WRITE addr=0x([0-9a-fA-F]+) wdata=0x([0-9a-fA-F]+)", line)
+        if m:
+            stores.append((int(m.group(1), 16), int(m.group(2), 16)))
+        m = re.search(r"EX: Branch Type: (\w+)", line)
+        if m and m.group(1) != "NO_BRANCH":
+            branch_types.append(m.group(1))
+        if "EX: Branch Taken: True" in line:
+            taken += 1
+
+    expected = reference()
+    regs = dict(expected)
+    print(f"Writes:   {[(rd, hex(v)) for rd, v in writes]}")
+    print(f"Expected: {[(rd, hex(v)) for rd, v in expected]}")
+    print(f"Stores:   {[(hex(a), hex(v)) for a, v in stores]}")
+    print(f"Branch types: {branch_types}, taken: {taken}")
+    assert writes == expected, "Write-back sequence mismatch"
+    assert stores == [(8, regs[4])], "Store mismatch"
+    assert branch_types == BRANCH_TYPES, "Branch type decoded wrongly"
+    assert taken == 4, "Branch direction decoded wrongly"
+
+    print("✅ 编码的控制字段验证通过！")
+    print("  - ALU 功能码、操作数/旁路来源、访存格式经二进制下标传递后译回一致")
+    print("  - 分支功能码与方向正确，目标与顺序预测一致，无冲刷")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_encoded_ctrl")
+
+    with sys:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution(encoded=True)
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+
+        cnt = driver.build(len(PROGRAM) * 4)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg)
+        executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if)
+
+        sys.expose_on_top(reg_file, kind="Output")
+
+    run_test_module(sys, check)
@@ -33,12 +33,11 @@ class Driver(Module):
         dut: Module,
         ex_mem_bypass: Array,
         mem_wb_bypass: Array,
-        wb_bypass: Array,
         mock_feedback: Module,
     ):
         # --- 测试向量定义 ---
         # 格式: (alu_func, rs1_sel, rs2_sel, op1_sel, op2_sel, branch_type,
-        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, wb_fwd, expected_result)
+        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, expected_result)
         #
         # alu_func: ALU功能码 (独热码)
         # rs1_sel/rs2_sel: 数据来源选择 (独热码)
@@ -51,7 +50,6 @@ class Driver(Module):
         # imm: 立即数
         # ex_mem_fwd: EX-MEM旁路数据
         # mem_wb_fwd: MEM-WB旁路数据
-        # wb_fwd: WB旁路数据 (来自写回阶段的旁路数据)
         # expected_result: 预期的ALU结果
 
         vectors = [
@@ -71,7 +69,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(30),
             ),
             # Case 1: SUB 指令 (rs1 - rs2)
@@ -89,7 +86,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(10),
             ),
             # Case 2: AND 指令 (rs1 & rs2)
@@ -107,7 +103,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(0x00000000),
             ),
             # Case 3: OR 指令 (rs1 | rs2)
@@ -125,7 +120,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(0xFFFFFFFF),
             ),
             # Case 4: SLL 指令 (rs1 << rs2[4:0])
@@ -143,7 +137,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(0x0000003C),
             ),
             # Case 5: SRL 指令 (rs1 >> rs2[4:0])
@@ -161,7 +154,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(0x3FFFFFFF),
             ),
             # Case 6: SRA 指令 (有符号右移)
@@ -179,7 +171,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(0xFFFFFFFC),
             ),
             # Case 7: SLT 指令 (有符号比较)
@@ -197,7 +188,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
                 Bits(32)(1),
             ),
             # Case 8: SLTU 指令 (无符号比较)
@@ -216,7 +206,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(0),
             ),
         ]
 
@@ -229,9 +218,9 @@ class Driver(Module):
 
         # 组合逻辑 Mux：根据 idx 选择当前的测试向量
         # 初始化默认值
-        current_alu_func = Bits(16)(0)
+        current_alu_func = Bits(ALU_WIDTH)(0)
         current_rs1_sel = Bits(4)(0)
-        current_rs2_sel = Bits(4)(0)
+        current_rs2_sel = Bits(5)(0)
         current_op1_sel = Bits(3)(0)
         current_op2_sel = Bits(3)(0)
         current_branch_type = Bits(16)(0)
@@ -242,7 +231,6 @@ class Driver(Module):
         current_imm = Bits(32)(0)
         current_ex_mem_fwd = Bits(32)(0)
         current_mem_wb_fwd = Bits(32)(0)
-        current_wb_fwd = Bits(32)(0)
         current_expected = Bits(32)(0)
 
         # 这里的循环展开会生成一棵 Mux 树
@@ -260,7 +248,6 @@ class Driver(Module):
             imm,
             ex_mem_fwd,
             mem_wb_fwd,
-            wb_fwd,
             expected,
         ) in enumerate(vectors):
             is_match = idx == UInt(32)(i)
@@ -278,7 +265,6 @@ class Driver(Module):
             current_imm = is_match.select(imm, current_imm)
             current_ex_mem_fwd = is_match.select(ex_mem_fwd, current_ex_mem_fwd)
             current_mem_wb_fwd = is_match.select(mem_wb_fwd, current_mem_wb_fwd)
-            current_wb_fwd = is_match.select(wb_fwd, current_wb_fwd)
             current_expected = is_match.select(expected, current_expected)
 
         dynamic_rd_addr = (idx == idx).select(Bits(5)(1), Bits(5)(1))
@@ -301,13 +287,14 @@ class Driver(Module):
             op2_sel=current_op2_sel,
             branch_type=current_branch_type,
             next_pc_addr=current_next_pc_addr,
+            ras_op=RasOp.NONE,
+            is_rvc=Bits(1)(0),
             mem_ctrl=mem_ctrl,
         )
 
         # 设置旁路数据
         ex_mem_bypass[0] = current_ex_mem_fwd
         mem_wb_bypass[0] = current_mem_wb_fwd
-        wb_bypass[0] = current_wb_fwd
 
         # 7. 发送数据到Execution模块
         # 只有当 idx 在向量范围内时才发送 (valid)
@@ -317,7 +304,7 @@ class Driver(Module):
             finish()
 
         log(
-            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} wb_fwd=0x{:x} expected=0x{:x}",
+            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} expected=0x{:x}",
             idx,
             current_alu_func,
             current_rs1_sel,
@@ -331,7 +318,6 @@ class Driver(Module):
             current_imm,
             current_ex_mem_fwd,
             current_mem_wb_fwd,
-            current_wb_fwd,
             current_expected,
         )
 
@@ -394,7 +380,6 @@ if __name__ == "__main__":
         # 创建旁路寄存器和分支目标寄存器
         ex_mem_bypass = RegArray(Bits(32), 1)
         mem_wb_bypass = RegArray(Bits(32), 1)
-        wb_bypass = RegArray(Bits(32), 1)
         branch_target_reg = RegArray(Bits(32), 1)
 
         # [关键] 获取 Driver 的返回值
@@ -402,7 +387,6 @@ if __name__ == "__main__":
             dut,
             ex_mem_bypass,
             mem_wb_bypass,
-            wb_bypass,
             mock_feedback,
         )
 
@@ -411,7 +395,6 @@ if __name__ == "__main__":
             mem_module=mock_mem_module,
             ex_mem_bypass=ex_mem_bypass,
             mem_wb_bypass=mem_wb_bypass,
-            wb_bypass=wb_bypass,
             branch_target_reg=branch_target_reg,
             dcache=mock_sram,
         )
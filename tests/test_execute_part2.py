@@ -35,12 +35,11 @@ class Driver(Module):
         dut: Module,
         ex_mem_bypass: Array,
         mem_wb_bypass: Array,
-        wb_bypass: Array,
         mock_feedback: Module,
     ):
         # --- 测试向量定义 ---
         # 格式: (alu_func, rs1_sel, rs2_sel, op1_sel, op2_sel, branch_type,
-        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, wb_fwd, expected_result)
+        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, expected_result)
         #
         # alu_func: ALU功能码 (独热码)
         # rs1_sel/rs2_sel: 数据来源选择 (独热码)
@@ -53,7 +52,6 @@ class Driver(Module):
         # imm: 立即数
         # ex_mem_fwd: EX-MEM旁路数据
         # mem_wb_fwd: MEM-WB旁路数据
-        # wb_fwd: WB旁路数据 (来自写回阶段的旁路数据)
         # expected_result: 预期的ALU结果
 
         vectors = [
@@ -73,7 +71,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(100),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(120),
             ),
             # Case 1: 使用MEM-WB旁路数据
@@ -91,117 +88,110 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(200),
-                Bits(32)(150),
                 Bits(32)(220),
             ),
-            # --- WB旁路测试 ---
-            # Case 2: 使用WB_BYPASS的ADD指令
+            # --- 写穿透测试 (WB 写回值在 ID 级已读入 rs1_data，EX 直接使用寄存器数据) ---
+            # Case 2: 写穿透读出操作数的ADD指令
             (
                 ALUOp.ADD,
-                Rs1Sel.WB_BYPASS,
+                Rs1Sel.RS1,
                 Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
-                Bits(32)(10),
+                Bits(32)(250),
                 Bits(32)(20),
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(300),
-                Bits(32)(250),
                 Bits(32)(270),
             ),
-            # Case 3: 使用WB_BYPASS的SUB指令
+            # Case 3: 写穿透读出操作数的SUB指令
             (
                 ALUOp.SUB,
-                Rs1Sel.WB_BYPASS,
+                Rs1Sel.RS1,
                 Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
-                Bits(32)(20),
+                Bits(32)(250),
                 Bits(32)(10),
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(300),
-                Bits(32)(250),
                 Bits(32)(240),
             ),
-            # Case 4: 使用WB_BYPASS的AND指令
+            # Case 4: 写穿透读出操作数的AND指令
             (
                 ALUOp.AND,
-                Rs1Sel.WB_BYPASS,
+                Rs1Sel.RS1,
                 Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
-                Bits(32)(0xF0F0F0F0),
+                Bits(32)(0x87654321),
                 Bits(32)(0x0F0F0F0F),
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0x12345678),
-                Bits(32)(0x87654321),
                 Bits(32)(0x87654321 & 0x0F0F0F0F),
             ),
-            # Case 5: 使用WB_BYPASS的OR指令
+            # Case 5: 写穿透读出操作数的OR指令
             (
                 ALUOp.OR,
-                Rs1Sel.WB_BYPASS,
+                Rs1Sel.RS1,
                 Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
-                Bits(32)(0xF0F0F0F0),
+                Bits(32)(0x87654321),
                 Bits(32)(0x0F0F0F0F),
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0x12345678),
-                Bits(32)(0x87654321),
                 Bits(32)(0x87654321 | 0x0F0F0F0F),
             ),
             # --- 旁路对比测试 ---
-            # Case 6: 对比三种旁路 - ADD指令
+            # Case 6: 旁路与写穿透混合 - ADD指令
             (
                 ALUOp.ADD,
                 Rs1Sel.EX_MEM_BYPASS,
-                Rs2Sel.WB_BYPASS,
+                Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
                 Bits(32)(10),
-                Bits(32)(20),
+                Bits(32)(150),
                 Bits(32)(0),
                 Bits(32)(100),
                 Bits(32)(200),
-                Bits(32)(150),
                 Bits(32)(250),
             ),
-            # Case 7: 对比三种旁路 - SUB指令
+            # Case 7: 旁路与写穿透混合 - SUB指令
             (
                 ALUOp.SUB,
                 Rs1Sel.MEM_WB_BYPASS,
-                Rs2Sel.WB_BYPASS,
+                Rs2Sel.RS2,
                 Op1Sel.RS1,
                 Op2Sel.RS2,
                 BranchType.NO_BRANCH,
                 Bits(32)(0x1004),
                 Bits(32)(0x1000),
                 Bits(32)(200),
-                Bits(32)(100),
+                Bits(32)(50),
                 Bits(32)(0),
                 Bits(32)(200),
                 Bits(32)(100),
-                Bits(32)(50),
                 Bits(32)(150),
             ),
             # --- 分支指令测试 ---
@@ -220,7 +210,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0),
             ),  # 10-10=0，BEQ条件成立
             # Case 9: BNE (不等分支)
@@ -238,7 +227,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0xFFFFFFF6),
             ),  # 10-20=-10≠0，BNE条件成立
             # Case 10: BLT (小于分支)
@@ -256,7 +244,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(1),
             ),  # 5<10，BLT条件成立
             # Case 11: BGE (大于等于分支)
@@ -274,7 +261,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0),
             ),  # 10>=5，BGE条件成立
             # Case 12: BLTU (无符号小于分支)
@@ -292,7 +278,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0),
             ),  # 10>=5，BLTU条件不成立
             # Case 13: BGEU (无符号大于等于分支)
@@ -310,7 +295,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(1),
             ),  # 5<10，BGEU条件不成立
             # --- JAL/JALR 指令测试 ---
@@ -329,7 +313,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0x1004),
             ),  # PC+4=0x1004
             # Case 15: JALR (间接跳转)
@@ -347,7 +330,6 @@ class Driver(Module):
                 Bits(32)(8),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0x1004),
             ),  # PC+4=0x1004，但跳转到0x2008
         ]
@@ -361,9 +343,9 @@ class Driver(Module):
 
         # 组合逻辑 Mux：根据 idx 选择当前的测试向量
         # 初始化默认值
-        current_alu_func = Bits(16)(0)
+        current_alu_func = Bits(64)(0)
         current_rs1_sel = Bits(4)(0)
-        current_rs2_sel = Bits(4)(0)
+        current_rs2_sel = Bits(5)(0)
         current_op1_sel = Bits(3)(0)
         current_op2_sel = Bits(3)(0)
         current_branch_type = Bits(16)(0)
@@ -374,7 +356,6 @@ class Driver(Module):
         current_imm = Bits(32)(0)
         current_ex_mem_fwd = Bits(32)(0)
         current_mem_wb_fwd = Bits(32)(0)
-        current_wb_fwd = Bits(32)(0)
         current_expected = Bits(32)(0)
 
         # 这里的循环展开会生成一棵 Mux 树
@@ -392,7 +373,6 @@ class Driver(Module):
             imm,
             ex_mem_fwd,
             mem_wb_fwd,
-            wb_fwd,
             expected,
         ) in enumerate(vectors):
             is_match = idx == UInt(32)(i)
@@ -410,7 +390,6 @@ class Driver(Module):
             current_imm = is_match.select(imm, current_imm)
             current_ex_mem_fwd = is_match.select(ex_mem_fwd, current_ex_mem_fwd)
             current_mem_wb_fwd = is_match.select(mem_wb_fwd, current_mem_wb_fwd)
-            current_wb_fwd = is_match.select(wb_fwd, current_wb_fwd)
             current_expected = is_match.select(expected, current_expected)
 
         dynamic_rd_addr = (idx == idx).select(Bits(5)(1), Bits(5)(1))
@@ -433,13 +412,14 @@ class Driver(Module):
             op2_sel=current_op2_sel,
             branch_type=current_branch_type,
             next_pc_addr=current_next_pc_addr,
+            ras_op=RasOp.NONE,
+            is_rvc=Bits(1)(0),
             mem_ctrl=mem_ctrl,
         )
 
         # 设置旁路数据
         ex_mem_bypass[0] = current_ex_mem_fwd
         mem_wb_bypass[0] = current_mem_wb_fwd
-        wb_bypass[0] = current_wb_fwd
 
         # 7. 发送数据到Execution模块
         # 只有当 idx 在向量范围内时才发送 (valid)
@@ -449,7 +429,7 @@ class Driver(Module):
             finish()
 
         log(
-            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} wb_fwd=0x{:x} expected=0x{:x}",
+            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} expected=0x{:x}",
             idx,
             current_alu_func,
             current_rs1_sel,
@@ -463,7 +443,6 @@ class Driver(Module):
             current_imm,
             current_ex_mem_fwd,
             current_mem_wb_fwd,
-            current_wb_fwd,
             current_expected,
         )
 
@@ -491,12 +470,12 @@ def check(raw_output):
     expected_results = [
         0x00000078,  # Case 0: 使用EX-MEM旁路 (100+20=120)
         0x000000DC,  # Case 1: 使用MEM-WB旁路 (200+20=220)
-        0x0000010E,  # Case 2: 使用WB_BYPASS的ADD指令 (250+20=270)
-        0x000000F0,  # Case 3: 使用WB_BYPASS的SUB指令 (250-10=240)
-        0x07050301,  # Case 4: 使用WB_BYPASS的AND指令 (0x87654321 & 0x0F0F0F0F = 0x07050301)
-        0x8F6F4F2F,  # Case 5: 使用WB_BYPASS的OR指令 (0x87654321 | 0x0F0F0F0F = 0x8F6F4F2F)
-        0x000000FA,  # Case 6: 对比三种旁路 - ADD指令 (100+150=250)
-        0x00000032,  # Case 7: 对比三种旁路 - SUB指令 (100-50=50=0x0000032)
+        0x0000010E,  # Case 2: 写穿透读出操作数的ADD指令 (250+20=270)
+        0x000000F0,  # Case 3: 写穿透读出操作数的SUB指令 (250-10=240)
+        0x07050301,  # Case 4: 写穿透读出操作数的AND指令 (0x87654321 & 0x0F0F0F0F = 0x07050301)
+        0x8F6F4F2F,  # Case 5: 写穿透读出操作数的OR指令 (0x87654321 | 0x0F0F0F0F = 0x8F6F4F2F)
+        0x000000FA,  # Case 6: 旁路与写穿透混合 - ADD指令 (100+150=250)
+        0x00000032,  # Case 7: 旁路与写穿透混合 - SUB指令 (100-50=50=0x0000032)
         0x00000000,  # Case 8: BEQ (10-10=0)
         0xFFFFFFF6,  # Case 9: BNE (10-20=-10)
         0x00000001,  # Case 10: BLT (5<10=1)
@@ -511,12 +490,12 @@ def check(raw_output):
     expected_branch_types = [
         "NO_BRANCH",  # Case 0: 使用EX-MEM旁路
         "NO_BRANCH",  # Case 1: 使用MEM-WB旁路
-        "NO_BRANCH",  # Case 2: 使用WB_BYPASS的ADD指令
-        "NO_BRANCH",  # Case 3: 使用WB_BYPASS的SUB指令
-        "NO_BRANCH",  # Case 4: 使用WB_BYPASS的AND指令
-        "NO_BRANCH",  # Case 5: 使用WB_BYPASS的OR指令
-        "NO_BRANCH",  # Case 6: 对比三种旁路 - ADD指令
-        "NO_BRANCH",  # Case 7: 对比三种旁路 - SUB指令
+        "NO_BRANCH",  # Case 2: 写穿透读出操作数的ADD指令
+        "NO_BRANCH",  # Case 3: 写穿透读出操作数的SUB指令
+        "NO_BRANCH",  # Case 4: 写穿透读出操作数的AND指令
+        "NO_BRANCH",  # Case 5: 写穿透读出操作数的OR指令
+        "NO_BRANCH",  # Case 6: 旁路与写穿透混合 - ADD指令
+        "NO_BRANCH",  # Case 7: 旁路与写穿透混合 - SUB指令
         "BEQ",  # Case 8: BEQ (相等分支)
         "BNE",  # Case 9: BNE (不等分支)
         "BLT",  # Case 10: BLT (小于分支)
@@ -531,12 +510,12 @@ def check(raw_output):
     expected_branch_targets = [
         None,  # Case 0: 使用EX-MEM旁路 (无分支)
         None,  # Case 1: 使用MEM-WB旁路 (无分支)
-        None,  # Case 2: 使用WB_BYPASS的ADD指令 (无分支)
-        None,  # Case 3: 使用WB_BYPASS的SUB指令 (无分支)
-        None,  # Case 4: 使用WB_BYPASS的AND指令 (无分支)
-        None,  # Case 5: 使用WB_BYPASS的OR指令 (无分支)
-        None,  # Case 6: 对比三种旁路 - ADD指令 (无分支)
-        None,  # Case 7: 对比三种旁路 - SUB指令 (无分支)
+        None,  # Case 2: 写穿透读出操作数的ADD指令 (无分支)
+        None,  # Case 3: 写穿透读出操作数的SUB指令 (无分支)
+        None,  # Case 4: 写穿透读出操作数的AND指令 (无分支)
+        None,  # Case 5: 写穿透读出操作数的OR指令 (无分支)
+        None,  # Case 6: 旁路与写穿透混合 - ADD指令 (无分支)
+        None,  # Case 7: 旁路与写穿透混合 - SUB指令 (无分支)
         0x1008,  # Case 8: BEQ (PC + 8 = 0x1000 + 8 = 0x1008)
         0x1008,  # Case 9: BNE (PC + 8 = 0x1000 + 8 = 0x1008)
         0x1008,  # Case 10: BLT (PC + 8 = 0x1000 + 8 = 0x1008)
@@ -551,12 +530,12 @@ def check(raw_output):
     expected_branch_taken = [
         False,  # Case 0: 使用EX-MEM旁路 (无分支)
         False,  # Case 1: 使用MEM-WB旁路 (无分支)
-        False,  # Case 2: 使用WB_BYPASS的ADD指令 (无分支)
-        False,  # Case 3: 使用WB_BYPASS的SUB指令 (无分支)
-        False,  # Case 4: 使用WB_BYPASS的AND指令 (无分支)
-        False,  # Case 5: 使用WB_BYPASS的OR指令 (无分支)
-        False,  # Case 6: 对比三种旁路 - ADD指令 (无分支)
-        False,  # Case 7: 对比三种旁路 - SUB指令 (无分支)
+        False,  # Case 2: 写穿透读出操作数的ADD指令 (无分支)
+        False,  # Case 3: 写穿透读出操作数的SUB指令 (无分支)
+        False,  # Case 4: 写穿透读出操作数的AND指令 (无分支)
+        False,  # Case 5: 写穿透读出操作数的OR指令 (无分支)
+        False,  # Case 6: 旁路与写穿透混合 - ADD指令 (无分支)
+        False,  # Case 7: 旁路与写穿透混合 - SUB指令 (无分支)
         True,   # Case 8: BEQ (10 == 10，条件成立，跳转)
         True,   # Case 9: BNE (10 != 20，条件成立，跳转)
         True,   # Case 10: BLT (5 < 10，条件成立，跳转)
@@ -595,7 +574,6 @@ if __name__ == "__main__":
         # 创建旁路寄存器和分支目标寄存器
         ex_mem_bypass = RegArray(Bits(32), 1)
         mem_wb_bypass = RegArray(Bits(32), 1)
-        wb_bypass = RegArray(Bits(32), 1)
         branch_target_reg = RegArray(Bits(32), 1)
 
         # [关键] 获取 Driver 的返回值
@@ -603,7 +581,6 @@ if __name__ == "__main__":
             dut,
             ex_mem_bypass,
             mem_wb_bypass,
-            wb_bypass,
             mock_feedback,
         )
 
@@ -612,7 +589,6 @@ if __name__ == "__main__":
             mem_module=mock_mem_module,
             ex_mem_bypass=ex_mem_bypass,
             mem_wb_bypass=mem_wb_bypass,
-            wb_bypass=wb_bypass,
             branch_target_reg=branch_target_reg,
             dcache=mock_sram,
         )
@@ -33,12 +33,11 @@ class Driver(Module):
         dut: Module,
         ex_mem_bypass: Array,
         mem_wb_bypass: Array,
-        wb_bypass: Array,
         mock_feedback: Module,
     ):
         # --- 测试向量定义 ---
         # 格式: (alu_func, rs1_sel, rs2_sel, op1_sel, op2_sel, branch_type,
-        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, wb_fwd, expected_result)
+        #       next_pc_addr, pc, rs1_data, rs2_data, imm, ex_mem_fwd, mem_wb_fwd, expected_result)
         vectors = [
             # --- Store 指令测试 ---
             # Case 0: SW (Store Word) - 存储数据到地址0x1000
@@ -56,7 +55,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(50),
                 Bits(32)(0x1000),
             ),  # ALU结果: 0x1000 + 0 = 0x1000 (计算地址)
             # Case 1: SW (Store Word) - 存储数据到地址0x1004
@@ -74,7 +72,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(60),
                 Bits(32)(0x1008),
             ),  # ALU结果: 0x1004 + 0 = 0x1004 (计算地址)
             # Case 2: SW (Store Word) - 存储数据到地址0x1008
@@ -92,7 +89,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(70),
                 Bits(32)(0x100C),
             ),  # ALU结果: 0x1008 + 0 = 0x1008 (计算地址)
             # --- Load 指令测试 ---
@@ -111,7 +107,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(80),
                 Bits(32)(0x1004),
             ),  # ALU结果: 0x1000 + 0 = 0x1000 (计算地址)
             # Case 4: LW (Load Word) - 从地址0x1004加载数据
@@ -129,7 +124,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(90),
                 Bits(32)(0x1008),
             ),  # ALU结果: 0x1004 + 0 = 0x1004 (计算地址)
             # Case 5: LW (Load Word) - 从地址0x1008加载数据
@@ -147,7 +141,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(100),
                 Bits(32)(0x100C),
             ),  # ALU结果: 0x1008 + 0 = 0x1008 (计算地址)
             # --- 地址对齐测试 ---
@@ -166,7 +159,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(110),
                 Bits(32)(0x1004),
             ),  # ALU结果: 0x1001 + 0 = 0x1001 (计算地址)
             # Case 7: LW (Load Word) - 未对齐地址访问
@@ -184,7 +176,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(120),
                 Bits(32)(0x1004),
             ),  # ALU结果: 0x1003 + 0 = 0x1003 (计算地址)
             # --- 不同宽度的Store指令测试 ---
@@ -203,7 +194,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(130),
                 Bits(32)(0x1014),
             ),  # 地址=0x1010
             # Case 9: SB (Store Byte) - 存储字节到地址0x1011
@@ -221,7 +211,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(140),
                 Bits(32)(0x1011),
             ),  # 地址=0x1011
             # --- 不同宽度的Load指令测试 ---
@@ -240,7 +229,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(150),
                 Bits(32)(0x1010),
             ),  # 地址=0x1010
             # Case 11: LHU (Load Half Unsigned) - 从地址0x1010加载半字（无符号）
@@ -258,7 +246,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(160),
                 Bits(32)(0x1014),
             ),  # 地址=0x1010
             # Case 12: LB (Load Byte) - 从地址0x1011加载字节（有符号）
@@ -276,7 +263,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(170),
                 Bits(32)(0x1014),
             ),  # 地址=0x1011
             # Case 13: LBU (Load Byte Unsigned) - 从地址0x1011加载字节（无符号）
@@ -294,7 +280,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(180),
                 Bits(32)(0x1014),
             ),  # 地址=0x1011
             # --- 混合宽度测试 ---
@@ -313,7 +298,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(190),
                 Bits(32)(0x1024),
             ),  # 地址=0x12345678
             # Case 15: 从0x1020读取字，验证之前存储的数据
@@ -331,7 +315,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(200),
                 Bits(32)(0x1024),
             ),  # 地址=0x1020
             # --- 半字和字节未对齐测试 ---
@@ -350,7 +333,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(210),
                 Bits(32)(0x1024),
             ),  # ALU结果: 0x1021 + 0 = 0x1021 (计算地址)
             # Case 17: LH (Load Half) - 未对齐地址访问
@@ -368,7 +350,6 @@ class Driver(Module):
                 Bits(32)(0),
                 Bits(32)(0),
                 Bits(32)(0),
-                Bits(32)(220),
                 Bits(32)(0x1024),
             ),  # ALU结果: 0x1023 + 0 = 0x1023 (计算地址)
         ]
@@ -382,9 +363,9 @@ class Driver(Module):
 
         # 组合逻辑 Mux：根据 idx 选择当前的测试向量
         # 初始化默认值
-        current_alu_func = Bits(16)(0)
+        current_alu_func = Bits(64)(0)
         current_rs1_sel = Bits(4)(0)
-        current_rs2_sel = Bits(4)(0)
+        current_rs2_sel = Bits(5)(0)
         current_op1_sel = Bits(3)(0)
         current_op2_sel = Bits(3)(0)
         current_branch_type = Bits(16)(0)
@@ -395,7 +376,6 @@ class Driver(Module):
         current_imm = Bits(32)(0)
         current_ex_mem_fwd = Bits(32)(0)
         current_mem_wb_fwd = Bits(32)(0)
-        current_wb_fwd = Bits(32)(0)
         current_expected = Bits(32)(0)
 
         # 这里的循环展开会生成一棵 Mux 树
@@ -413,7 +393,6 @@ class Driver(Module):
             imm,
             ex_mem_fwd,
             mem_wb_fwd,
-            wb_fwd,
             expected,
         ) in enumerate(vectors):
             is_match = idx == UInt(32)(i)
@@ -431,7 +410,6 @@ class Driver(Module):
             current_imm = is_match.select(imm, current_imm)
             current_ex_mem_fwd = is_match.select(ex_mem_fwd, current_ex_mem_fwd)
             current_mem_wb_fwd = is_match.select(mem_wb_fwd, current_mem_wb_fwd)
-            current_wb_fwd = is_match.select(wb_fwd, current_wb_fwd)
             current_expected = is_match.select(expected, current_expected)
 
         dynamic_rd_addr = (idx == idx).select(Bits(5)(1), Bits(5)(1))
@@ -523,13 +501,14 @@ class Driver(Module):
             op2_sel=current_op2_sel,
             branch_type=current_branch_type,
             next_pc_addr=current_next_pc_addr,
+            ras_op=RasOp.NONE,
+            is_rvc=Bits(1)(0),
             mem_ctrl=mem_ctrl,
         )
 
         # 设置旁路数据
         ex_mem_bypass[0] = current_ex_mem_fwd
         mem_wb_bypass[0] = current_mem_wb_fwd
-        wb_bypass[0] = current_wb_fwd
 
         # 发送数据到Execution模块
         # 只有当 idx 在向量范围内时才发送 (valid)
@@ -539,7 +518,7 @@ class Driver(Module):
             finish()
 
         log(
-            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} wb_fwd=0x{:x} expected=0x{:x}",
+            "Driver: idx={} alu_func={} rs1_sel={} rs2_sel={} op1_sel={} op2_sel={} branch_type={} pc=0x{:x} rs1=0x{:x} rs2=0x{:x} imm=0x{:x} ex_mem_fwd=0x{:x} mem_wb_fwd=0x{:x} expected=0x{:x}",
             idx,
             current_alu_func,
             current_rs1_sel,
@@ -553,7 +532,6 @@ class Driver(Module):
             current_imm,
             current_ex_mem_fwd,
             current_mem_wb_fwd,
-            current_wb_fwd,
             current_expected,
         )
 
@@ -626,7 +604,6 @@ if __name__ == "__main__":
         # 创建旁路寄存器和分支目标寄存器
         ex_mem_bypass = RegArray(Bits(32), 1)
         mem_wb_bypass = RegArray(Bits(32), 1)
-        wb_bypass = RegArray(Bits(32), 1)
         branch_target_reg = RegArray(Bits(32), 1)
 
         # [关键] 获取 Driver 的返回值
@@ -634,7 +611,6 @@ if __name__ == "__main__":
             dut,
             ex_mem_bypass,
             mem_wb_bypass,
-            wb_bypass,
             mock_feedback,
         )
 
@@ -643,7 +619,6 @@ if __name__ == "__main__":
             mem_module=mock_mem_module,
             ex_mem_bypass=ex_mem_bypass,
             mem_wb_bypass=mem_wb_bypass,
-            wb_bypass=wb_bypass,
             branch_target_reg=branch_target_reg,
             dcache=mock_sram,
         )
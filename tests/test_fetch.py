@@ -58,13 +58,13 @@ class Driver(Module):
 # --- Sink ---
 class MockDecoder(Module):
     def __init__(self):
-        super().__init__(ports={"pc": Port(Bits(32))})
+        super().__init__(ports={"pc": Port(Bits(32)), "next_pc": Port(Bits(32))})
 
     @module.combinational
     def build(self):
         # 模拟 ID 级接收 (Always Pop)
         # 注意：即使是重复的 PC，这里也会打印出来
-        pc = self.pop_all_ports(False)
+        pc, next_pc = self.pop_all_ports(False)
         log("DEC: Recv PC=0x{:x}", pc)
         return pc
 
@@ -0,0 +1,148 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+from tests.common import run_test_module
+from src.control_signals import *
+from src.fetch import Fetcher, FetcherImpl, BimodalPredictor, BranchTargetBuffer
+from tests.test_fetch import MockDecoder
+
+
+# --- Driver ---
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(self, bp_update: Array, dut: Module):
+        # 向量: (valid, pc, taken)，模拟 EX 级写入训练通道
+        vectors = [
+            (1, 0x100, 1),  # Cyc 0: ctr 1 -> 2 (预测 NT，Miss)
+            (1, 0x100, 1),  # Cyc 1: ctr 2 -> 3 (Hit)
+            (0, 0x000, 0),  # Cyc 2: 无分支，不训练
+            (1, 0x100, 1),  # Cyc 3: ctr 3 -> 3 (饱和，Hit)
+            (1, 0x100, 0),  # Cyc 4: ctr 3 -> 2 (Miss)
+            (1, 0x100, 1),  # Cyc 5: ctr 2 -> 3 (Hit)
+            (1, 0x104, 0),  # Cyc 6: 另一表项 ctr 1 -> 0 (Hit)
+            (1, 0x104, 0),  # Cyc 7: ctr 0 -> 0 (饱和，Hit)
+        ]
+
+        cnt = RegArray(UInt(32), 1, initializer=[0])
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+        idx = cnt[0]
+
+        v, p, t = Bits(1)(0), Bits(32)(0), Bits(1)(0)
+
+        for i, vec in enumerate(vectors):
+            is_match = idx == UInt(32)(i)
+            v = is_match.select(Bits(1)(vec[0]), v)
+            p = is_match.select(Bits(32)(vec[1]), p)
+            t = is_match.select(Bits(1)(vec[2]), t)
+
+        valid_test = idx < UInt(32)(len(vectors) + 1)
+        with Condition(valid_test):
+            dut.async_called()
+
+        with Condition(idx >= UInt(32)(len(vectors) + 3)):
+            log("Driver: All vectors applied. Finishing simulation.")
+            finish()
+
+        # 驱动训练通道
+        bp_update[0] = bp_update_signals.bundle(
+            valid=v,
+            is_cond=Bits(1)(1),
+            taken=t,
+            pc=p,
+            target=p + Bits(32)(0x40),
+            ras_op=RasOp.NONE,
+            is_rvc=Bits(1)(0),
+        )
+
+
+# --- Check ---
+def check(output):
+    print(">>> Verifying Bimodal Predictor...")
+    captured = []
+    for line in output.split("\n"):
+        if "BP: Train" in line:
+            # "BP: Train PC=0x100 Taken=True Counter=1 Hit=False"
+            fields = dict(
+                kv.split("=") for kv in line.split("BP: Train")[1].split()
+            )
+            captured.append(
+                (
+                    int(fields["PC"], 16),
+                    fields["Taken"] == "True",
+                    int(fields["Counter"]),
+                    fields["Hit"] == "True",
+                )
+            )
+
+    expected = [
+        (0x100, True, 1, False),
+        (0x100, True, 2, True),
+        (0x100, True, 3, True),
+        (0x100, False, 3, False),
+        (0x100, True, 2, True),
+        (0x104, False, 1, True),
+        (0x104, False, 0, True),
+    ]
+
+    print(f"Captured: {captured}")
+    print(f"Expected: {expected}")
+
+    assert len(captured) == len(expected), "Train count mismatch"
+    for i, (exp, act) in enumerate(zip(expected, captured)):
+        assert exp == act, f"Mismatch at train {i}: expected {exp}, got {act}"
+
+    # BTB：每个 PC 首次解析时未命中并分配，之后命中
+    btb_hits = []
+    for line in output.split("\n"):
+        if "BTB: Update" in line:
+            btb_hits.append(line.split("Hit=")[1].split()[0] == "True")
+
+    expected_btb = [False, True, True, True, True, False, True]
+    print(f"BTB Captured: {btb_hits}")
+    print(f"BTB Expected: {expected_btb}")
+    assert btb_hits == expected_btb, "BTB allocation mismatch"
+
+    print("✅ Bimodal Predictor Passed:")
+    print("  - 2-bit saturating update verified.")
+    print("  - Hit/Miss accounting verified.")
+    print("  - BTB allocate-on-miss verified.")
+
+
+# --- Top ---
+if __name__ == "__main__":
+    sys = SysBuilder("test_fetch_predictor")
+    with sys:
+        fetcher = Fetcher()
+        decoder = MockDecoder()
+        driver = Driver()
+        icache = SRAM(32, 4096, "")
+
+        br_target = RegArray(Bits(32), 1)
+        bp_update = RegArray(bp_update_signals, 1)
+        predictor = BimodalPredictor(size_log=4)
+        btb = BranchTargetBuffer(size_log=4, ways=2)
+
+        pc_reg, last_pc_reg = fetcher.build()
+        decoder.build()
+        driver.build(bp_update, fetcher)
+
+        impl = FetcherImpl()
+        impl.build(
+            pc_reg=pc_reg,
+            last_pc_reg=last_pc_reg,
+            icache=icache,
+            decoder=decoder,
+            stall_if=Bits(1)(0),
+            branch_target=br_target,
+            predictor=predictor,
+            bp_update=bp_update,
+            btb=btb,
+        )
+
+    run_test_module(sys, check)
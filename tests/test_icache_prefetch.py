@@ -0,0 +1,108 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+from tests.common import run_test_module
+from src.fetch import Fetcher, FetcherImpl
+from src.icache import ICache
+from tests.test_fetch import MockDecoder
+
+
+# --- Driver ---
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(self, branch_target: Array, dut: Module):
+        # 缓存：64B，16B 行，2 路，后备存储器延迟 2 周期，Next-Line 预取
+        # Cyc 0 取 0x0 缺失，Cyc 8 起命中，同时预取第 1 行 (Cyc 16 到齐)；
+        # Cyc 12 取 0x10 落在正在预取的行上，等待到 Cyc 16 从预取缓冲返回并搬入缓存；
+        # Cyc 17 预取第 2 行 (Cyc 25 到齐)，Cyc 25 取 0x20 命中预取缓冲
+        num_cycles = 30
+
+        cnt = RegArray(UInt(32), 1, initializer=[0])
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+        idx = cnt[0]
+
+        with Condition(idx < UInt(32)(num_cycles)):
+            dut.async_called()
+
+        with Condition(idx >= UInt(32)(num_cycles + 2)):
+            log("Driver: All vectors applied. Finishing simulation.")
+            finish()
+
+        branch_target[0] = Bits(32)(0)
+
+
+# --- Check ---
+def check(output):
+    print(">>> Verifying ICache Prefetch...")
+    misses, issues, pf_hits, received = [], [], [], []
+    for line in output.split("\n"):
+        if "ICache: Miss Addr=" in line:
+            misses.append(int(line.split("Addr=")[1].split()[0], 16))
+        if "Prefetch: Issue Line=" in line:
+            issues.append(int(line.split("Line=")[1].split()[0], 16))
+        if "ICache: Prefetch Hit Addr=" in line:
+            pf_hits.append(int(line.split("Addr=")[1].split()[0], 16))
+        if "DEC: Recv PC=" in line:
+            pc = int(line.split("=")[-1], 16)
+            if not received or received[-1] != pc:
+                received.append(pc)
+
+    print(f"Misses  : {[hex(x) for x in misses]}")
+    print(f"Issues  : {[hex(x) for x in issues]}")
+    print(f"PF Hits : {[hex(x) for x in pf_hits]}")
+    print(f"PCs     : {[hex(x) for x in received]}")
+
+    # 只有第 0 行是需求缺失，之后的行都由预取提供 (字地址)
+    assert misses == [0x0], "Unexpected miss sequence"
+    assert issues[:2] == [0x1, 0x2], "Unexpected prefetch sequence"
+    assert pf_hits[:2] == [0x4, 0x8], "Unexpected prefetch hits"
+
+    expected = [4 * i for i in range(12)]
+    assert received[: len(expected)] == expected, "Fetch sequence mismatch"
+
+    print("✅ ICache Prefetch Passed:")
+    print("  - Next line is prefetched into the buffer while the current line is consumed.")
+    print("  - A fetch to an in-flight prefetch waits instead of issuing a refill.")
+    print("  - Prefetch buffer hits are served and promoted into the cache.")
+
+
+# --- Top ---
+if __name__ == "__main__":
+    sys = SysBuilder("test_icache_prefetch")
+    with sys:
+        fetcher = Fetcher()
+        decoder = MockDecoder()
+        driver = Driver()
+        backing = SRAM(32, 4096, "")
+        icache = ICache(
+            backing=backing,
+            addr_bits=12,
+            size_log=6,
+            line_log=4,
+            ways=2,
+            latency=2,
+            prefetch_degree=1,
+        )
+
+        br_target = RegArray(Bits(32), 1)
+        pc_reg, last_pc_reg = fetcher.build()
+        decoder.build()
+        driver.build(br_target, fetcher)
+
+        impl = FetcherImpl()
+        impl.build(
+            pc_reg=pc_reg,
+            last_pc_reg=last_pc_reg,
+            icache=icache,
+            decoder=decoder,
+            stall_if=Bits(1)(0),
+            branch_target=br_target,
+        )
+
+    run_test_module(sys, check)
@@ -0,0 +1,137 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, LoopBuffer
+from src.control_signals import *
+from tests.common import run_test_module
+from tests.test_mock import MockDecoderShell
+
+
+# ==============================================================================
+# 1. Driver 模块定义：前三行不能改，这是Assassyn的约定。
+# ==============================================================================
+class Driver(Module):
+    def __init__(self):
+        super().__init__(ports={})
+
+    @module.combinational
+    def build(self, dut: Module, icache_dout: Array, loop_buffer: LoopBuffer):
+        # 循环体：0x100 addi x3, x1, 5 / 0x104 add x3, x1, x2 / 0x108 bne x1, x2, -8
+        ADDI, ADD, BNE = 0x00508193, 0x002081B3, 0xFE209CE3
+        NOP = 0x00000013
+        # 格式: (pc, instruction, next_pc)
+        # 回放的周期指令字给 NOP：Decoder 必须输出缓冲中的译码结果
+        vectors = [
+            (0x100, ADDI, 0x104),
+            (0x104, ADD, 0x108),
+            (0x108, BNE, 0x100),  # 2: 向后跳转且预测跳转 -> 开始捕获
+            (0x100, ADDI, 0x104),  # 3: 捕获
+            (0x104, ADD, 0x108),  # 4: 捕获
+            (0x108, BNE, 0x100),  # 5: 捕获完成 (ACTIVE 下一周期可见)
+            (0x100, ADDI, 0x104),  # 6: 仍从指令存储器取指
+            (0x104, NOP, 0x108),  # 7: 回放
+            (0x108, NOP, 0x100),  # 8: 回放
+            (0x100, NOP, 0x104),  # 9: 回放
+            (0x10C, 0x123451B7, 0x110),  # 10: 循环外 (LUI x3, 0x12345)，正常译码
+        ]
+
+        cnt = RegArray(UInt(32), 1, initializer=[0])
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+        idx = cnt[0]
+        valid_test = idx < UInt(32)(len(vectors))
+
+        pc, inst, next_pc = Bits(32)(0), Bits(32)(0), Bits(32)(0)
+        for i, v in enumerate(vectors):
+            is_match = idx == UInt(32)(i)
+            pc = is_match.select(Bits(32)(v[0]), pc)
+            inst = is_match.select(Bits(32)(v[1]), inst)
+            next_pc = is_match.select(Bits(32)(v[2]), next_pc)
+
+        with Condition(valid_test):
+            icache_dout[0] = inst
+            # 模拟 FetcherImpl：按取指地址决定下一周期是否回放
+            loop_buffer.replay[0] = loop_buffer.hit(pc)
+            loop_buffer.fetched[0] = Bits(1)(1)
+            dut.async_called(pc=pc, next_pc=next_pc)
+
+        with Condition(idx > UInt(32)(len(vectors) + 2)):
+            finish()
+
+
+# ==============================================================================
+# 2. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证循环缓冲...")
+
+    captures, locks, outputs = [], [], []
+    for line in raw_output.split("\n"):
+        m = re.search(r"LoopBuffer: Capture Start=0x([0-9a-fA-F]+) End=0x([0-9a-fA-F]+)", line)
+        if m:
+            captures.append((int(m.group(1), 16), int(m.group(2), 16)))
+        m = re.search(r"LoopBuffer: Lock Start=0x([0-9a-fA-F]+) End=0x([0-9a-fA-F]+)", line)
+        if m:
+            locks.append((int(m.group(1), 16), int(m.group(2), 16)))
+        if "Output of the Decoder:" in line:
+            fields = dict(re.findall(r"(\w+)=0x([0-9a-fA-F]+)", line))
+            outputs.append(
+                (
+                    int(fields["pc"], 16),
+                    int(fields["op2_sel"], 16),
+                    int(fields["branch_type"], 16),
+                    int(fields["rd_addr"], 16),
+                    int(fields["imm"], 16),
+                )
+            )
+
+    print(f"Captures: {captures}")
+    print(f"Locks   : {locks}")
+    assert captures == [(0x100, 0x108)], "Unexpected capture"
+    assert locks == [(0x100, 0x108)], "Unexpected lock"
+
+    # (pc, op2_sel, branch_type, rd, imm)
+    IMM, RS2 = 2, 1
+    B_NONE, B_BNE = 1, 4
+    expected = [
+        (0x104, RS2, B_NONE, 3, 0x0),  # 回放 add
+        (0x108, RS2, B_BNE, 0, 0xFFFFFFF8),  # 回放 bne
+        (0x100, IMM, B_NONE, 3, 0x5),  # 回放 addi
+        (0x10C, IMM, B_NONE, 3, 0x12345000),  # 循环外正常译码 lui
+    ]
+    print(f"Outputs : {outputs[7:11]}")
+    assert outputs[7:11] == expected, "Replay packet mismatch"
+
+    print("✅ 循环缓冲验证通过！")
+    print("  - 向后跳转的条件分支触发捕获，第二次预测跳转时锁定")
+    print("  - 回放时忽略指令字，输出缓存的译码结果")
+    print("  - 循环外的指令照常译码")
+
+
+# ==============================================================================
+# 3. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_loop_buffer")
+
+    with sys:
+        dut = Decoder()
+        driver = Driver()
+        output = MockDecoderShell()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        loop_buffer = LoopBuffer(entries=4)
+
+        driver.build(dut, icache_dout, loop_buffer)
+        pre_pkt, rs1, rs2, rs1_used, rs2_used = dut.build(
+            icache_dout, reg_file, loop_buffer
+        )
+        output.build(pre_pkt, rs1, rs2, rs1_used, rs2_used)
+
+    run_test_module(sys, check)
@@ -134,7 +134,7 @@ class MockDataHazardUnit(Module):
             ports={
                 "stall_if": Port(Bits(1)),
                 "rs1_sel": Port(Bits(4)),
-                "rs2_sel": Port(Bits(4)),
+                "rs2_sel": Port(Bits(5)),
             }
         )
         self.name = "MockDHU"
@@ -0,0 +1,164 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    program_words,
+    Driver,
+    Feeder,
+)
+from tests.test_mock import MockSRAM
+
+
+# 格式: (助记符, 指令字)
+# 相关距离 1 走 EX 旁路，距离 2 走 MEM 旁路，距离 3 时生产者正在 WB 写回 (由写穿透提供)，
+# 距离 4 及以上直接读寄存器堆
+PROGRAM = [
+    ("addi x1, x0, 5", i_type(5, 0, 0x0, 1)),
+    ("addi x2, x1, 3", i_type(3, 1, 0x0, 2)),  # x1: 距离 1
+    ("add  x3, x1, x2", r_type(0x00, 2, 1, 0x0, 3)),  # x1: 2, x2: 1
+    ("add  x4, x1, x3", r_type(0x00, 3, 1, 0x0, 4)),  # x1: 3 (写穿透), x3: 1
+    ("sub  x5, x4, x2", r_type(0x20, 2, 4, 0x0, 5)),  # x2: 3 (写穿透)
+    ("xor  x6, x5, x3", r_type(0x00, 3, 5, 0x4, 6)),  # x3: 3 (写穿透)
+    ("or   x7, x4, x5", r_type(0x00, 5, 4, 0x6, 7)),  # x4: 3 (写穿透), x5: 2
+    ("add  x8, x4, x4", r_type(0x00, 4, 4, 0x0, 8)),  # x4: 4 (寄存器堆)，rs1 与 rs2 相同
+    # 同一寄存器连续改写：较新的旁路值优先于写穿透与寄存器堆
+    ("addi x1, x1, 1", i_type(1, 1, 0x0, 1)),
+    ("addi x1, x1, 1", i_type(1, 1, 0x0, 1)),
+    ("addi x1, x1, 1", i_type(1, 1, 0x0, 1)),
+    ("add  x9, x1, x7", r_type(0x00, 7, 1, 0x0, 9)),  # x1: 1, x7: 5
+    ("add  x10, x2, x0", r_type(0x00, 0, 2, 0x0, 10)),  # x0 恒为 0
+    ("add  x11, x9, x10", r_type(0x00, 10, 9, 0x0, 11)),
+    ("sub  x12, x1, x9", r_type(0x20, 9, 1, 0x0, 12)),  # x1: 4, x9: 3 (写穿透)
+    ("addi x0, x0, 7", i_type(7, 0, 0x0, 0)),  # 写 x0：不应写回，也不应被写穿透
+    ("add  x13, x0, x12", r_type(0x00, 12, 0, 0x0, 13)),
+]
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 4
+
+
+def reference():
+    """按程序顺序执行，得到 (rd, value) 写回序列 (rd != 0)。"""
+    regs = [0] * 32
+    writes = []
+    for _, inst in PROGRAM:
+        opcode, rd = inst & 0x7F, (inst >> 7) & 0x1F
+        f3, rs1, rs2 = (inst >> 12) & 0x7, (inst >> 15) & 0x1F, (inst >> 20) & 0x1F
+        a = regs[rs1]
+        if opcode == 0b0010011:
+            imm = inst >> 20
+            b = imm - (1 << 12) if imm >> 11 else imm
+        else:
+            b = -regs[rs2] if inst >> 30 else regs[rs2]
+        if f3 == 0x0:
+            val = a + b
+        elif f3 == 0x4:
+            val = a ^ b
+        else:
+            val = a | b
+        if rd != 0:
+            regs[rd] = val & 0xFFFFFFFF
+            writes.append((rd, regs[rd]))
+    return writes
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证寄存器堆写穿透...")
+
+    writes = []
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.append((int(m.group(1)), int(m.group(2), 16)))
+
+    expected = reference()
+    print(f"Writes:   {[(rd, hex(v)) for rd, v in writes]}")
+    print(f"Expected: {[(rd, hex(v)) for rd, v in expected]}")
+    assert writes == expected, "Write-back sequence mismatch"
+
+    print("✅ 寄存器堆写穿透验证通过！")
+    print("  - 相关距离 1/2 经 EX/MEM 旁路，距离 3 经写穿透，距离 4 读寄存器堆")
+    print("  - 同一寄存器连续改写时取最新值，x0 不被写入")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_regfile_writethrough")
+
+    with sys:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution()
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+
+        cnt = driver.build(len(program_words(PROGRAM, DRAIN)) + 6)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg)
+        executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if)
+
+        sys.expose_on_top(reg_file, kind="Output")
+
+    run_test_module(sys, check)
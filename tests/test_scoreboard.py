@@ -0,0 +1,196 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution, PipelinedMultiplier, IterativeDivider
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    lw,
+    sw,
+    program_words,
+    Driver,
+    Feeder,
+)
+from tests.test_mock import MockSRAM
+
+
+# 格式: (助记符, 指令字)
+# MockSRAM 不保存数据，Load 读出的值恒为 0
+PROGRAM = [
+    ("addi x1, x0, 5", i_type(5, 0, 0x0, 1)),
+    ("addi x2, x0, 9", i_type(9, 0, 0x0, 2)),
+    ("mul  x3, x1, x2", r_type(0x01, 2, 1, 0x0, 3)),
+    ("add  x4, x3, x1", r_type(0x00, 1, 3, 0x0, 4)),  # 乘法结果紧随使用：停顿 1 拍
+    ("mul  x5, x4, x2", r_type(0x01, 2, 4, 0x0, 5)),
+    ("addi x6, x0, 1", i_type(1, 0, 0x0, 6)),
+    ("add  x7, x5, x6", r_type(0x00, 6, 5, 0x0, 7)),  # 乘法间隔一条：MEM 旁路
+    ("div  x8, x7, x1", r_type(0x01, 1, 7, 0x4, 8)),
+    ("add  x9, x8, x2", r_type(0x00, 2, 8, 0x0, 9)),  # 除法忙时保持，结果给出后 EX 旁路
+    ("rem  x10, x7, x1", r_type(0x01, 1, 7, 0x6, 10)),
+    ("lw   x1, 16(x0)", lw(16, 0, 1)),
+    ("addi x11, x1, 7", i_type(7, 1, 0x0, 11)),  # Load-Use：停顿 1 拍 (不能用 EX 级的地址)
+    ("lw   x12, 20(x0)", lw(20, 0, 12)),
+    ("addi x13, x0, 3", i_type(3, 0, 0x0, 13)),
+    ("add  x14, x12, x13", r_type(0x00, 13, 12, 0x0, 14)),  # Load 间隔一条：MEM 旁路
+    ("mul  x1, x13, x13", r_type(0x01, 13, 13, 0x0, 1)),
+    ("addi x1, x1, 1", i_type(1, 1, 0x0, 1)),  # 改写乘法的目标寄存器：表项被最新写入者覆盖
+    ("add  x15, x1, x0", r_type(0x00, 0, 1, 0x0, 15)),
+    ("addi x5, x0, 77", i_type(77, 0, 0x0, 5)),
+    ("lw   x5, 24(x0)", lw(24, 0, 5)),
+    ("sw   x5, 32(x0)", sw(32, 5, 0)),  # 写数据依赖 Load：不停顿，晚取 Load 数据
+    ("lw   x6, 28(x0)", lw(28, 0, 6)),
+    ("sw   x2, 4(x6)", sw(4, 2, 6)),  # 地址依赖 Load：仍停顿 1 拍
+]
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 4
+
+
+def reference():
+    """按程序顺序执行，得到 (rd, value) 写回序列 (rd != 0) 与 (addr, data) 写存储器序列。"""
+    regs = [0] * 32
+    writes, stores = [], []
+    for _, inst in PROGRAM:
+        opcode, rd = inst & 0x7F, (inst >> 7) & 0x1F
+        f3, rs1, rs2 = (inst >> 12) & 0x7, (inst >> 15) & 0x1F, (inst >> 20) & 0x1F
+        f7 = inst >> 25
+        a, b = regs[rs1], regs[rs2]
+        if opcode == 0b0100011:
+            stores.append((a + ((f7 << 5) | rd), b))
+            continue
+        if opcode == 0b0000011:
+            val = 0
+        elif opcode == 0b0010011:
+            imm = inst >> 20
+            val = a + (imm - (1 << 12) if imm >> 11 else imm)
+        elif f7 == 0x01:
+            val = {0x0: a * b, 0x4: a // b, 0x6: a % b}[f3]
+        else:
+            val = a + b
+        if rd != 0:
+            regs[rd] = val & 0xFFFFFFFF
+            writes.append((rd, regs[rd]))
+    return writes, stores
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证记分牌...")
+
+    writes, stores = [], []
+    stalls, load_data = 0, 0
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.append((int(m.group(1)), int(m.group(2), 16)))
+        m = re.search(r"SRAM: .*WRITE addr=0x([0-9a-fA-F]+) wdata=0x([0-9a-fA-F]+)", line)
+        if m:
+            stores.append((int(m.group(1), 16), int(m.group(2), 16)))
+        if re.search(r"DataHazardUnit: .*stall_if=1", line):
+            stalls += 1
+        if "EX: RS2 source: Load Data" in line:
+            load_data += 1
+
+    expected_writes, expected_stores = reference()
+    print(f"Writes:   {[(rd, hex(v)) for rd, v in writes]}")
+    print(f"Expected: {[(rd, hex(v)) for rd, v in expected_writes]}")
+    print(f"Stores:   {[(hex(a), hex(v)) for a, v in stores]}")
+    print(f"Expected: {[(hex(a), hex(v)) for a, v in expected_stores]}")
+    print(f"Stall cycles: {stalls}, late store data: {load_data}")
+    assert writes == expected_writes, "Write-back sequence mismatch"
+    assert stores == expected_stores, "Store sequence mismatch"
+    assert stalls > 0, "Scoreboard never stalled"
+    assert load_data == 1, "Store data was not taken from the load"
+
+    print("✅ 记分牌验证通过！")
+    print("  - Load / 乘法延迟 2：紧随使用停顿 1 拍，间隔一条经 MEM 旁路")
+    print("  - 除法忙时表项保持，结果给出后经 EX 旁路")
+    print("  - 同一寄存器改写时表项记录最新写入者")
+    print("  - Store 写数据依赖 Load 时不停顿，地址依赖仍停顿")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_scoreboard")
+
+    with sys:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution()
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+        multiplier = PipelinedMultiplier()
+        divider = IterativeDivider()
+
+        scoreboard = Scoreboard()
+        scoreboard.register(latency=2, mem_op=MemOp.LOAD)
+        scoreboard.register(latency=2, alu_ops=PipelinedMultiplier.OPS)
+
+        cnt = driver.build(len(PROGRAM) * 8)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg, multiplier=multiplier)
+        _, _, _, ex_div_busy = executor.build(
+            mem_module=memory_unit,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+            multiplier=multiplier,
+            divider=divider,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            pre=pre_pkt,
+            ex_div_busy=ex_div_busy,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            ex_div_busy=ex_div_busy,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if)
+
+        sys.expose_on_top(reg_file, kind="Output")
+
+    run_test_module(sys, check)
@@ -0,0 +1,222 @@
+import sys
+import os
+import re
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+from src.decoder import Decoder, DecoderImpl
+from src.data_hazard import DataHazardUnit, Scoreboard
+from src.execution import Execution, Execution2, PipelinedMultiplier, IterativeDivider
+from src.memory import MemoryAccess
+from src.writeback import WriteBack
+from src.control_signals import *
+from tests.common import (
+    run_test_module,
+    r_type,
+    i_type,
+    lw,
+    sw,
+    beq,
+    program_words,
+    Driver,
+    Feeder,
+)
+from tests.test_mock import MockSRAM
+
+M32 = 0xFFFFFFFF
+
+
+# 格式: (助记符, 指令字)
+# MockSRAM 不保存数据，Load 读出的值恒为 0
+PROGRAM = [
+    ("addi x1, x0, 5", i_type(5, 0, 0x0, 1)),
+    ("addi x2, x0, 9", i_type(9, 0, 0x0, 2)),
+    ("add  x3, x1, x2", r_type(0x00, 2, 1, 0x0, 3)),  # 间隔 0 条：EX1 旁路；间隔 1 条：EX2 旁路
+    ("add  x4, x1, x3", r_type(0x00, 3, 1, 0x0, 4)),  # 间隔 2 条：MEM 旁路
+    ("sub  x5, x3, x1", r_type(0x20, 1, 3, 0x0, 5)),  # 间隔 3 条：寄存器堆写穿透
+    ("sub  x6, x5, x1", r_type(0x20, 1, 5, 0x0, 6)),
+    ("mul  x7, x5, x2", r_type(0x01, 2, 5, 0x0, 7)),
+    ("add  x8, x7, x1", r_type(0x00, 1, 7, 0x0, 8)),  # 乘法结果紧随使用：停顿 1 拍后 EX2 旁路
+    ("add  x9, x4, x7", r_type(0x00, 7, 4, 0x0, 9)),
+    ("div  x10, x9, x1", r_type(0x01, 1, 9, 0x4, 10)),
+    ("add  x11, x10, x2", r_type(0x00, 2, 10, 0x0, 11)),  # 除法忙时保持，结果给出后 EX1 旁路
+    ("lw   x12, 16(x0)", lw(16, 0, 12)),
+    ("addi x13, x12, 7", i_type(7, 12, 0x0, 13)),  # Load-Use：停顿 2 拍
+    ("lw   x14, 20(x0)", lw(20, 0, 14)),
+    ("addi x15, x0, 3", i_type(3, 0, 0x0, 15)),
+    ("add  x16, x14, x15", r_type(0x00, 15, 14, 0x0, 16)),  # Load 间隔一条：停顿 1 拍
+    ("lw   x17, 24(x0)", lw(24, 0, 17)),
+    ("sw   x17, 32(x0)", sw(32, 17, 0)),  # 写数据依赖 Load：不停顿，EX2 晚取 Load 数据
+    ("beq  x0, x0, +16", beq(16, 0, 0)),  # 在 EX2 解析，冲刷其后的 3 条
+    ("div  x18, x1, x1", r_type(0x01, 1, 1, 0x4, 18)),  # 错误路径：除法器已启动，须作废
+    ("sw   x1, 36(x0)", sw(36, 1, 0)),  # 错误路径：不得写存储器
+    ("addi x19, x0, 1", i_type(1, 0, 0x0, 19)),  # 错误路径：不得写回
+    ("add  x20, x1, x16", r_type(0x00, 16, 1, 0x0, 20)),
+    ("add  x21, x20, x20", r_type(0x00, 20, 20, 0x0, 21)),
+]
+
+# 结尾的 NOP (addi x0, x0, 0) 把最后几条指令推到 WB
+DRAIN = 5
+
+
+def reference():
+    """按程序顺序执行 (含分支)，得到 (rd, value) 写回序列与 (addr, data) 写存储器序列。"""
+    regs = [0] * 32
+    writes, stores = [], []
+    idx = 0
+    while idx < len(PROGRAM):
+        inst = PROGRAM[idx][1]
+        idx += 1
+        opcode, rd = inst & 0x7F, (inst >> 7) & 0x1F
+        f3, rs1, rs2 = (inst >> 12) & 0x7, (inst >> 15) & 0x1F, (inst >> 20) & 0x1F
+        f7 = inst >> 25
+        a, b = regs[rs1], regs[rs2]
+        if opcode == 0b1100011:
+            if a == b:
+                idx += 3
+            continue
+        if opcode == 0b0100011:
+            stores.append((a + ((f7 << 5) | rd), b))
+            continue
+        if opcode == 0b0000011:
+            val = 0
+        elif opcode == 0b0010011:
+            imm = inst >> 20
+            val = a + (imm - (1 << 12) if imm >> 11 else imm)
+        elif f7 == 0x01:
+            val = {0x0: a * b, 0x4: a // b}[f3]
+        elif f7 == 0x20:
+            val = a - b
+        else:
+            val = a + b
+        if rd != 0:
+            regs[rd] = val & M32
+            writes.append((rd, regs[rd]))
+    return writes, stores
+
+
+# ==============================================================================
+# 1. 验证逻辑 (Python Check)
+# ==============================================================================
+def check(raw_output):
+    print(">>> 开始验证拆分的 EX 级...")
+
+    writes, stores = [], []
+    ex2_bypass, load_data, taken = 0, 0, 0
+    for line in raw_output.split("\n"):
+        m = re.search(r"WB: Write x(\d+) <= 0x([0-9a-fA-F]+)", line)
+        if m:
+            writes.append((int(m.group(1)), int(m.group(2), 16)))
+        m = re.search(r"SRAM: .*WRITE addr=0x([0-9a-fA-F]+) wdata=0x([0-9a-fA-F]+)", line)
+        if m:
+            stores.append((int(m.group(1), 16), int(m.group(2), 16)))
+        if re.search(r"EX: RS[12] source: EX2 Bypass", line):
+            ex2_bypass += 1
+        if "EX2: Store data from load" in line:
+            load_data += 1
+        if "EX: Branch Taken: True" in line:
+            taken += 1
+
+    expected_writes, expected_stores = reference()
+    print(f"Writes:   {[(rd, hex(v)) for rd, v in writes]}")
+    print(f"Expected: {[(rd, hex(v)) for rd, v in expected_writes]}")
+    print(f"Stores:   {[(hex(a), hex(v)) for a, v in stores]}")
+    print(f"Expected: {[(hex(a), hex(v)) for a, v in expected_stores]}")
+    print(f"EX2 bypass: {ex2_bypass}, late store data: {load_data}, taken: {taken}")
+    assert writes == expected_writes, "Write-back sequence mismatch"
+    assert stores == expected_stores, "Store sequence mismatch"
+    assert ex2_bypass > 0, "EX2 bypass never selected"
+    assert load_data == 1, "Store data was not taken from the load"
+    assert taken == 1, "Branch was not resolved in EX2"
+
+    print("✅ 拆分的 EX 级验证通过！")
+    print("  - 相关指令间隔 0/1/2/3 条分别经 EX1 / EX2 / MEM 旁路与写穿透取得结果")
+    print("  - Load-Use 停顿 2 拍，乘法结果经 EX2 旁路")
+    print("  - Store 写数据依赖 Load 时在 EX2 晚取")
+    print("  - 分支在 EX2 解析，错误路径上的除法、Store 与写回都被作废")
+
+
+# ==============================================================================
+# 2. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+
+    sys = SysBuilder("test_split_ex")
+
+    with sys:
+        driver = Driver()
+        feeder = Feeder(program_words(PROGRAM, DRAIN))
+        decoder = Decoder()
+        decoder_impl = DecoderImpl()
+        hazard_unit = DataHazardUnit()
+        executor = Execution()
+        executor2 = Execution2()
+        memory_unit = MemoryAccess()
+        writeback = WriteBack()
+
+        icache_dout = RegArray(Bits(32), 1)
+        reg_file = RegArray(Bits(32), 32)
+        branch_target_reg = RegArray(Bits(32), 1)
+        ex_bypass_reg = RegArray(Bits(32), 1)
+        ex2_bypass_reg = RegArray(Bits(32), 1)
+        mem_bypass_reg = RegArray(Bits(32), 1)
+        dcache = MockSRAM()
+        multiplier = PipelinedMultiplier()
+        divider = IterativeDivider()
+
+        scoreboard = Scoreboard(split_ex=True)
+        scoreboard.register(latency=3, mem_op=MemOp.LOAD)
+        scoreboard.register(latency=2, alu_ops=PipelinedMultiplier.OPS)
+
+        cnt = driver.build(len(PROGRAM) * 8)
+
+        wb_rd, wb_data = writeback.build(reg_file)
+        memory_unit.build(writeback, dcache.dout, mem_bypass_reg)
+        executor2.build(
+            mem_module=memory_unit,
+            ex2_bypass=ex2_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+            multiplier=multiplier,
+        )
+        _, _, _, ex_div_busy = executor.build(
+            mem_module=executor2,
+            ex_mem_bypass=ex_bypass_reg,
+            mem_wb_bypass=mem_bypass_reg,
+            branch_target_reg=branch_target_reg,
+            dcache=dcache,
+            multiplier=multiplier,
+            divider=divider,
+            ex2_bypass=ex2_bypass_reg,
+        )
+        pre_pkt, rs1, rs2, use1, use2 = decoder.build(icache_dout, reg_file)
+        rs1_sel, rs2_sel, stall_if = hazard_unit.build(
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            rs1_used=use1,
+            rs2_used=use2,
+            pre=pre_pkt,
+            ex_div_busy=ex_div_busy,
+            scoreboard=scoreboard,
+        )
+        decoder_impl.build(
+            pre=pre_pkt,
+            executor=executor,
+            rs1_sel=rs1_sel,
+            rs2_sel=rs2_sel,
+            stall_if=stall_if,
+            branch_target_reg=branch_target_reg,
+            rs1_idx=rs1,
+            rs2_idx=rs2,
+            wb_rd=wb_rd,
+            wb_data=wb_data,
+            scoreboard=scoreboard,
+            ex_div_busy=ex_div_busy,
+        )
+        feeder.build(cnt, decoder, icache_dout, stall_if, branch_target_reg)
+
+        sys.expose_on_top(reg_file, kind="Output")
+
+    run_test_module(sys, check)
@@ -135,22 +135,21 @@ if __name__ == "__main__":
 
     with sys:
         reg_file = RegArray(Bits(32), 32)
-        wb_bypass_reg = RegArray(Bits(32), 1)  # 添加 wb_bypass_reg
         dut = WriteBack()
         driver = Driver()
 
         # [关键] 获取 Driver 的返回值 (cnt)
         driver_cnt = driver.build(dut)
 
-        # 获取 DUT 的返回值 (rd)
-        wb_rd = dut.build(reg_file, wb_bypass_reg)  # 传入两个参数
+        # 获取 DUT 的返回值 (rd 与写回数据，即寄存器堆写口)
+        wb_rd, wb_data = dut.build(reg_file)
 
         # [关键] 暴露 Driver 的计数器，防止被 DCE 优化掉
         sys.expose_on_top(driver_cnt, kind="Output")
 
         # 暴露 DUT 的输出
         sys.expose_on_top(reg_file, kind="Output")
-        sys.expose_on_top(wb_bypass_reg, kind="Output")  # 暴露 wb_bypass_reg
         sys.expose_on_top(wb_rd, kind="Output")
+        sys.expose_on_top(wb_data, kind="Output")
 
     run_test_module(sys, check)